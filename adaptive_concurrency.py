@@ -0,0 +1,171 @@
+import csv
+import statistics
+import threading
+import time
+
+from retry_policy import HOST_ERRORS
+
+# Failures that mean "too much load", as opposed to a broken page
+CONGESTION_ERRORS = HOST_ERRORS | {'rate_limited'}
+
+
+class AIMDController:
+    """Additive-increase/multiplicative-decrease limit on in-flight fetches.
+
+    Completions are judged in windows of about `limit` requests. A window
+    without congestion, in which the limit was actually reached, raises the
+    limit by one (up to maximum). Congestion halves it (down to minimum):
+    a 429 from any host, more than error_threshold host-level errors, or a
+    median latency above latency_tolerance times the baseline (a slowly
+    rising minimum of past window medians). Requests already in flight at a
+    cut are not judged again, so one burst causes one cut. The limit and
+    throughput are printed every log_interval seconds and kept in timeline
+    (and log_file, as CSV, when given).
+    """
+
+    def __init__(self, initial=10, minimum=2, maximum=64, decrease=0.5, latency_tolerance=2.0,
+                 error_threshold=0.2, min_window=4, log_interval=10.0, log_file=None):
+        self.minimum = minimum
+        self.maximum = max(maximum, minimum)
+        self.limit = float(min(max(initial, minimum), self.maximum))
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.error_threshold = error_threshold
+        self.min_window = min_window
+        self.log_interval = log_interval
+        self.timeline = []
+        self.stats = {'increases': 0, 'decreases': 0, 'throttled': 0, 'completed': 0}
+
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._peak = 0
+        self._latencies = []
+        self._window = 0
+        self._errors = 0
+        self._baseline = None
+        self._throttled_seen = None
+        self._draining = 0
+        self.range = [int(self.limit), int(self.limit)]
+        self._started = self._last_log = time.monotonic()
+        self._completed_at_log = 0
+        self._log_file = log_file
+        if log_file:
+            with open(log_file, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerow(['elapsed_s', 'concurrency', 'in_flight', 'urls_per_s', 'p50_latency_s',
+                                        'event'])
+
+    @property
+    def concurrency(self):
+        return int(self.limit)
+
+    def acquire(self):
+        """Block until a fetch slot is free under the current limit"""
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+            self._peak = max(self._peak, self._in_flight)
+
+    def release(self, latency, error_class=None, throttled=None):
+        """Free a slot and feed the fetch outcome to the controller.
+
+        latency is the time spent on the network (None when no request was
+        made, e.g. an open circuit); politeness waits must not be included,
+        or a queue on one slow host would read as congestion everywhere.
+        throttled is a running count of 429/Retry-After responses (see
+        DomainScheduler.throttled); any increase counts as congestion.
+        """
+        with self._cond:
+            self._in_flight -= 1
+            self.stats['completed'] += 1
+            new_throttles = 0
+            if throttled is not None:
+                new_throttles = throttled - self._throttled_seen if self._throttled_seen is not None else 0
+                self._throttled_seen = throttled
+                self.stats['throttled'] += max(new_throttles, 0)
+
+            if self._draining:
+                # Started before the last cut: its latency and errors reflect the old limit
+                self._draining -= 1
+            else:
+                self._window += 1
+                if latency is not None:
+                    self._latencies.append(latency)
+                self._errors += error_class in CONGESTION_ERRORS
+                if new_throttles > 0:
+                    self._adjust(congested=True, reason='429')
+                elif self._window >= max(int(self.limit), self.min_window):
+                    self._decide()
+
+            now = time.monotonic()
+            if now - self._last_log >= self.log_interval:
+                self._log(now)
+            self._cond.notify_all()
+
+    def _decide(self):
+        median = statistics.median(self._latencies) if self._latencies else None
+        error_rate = self._errors / self._window
+        baseline = self._baseline
+
+        if error_rate > self.error_threshold:
+            self._adjust(congested=True, reason=f'{error_rate:.0%} errors')
+        elif baseline and median is not None and median > baseline * self.latency_tolerance:
+            self._adjust(congested=True, reason=f'p50 {median:.2f}s vs {baseline:.2f}s')
+        elif self._peak >= int(self.limit):
+            # Only probe higher when the current limit is what held us back
+            self._adjust(congested=False)
+        else:
+            self._reset_window()
+
+        # Moves up slowly so a lucky fast window does not pin the baseline forever
+        if median is not None:
+            self._baseline = median if baseline is None else min(median, 0.8 * baseline + 0.2 * median)
+
+    def _adjust(self, congested, reason=''):
+        old = int(self.limit)
+        if congested:
+            self.limit = max(float(self.minimum), self.limit * self.decrease)
+            self.stats['decreases'] += 1
+            self._draining = self._in_flight
+        else:
+            self.limit = min(float(self.maximum), self.limit + 1)
+            self.stats['increases'] += 1
+        self.range = [min(self.range[0], int(self.limit)), max(self.range[1], int(self.limit))]
+        if congested and int(self.limit) != old:
+            print(f"   ⚙️ Concurrency {old} → {int(self.limit)} ({reason})")
+            self._log(time.monotonic(), event=f'decrease: {reason}')
+        self._reset_window()
+
+    def _reset_window(self):
+        self._latencies = []
+        self._window = 0
+        self._errors = 0
+        self._peak = self._in_flight
+
+    def _log(self, now, event=''):
+        elapsed = now - self._started
+        interval = now - self._last_log
+        rate = (self.stats['completed'] - self._completed_at_log) / interval if interval > 0 else 0.0
+        p50 = statistics.median(self._latencies) if self._latencies else None
+        entry = {'elapsed_s': round(elapsed, 1), 'concurrency': int(self.limit), 'in_flight': self._in_flight,
+                 'urls_per_s': round(rate, 2), 'p50_latency_s': round(p50, 3) if p50 is not None else None,
+                 'event': event}
+        self.timeline.append(entry)
+        if self._log_file:
+            with open(self._log_file, 'a', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerow(entry.values())
+        if not event:
+            print(f"   ⚙️ {elapsed:5.0f}s | concurrency {entry['concurrency']:>3} | "
+                  f"{rate:5.2f} URLs/s | {self.stats['completed']} done")
+            # Throughput is measured between periodic entries only
+            self._last_log = now
+            self._completed_at_log = self.stats['completed']
+
+    def mostrar_estatisticas(self):
+        """Print the concurrency range explored and the best observed throughput"""
+        periodic = [entry for entry in self.timeline if not entry['event'] and entry['urls_per_s']]
+        print(f"⚙️ ADAPTIVE CONCURRENCY: {self.range[0]}–{self.range[1]} workers (final {int(self.limit)}) | "
+              f"⬆️ {self.stats['increases']} | ⬇️ {self.stats['decreases']} | 🚦 {self.stats['throttled']} throttled")
+        if periodic:
+            best = max(periodic, key=lambda entry: entry['urls_per_s'])
+            print(f"   🏁 Best throughput {best['urls_per_s']:.2f} URLs/s at {best['concurrency']} workers")
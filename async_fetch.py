@@ -0,0 +1,146 @@
+import asyncio
+
+import aiohttp
+
+from http_session import check_html_content_type
+from retry_policy import classify_error
+
+_END = object()
+
+
+class AsyncFetcher:
+    """Single event loop fetch engine for large URL frontiers.
+
+    Up to max_in_flight downloads are kept in flight at once; parsing reuses
+    the scraper's title/abstract strategies and runs in the loop's default
+    executor so it does not stall other downloads.
+    """
+
+    def __init__(self, scraper, max_in_flight=200, limit_per_host=10, timeout=12):
+        self.scraper = scraper
+        self.max_in_flight = max_in_flight
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+
+    async def _fetch_one(self, session, semaphore, url):
+        loop = asyncio.get_running_loop()
+
+        content, failure = await self._download_with_retries(session, semaphore, url)
+        if failure:
+            return failure
+
+        try:
+            title, abstract = await loop.run_in_executor(None, self.scraper._parse_content, content)
+        except Exception as e:
+            self.scraper.failure_classes[url] = 'parse'
+            return "Access Error", f"Error: {str(e)[:80]}", "Erro"
+        return title, abstract, "Sucesso"
+
+    async def _download_with_retries(self, session, semaphore, url):
+        """Same retry policy and circuit breaker as the scraper's baixar_conteudo"""
+        policy = self.scraper.retry_policy
+        breaker = self.scraper.breaker
+        attempt = 0
+        while True:
+            try:
+                breaker.check(url)
+                content = await self._download(session, semaphore, url)
+                breaker.record_success(url)
+                return content, None
+
+            except Exception as e:
+                error_class = classify_error(e)
+                if not policy.should_retry(error_class, attempt):
+                    if error_class != 'circuit_open':
+                        breaker.record_failure(url, error_class)
+                    self.scraper.failure_classes[url] = error_class
+                    return None, self.scraper._failure_result(e, error_class)
+                await asyncio.sleep(policy.delay(attempt))
+                attempt += 1
+
+    async def _download(self, session, semaphore, url):
+        cache = self.scraper.cache
+        headers = self.scraper._request_headers()
+        if cache:
+            headers.update(cache.conditional_headers(url))
+
+        await self.scraper.scheduler.wait_async(url)
+        async with semaphore:
+            async with session.get(url, headers=headers) as response:
+                self.scraper.scheduler.observe(url, response.status, response.headers)
+                if response.status == 304 and cache:
+                    content = cache.hit(url)
+                    if content is not None:
+                        return content
+                    raise aiohttp.ClientError("cached body evicted after 304")
+                response.raise_for_status()
+                check_html_content_type(response.headers)
+                content = await self._read_capped(response)
+
+        if cache:
+            cache.store(url, content, response.headers)
+        return content
+
+    async def _read_capped(self, response):
+        max_bytes = self.scraper.max_download_bytes
+        chunks = []
+        received = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            chunks.append(chunk)
+            received += len(chunk)
+            if received >= max_bytes:
+                break
+        return b''.join(chunks)[:max_bytes]
+
+    async def iter_results(self, urls):
+        """Yield (url, title, abstract, status) as each download finishes.
+
+        urls may be any iterable, including a blocking generator fed by the
+        search stage: it is consumed lazily from a worker thread, so fetching
+        starts with the first URL.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        # Tasks waiting on politeness delays do not hold a network slot, but are still bounded
+        pending_slots = asyncio.Semaphore(self.max_in_flight * 4)
+        results = asyncio.Queue()
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight, limit_per_host=self.limit_per_host)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            async def job(url):
+                try:
+                    await results.put((url,) + await self._fetch_one(session, semaphore, url))
+                finally:
+                    pending_slots.release()
+
+            async def feed():
+                tasks = set()
+                iterator = iter(urls)
+                try:
+                    while True:
+                        url = await loop.run_in_executor(None, next, iterator, _END)
+                        if url is _END:
+                            break
+                        await pending_slots.acquire()
+                        task = asyncio.create_task(job(url))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                    if tasks:
+                        await asyncio.gather(*tasks)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                    await results.put(_END)
+
+            feeder = asyncio.create_task(feed())
+            try:
+                while True:
+                    item = await results.get()
+                    if item is _END:
+                        break
+                    yield item
+                # Surface errors raised while consuming urls
+                await feeder
+            finally:
+                feeder.cancel()
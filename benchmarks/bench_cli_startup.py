@@ -0,0 +1,123 @@
+"""CLI startup benchmark: time and memory to get each subcommand going, checked against a budget.
+
+Every case runs in a fresh interpreter (median of --repeat runs). `help`,
+`history` and `visualize` run end to end on throwaway files; `scrape` stops
+after the imports it performs before the first network request. A case
+fails when it exceeds its time budget or loads a module it must not
+(scheduled scrape runs must not pay for pandas/matplotlib/seaborn/numpy).
+
+    python benchmarks/bench_cli_startup.py --repeat 5 --output bench_cli_startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+CLI = os.path.join(ROOT, 'cli.py')
+HEAVY_MODULES = ['pandas', 'matplotlib', 'seaborn', 'aiohttp', 'numpy']
+
+# Seconds of wall time per case (interpreter start included) and modules it must not import
+BUDGETS = {
+    'help': (0.15, ['pandas', 'matplotlib', 'seaborn', 'aiohttp', 'numpy']),
+    'history': (0.5, ['pandas', 'matplotlib', 'seaborn', 'aiohttp', 'numpy']),
+    'scrape': (0.8, ['pandas', 'matplotlib', 'seaborn', 'aiohttp', 'numpy']),
+    'visualize': (2.0, ['pandas', 'seaborn']),
+}
+
+CHILD = r'''
+import json, resource, runpy, sys, time
+started = time.perf_counter()
+spec = json.loads(sys.argv[1])
+sys.path.insert(0, spec['root'])
+try:
+    if spec['argv'] is not None:
+        sys.argv = [spec['cli']] + spec['argv']
+        runpy.run_path(spec['cli'], run_name='__main__')
+    else:
+        exec(spec['code'])
+except SystemExit:
+    pass
+result = {
+    'in_process_s': time.perf_counter() - started,
+    'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'modules': [name for name in spec['heavy'] if name in sys.modules],
+}
+sys.stdout.write('\n@@RESULT@@' + json.dumps(result))
+'''
+
+
+def make_fixtures(workdir):
+    """An empty history and a small corpus for the end-to-end cases"""
+    sys.path.insert(0, ROOT)
+    from corpus_store import CorpusStore
+    from history_store import HistoryStore
+
+    history_db = os.path.join(workdir, 'history.db')
+    HistoryStore(history_db).close()
+
+    corpus_db = os.path.join(workdir, 'corpus.db')
+    corpus = CorpusStore(corpus_db, run_id='bench')
+    for i in range(200):
+        corpus.write({'URL': f'https://example{i % 7}.org/{i}', 'Title': 'T', 'Abstract': 'x' * (i * 10),
+                      'Status': 'Sucesso' if i % 3 else 'Erro', 'Source': 'Google',
+                      'Processing_Date': f'2025-01-{1 + i % 28:02d} 10:00:00', 'Execution': 'Incremental'})
+    corpus.close()
+    return {
+        'help': {'argv': ['--help']},
+        'history': {'argv': ['history', '--history-db', history_db]},
+        'scrape': {'argv': None, 'code': 'import cli, functions'},
+        'visualize': {'argv': ['visualize', '--corpus', corpus_db, '--output-dir', os.path.join(workdir, 'out'),
+                               '--formats', 'png']},
+    }
+
+
+def run_case(spec):
+    payload = json.dumps(dict(spec, cli=CLI, root=ROOT, heavy=HEAVY_MODULES, code=spec.get('code')))
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', CHILD, payload], capture_output=True, text=True,
+                            cwd=ROOT, check=True).stdout
+    wall = time.perf_counter() - started
+    result = json.loads(output.rsplit('@@RESULT@@', 1)[1])
+    result['wall_s'] = wall
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default='bench_cli_startup.json')
+    args = parser.parse_args()
+
+    results = {}
+    failed = False
+    with tempfile.TemporaryDirectory(prefix='bench_cli_') as workdir:
+        for name, spec in make_fixtures(workdir).items():
+            runs = [run_case(spec) for _ in range(args.repeat)]
+            budget, forbidden = BUDGETS[name]
+            result = {
+                'wall_s': statistics.median(run['wall_s'] for run in runs),
+                'in_process_s': statistics.median(run['in_process_s'] for run in runs),
+                'peak_rss_mb': statistics.median(run['peak_rss_mb'] for run in runs),
+                'modules': runs[0]['modules'],
+                'budget_s': budget,
+            }
+            result['forbidden_loaded'] = [module for module in result['modules'] if module in forbidden]
+            result['ok'] = result['wall_s'] <= budget and not result['forbidden_loaded']
+            failed |= not result['ok']
+            results[name] = result
+            print(f"{'✅' if result['ok'] else '❌'} {name:<10} {result['wall_s']:.3f}s (budget {budget:.2f}s) | "
+                  f"{result['peak_rss_mb']:.0f} MB | loaded: {', '.join(result['modules']) or '-'}")
+
+    with open(args.output, 'w') as f:
+        json.dump({'python': sys.version.split()[0], 'results': results}, f, indent=2)
+    print(f"📁 Results saved to {args.output}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""History membership benchmark: Bloom pre-filter vs plain SQLite vs in-memory set.
+
+For each size it builds a synthetic history database, then measures the
+first open (filter build), a warm open (mmap only), lookups of a mixed
+batch of new and known URLs and of a batch of new URLs only (what most
+search results are), and the observed false positive rate.
+
+known_urls first computes the canonical key of every URL, which costs the
+same with or without the filter, so the canonicalization and the key
+lookup (known_keys, where the filter acts) are timed separately.
+
+    python benchmarks/bench_history_bloom.py --sizes 1000000 10000000
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from history_store import HistoryStore  # noqa: E402
+from url_canonical import URLCanonicalizer  # noqa: E402
+
+
+def rss_mb():
+    """Current resident set size (Linux), in MB"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError):
+        return float('nan')
+
+
+def url_for(i):
+    return f'https://journal{i % 997}.example.org/articles/{i}?utm_source=google'
+
+
+def build_history(db_file, size, batch=200000):
+    """Synthetic history with the same schema and keys HistoryStore writes"""
+    canonicalizer = URLCanonicalizer()
+    store = HistoryStore(db_file)
+    store.close()
+
+    conn = sqlite3.connect(db_file)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=OFF')
+    for start in range(0, size, batch):
+        conn.executemany(
+            'INSERT INTO urls (url, added_at, canonical_key) VALUES (?, ?, ?)',
+            ((url_for(i), 'bench', canonicalizer.key(url_for(i))) for i in range(start, min(start + batch, size)))
+        )
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('total_urls', ?)", (str(size),))
+    conn.commit()
+    conn.close()
+
+
+def timed(function):
+    started = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - started
+
+
+def lookup_batches(size, n=20000):
+    """{name: (urls, how many of them are known)}: a half-known batch and an all-new one"""
+    known = [url_for(i) for i in range(0, size, max(size // (n // 2), 1))][:n // 2]
+    new = [url_for(size + i) for i in range(n)]
+    return {'mixed': (known + new[:n // 2], len(known)), 'new': (new, 0)}
+
+
+def bench_lookups(store, batches, result, label):
+    for name, (urls, known_count) in batches.items():
+        keys, result[f'canonical_keys_{name}_s'] = timed(lambda: [store.canonical_key(url) for url in urls])
+        known, result[f'known_keys_{name}_{label}_s'] = timed(lambda: store.known_keys(keys))
+        assert len(known) == known_count
+        known, result[f'known_urls_{name}_{label}_s'] = timed(lambda: store.known_urls(urls))
+        assert len(known) == known_count
+
+
+def bench_size(workdir, size, with_set):
+    db_file = os.path.join(workdir, f'history_{size}.db')
+    bloom_file = os.path.join(workdir, f'history_{size}.bloom')
+    result = {'urls': size}
+
+    _, result['build_db_s'] = timed(lambda: build_history(db_file, size))
+    result['db_mb'] = os.path.getsize(db_file) / 1024 / 1024
+
+    store, result['first_open_with_bloom_s'] = timed(lambda: HistoryStore(db_file, bloom_file=bloom_file))
+    store.close()
+    result['bloom_mb'] = os.path.getsize(bloom_file) / 1024 / 1024
+
+    batches = lookup_batches(size)
+
+    rss_before = rss_mb()
+    store, result['warm_open_with_bloom_s'] = timed(lambda: HistoryStore(db_file, bloom_file=bloom_file))
+    result['warm_open_rss_delta_mb'] = rss_mb() - rss_before
+    bench_lookups(store, batches, result, 'bloom')
+    result['bloom_stats'] = dict(store.bloom_stats)
+
+    absent = [f'absent.example.org/{i}' for i in range(200000)]
+    result['false_positive_rate'] = float(store.bloom.contains_many(absent).mean())
+    store.close()
+
+    store, result['open_sqlite_only_s'] = timed(lambda: HistoryStore(db_file))
+    bench_lookups(store, batches, result, 'sqlite_only')
+    store.close()
+
+    if with_set:
+        # What the original JSON history cost: every URL string in a Python set
+        rss_before = rss_mb()
+        history, result['set_build_s'] = timed(lambda: {url_for(i) for i in range(size)})
+        result['set_rss_delta_mb'] = rss_mb() - rss_before
+        del history
+
+    for name in (db_file, bloom_file):
+        os.remove(name)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000000, 10000000])
+    parser.add_argument('--with-set', action='store_true', help='also measure an in-memory set of all URLs')
+    parser.add_argument('--workdir', default=None)
+    parser.add_argument('--output', default='bench_history_bloom.json')
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='bench_history_')
+    results = []
+    for size in args.sizes:
+        print(f"⏱️ {size:,} URLs...")
+        result = bench_size(workdir, size, args.with_set)
+        results.append(result)
+        print(json.dumps(result, indent=2))
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"📁 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+"""Offline scrape benchmark: extraction and the incremental runners against a local fixture server.
+
+Starts benchmarks/fixture_server.py (PubMed-, WHO- and journal-like pages,
+huge pages, slow responders, 429 and 5xx hosts, PDFs, plus stand-ins for
+Google search and E-utilities) in its own process, so its CPU time is not
+counted, and runs every case in a fresh interpreter on throwaway
+history/cache/corpus files:
+
+- `extract` calls extrair_resumo_completo on every fixture page, one by one;
+- `sequential`, `threads`, `async` and `pipeline` run the matching
+  executar_scraper_incremental* function end to end (search stage, E-utilities
+  batches, fetch engine, sinks). Latency is measured from the moment the
+  search stage yields a URL to the moment its row comes out.
+
+Each case reports URLs/s, p50/p95 latency, CPU time (user + system, worker
+processes included) and the peak RSS of the main process to a JSON file;
+--compare prints the change against the results of another version.
+
+    python benchmarks/bench_scraper_offline.py --output bench_offline.json
+    python benchmarks/bench_scraper_offline.py --cases extract threads --compare bench_offline_before.json
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixture_server.py')
+RUNNERS = {
+    'sequential': 'executar_scraper_incremental',
+    'threads': 'executar_scraper_incremental_threads',
+    'async': 'executar_scraper_incremental_async',
+    'pipeline': 'executar_scraper_incremental_pipeline',
+}
+CASES = ['extract'] + list(RUNNERS)
+# Metrics compared by --compare, and whether a higher value is better
+COMPARED = {'urls_per_s': True, 'latency_p50_s': False, 'latency_p95_s': False, 'cpu_s': False,
+            'peak_rss_mb': False}
+
+# Loopback requests must not go through a proxy configured in the environment
+_LOCAL = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers (None when empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def forkserver_cpu():
+    """CPU seconds of multiprocessing's forkserver and the workers it reaped (Linux; 0 elsewhere).
+
+    Parser processes of the pipeline engine are forked by the forkserver, so
+    they never show up in RUSAGE_CHILDREN of the process that used them.
+    """
+    try:
+        from multiprocessing import forkserver
+
+        pid = forkserver._forkserver._forkserver_pid
+        if not pid:
+            return 0.0
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        # utime, stime, cutime, cstime (fields 14-17 of proc(5))
+        return sum(int(value) for value in fields[11:15]) / os.sysconf('SC_CLK_TCK')
+    except Exception:
+        return 0.0
+
+
+def control(fixture, path):
+    with _LOCAL.open(f"{fixture['control']}/{path}", timeout=10) as response:
+        return json.loads(response.read())
+
+
+def start_server(args):
+    command = [sys.executable, SERVER, '--pages', str(args.pages), '--pubmed', str(args.pubmed),
+               '--hosts', str(args.hosts), '--latency', str(args.latency), '--slow-delay', str(args.slow_delay)]
+    if args.single_host:
+        command.append('--single-host')
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line:
+        process.kill()
+        raise RuntimeError('fixture server did not start')
+    return process, json.loads(line)
+
+
+def scraper_options(fixture, workdir, host_rate):
+    """WebScraperHistoricoColab options for a run on throwaway files against the fixture hosts"""
+    queries_file = os.path.join(workdir, 'queries.json')
+    with open(queries_file, 'w') as f:
+        json.dump(fixture['queries'], f)
+    rates = {host: host_rate for host in fixture['hosts']}
+    # The stand-ins answer at once: Google/E-utilities pacing would only measure sleeps
+    rates.update({'google.com': 1000.0, '127.0.0.1': 1000.0})
+    return {
+        'history_db': os.path.join(workdir, 'history.db'),
+        'history_file': os.path.join(workdir, 'history.json'),
+        'cache_file': os.path.join(workdir, 'http_cache.db'),
+        'google_cache_file': os.path.join(workdir, 'google_cache.db'),
+        'queries_file': queries_file,
+        'eutils_base': fixture['eutils_base'],
+        'default_rate': host_rate,
+        'domain_rates': rates,
+        'retry_base_delay': 0.1,
+    }
+
+
+def local_search(fixture):
+    """Stand-in for googlesearch.search reading the fixture server's /search pages"""
+    def search(query, num_results=10, start_num=0, **kwargs):
+        params = urllib.parse.urlencode({'q': query, 'start': start_num, 'num': num_results})
+        with _LOCAL.open(f"{fixture['search_url']}?{params}", timeout=10) as response:
+            yield from json.loads(response.read())['results']
+    return search
+
+
+def run_extract(fixture, workdir, args):
+    from web_scraper_historico import WebScraperHistoricoColab
+
+    scraper = WebScraperHistoricoColab(**scraper_options(fixture, workdir, args.host_rate))
+    rows = []
+    started = time.perf_counter()
+    for url in fixture['categories']:
+        call_started = time.perf_counter()
+        title, abstract, status = scraper.extrair_resumo_completo(url)
+        rows.append((url, status, time.perf_counter() - call_started))
+    return rows, time.perf_counter() - started
+
+
+def run_pipeline(case, fixture, workdir, args):
+    import functions
+    import web_scraper_historico
+
+    discovered = {}
+    rows = []
+    default_sources = functions.fontes_padrao
+
+    def timed(source):
+        def iterate():
+            for url in source():
+                discovered.setdefault(url, time.perf_counter())
+                yield url
+        return iterate
+
+    def offline_sources(scraper, max_urls):
+        sources = default_sources(scraper, max_urls)
+        sources['Specialized'] = lambda: iter(fixture['specialized'])
+        return {label: timed(source) for label, source in sources.items()}
+
+    class TimedPipeline(functions.ScrapePipeline):
+        def run(self):
+            for item in super().run():
+                url, status = item[0], item[3]
+                rows.append((url, status, time.perf_counter() - discovered.get(url, started)))
+                yield item
+
+    web_scraper_historico.search = local_search(fixture)
+    functions.fontes_padrao = offline_sources
+    functions.ScrapePipeline = TimedPipeline
+
+    options = {
+        'max_urls': fixture['google_results'],
+        'scraper_options': scraper_options(fixture, workdir, args.host_rate),
+        'retornar_df': False,
+        'journal_file': os.path.join(workdir, 'journal.jsonl'),
+        'corpus_file': os.path.join(workdir, 'corpus.db'),
+        'retry_budget': 0,
+        'recrawl_budget': 0,
+    }
+    if case == 'threads':
+        options['max_workers'] = args.workers
+    elif case == 'pipeline':
+        options['io_workers'] = args.workers
+
+    started = time.perf_counter()
+    getattr(functions, RUNNERS[case])(**options)
+    return rows, time.perf_counter() - started
+
+
+def child(case, fixture_file, workdir, args):
+    """Run one case in this interpreter and print its metrics after a marker line"""
+    with open(fixture_file) as f:
+        fixture = json.load(f)
+    sys.path.insert(0, ROOT)
+    os.chdir(workdir)
+    # requests honours proxy variables: keep the loopback hosts direct
+    os.environ['NO_PROXY'] = ','.join(filter(None, [os.environ.get('NO_PROXY'), '127.0.0.0/8', 'localhost']))
+
+    if case == 'extract':
+        rows, wall = run_extract(fixture, workdir, args)
+    else:
+        rows, wall = run_pipeline(case, fixture, workdir, args)
+
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    children_cpu = children.ru_utime + children.ru_stime + forkserver_cpu()
+    latencies = [latency for _, _, latency in rows]
+    by_category = {}
+    for url, status, _ in rows:
+        category = fixture['categories'].get(url, 'pubmed_eutils')
+        counts = by_category.setdefault(category, {'urls': 0, 'ok': 0})
+        counts['urls'] += 1
+        counts['ok'] += status == "Sucesso"
+
+    result = {
+        'urls': len(rows),
+        'wall_s': wall,
+        'urls_per_s': len(rows) / wall if wall else 0.0,
+        'latency_p50_s': percentile(latencies, 0.5),
+        'latency_p95_s': percentile(latencies, 0.95),
+        'cpu_s': own.ru_utime + own.ru_stime + children_cpu,
+        'cpu_children_s': children_cpu,
+        'peak_rss_mb': own.ru_maxrss / 1024,
+        'success': sum(status == "Sucesso" for _, status, _ in rows),
+        'by_category': by_category,
+    }
+    sys.stdout.write('\n@@RESULT@@' + json.dumps(result))
+
+
+def run_case(case, fixture, fixture_file, args):
+    control(fixture, '__reset')
+    with tempfile.TemporaryDirectory(prefix=f'bench_offline_{case}_') as workdir:
+        command = [sys.executable, os.path.abspath(__file__), '--child', case, '--fixture-file', fixture_file,
+                   '--workdir', workdir, '--host-rate', str(args.host_rate), '--workers', str(args.workers)]
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=args.timeout)
+    if '@@RESULT@@' not in completed.stdout:
+        tail = (completed.stdout + completed.stderr)[-2000:]
+        raise RuntimeError(f'{case} failed (exit {completed.returncode}):\n{tail}')
+    result = json.loads(completed.stdout.rsplit('@@RESULT@@', 1)[1])
+    stats = control(fixture, '__stats')
+    result['requests_served'] = stats.get('requests', 0)
+    result['mb_served'] = stats.get('bytes', 0) / 1024 / 1024
+    return result
+
+
+def summarize(runs):
+    """Median of every numeric metric over the repeats (the first run's breakdown is kept)"""
+    result = dict(runs[0])
+    for key, value in runs[0].items():
+        if isinstance(value, (int, float)) and all(run.get(key) is not None for run in runs):
+            result[key] = statistics.median(run[key] for run in runs)
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(results, baseline_file):
+    with open(baseline_file) as f:
+        baseline = json.load(f)
+    print(f"\n📏 CHANGE AGAINST {baseline_file} ({baseline.get('commit') or 'unknown version'})")
+    for case, result in results.items():
+        before = baseline.get('results', {}).get(case)
+        if not before or 'error' in before or 'error' in result:
+            continue
+        changes = []
+        for metric, higher_is_better in COMPARED.items():
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            delta = (new - old) / old * 100
+            better = delta > 0 if higher_is_better else delta < 0
+            changes.append(f"{metric} {delta:+.1f}%{'' if abs(delta) < 5 else (' ✅' if better else ' ❌')}")
+        print(f"   • {case:<10} " + ' | '.join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cases', nargs='+', choices=CASES, default=CASES)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--pages', type=int, default=240, help='Google results in the fixture')
+    parser.add_argument('--pubmed', type=int, default=100, help='PMIDs returned by the E-utilities stand-in')
+    parser.add_argument('--hosts', type=int, default=8, help='loopback addresses serving content pages')
+    parser.add_argument('--single-host', action='store_true', help='serve everything on 127.0.0.1')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds added to every page response')
+    parser.add_argument('--slow-delay', type=float, default=1.5, help='extra seconds of the slow responders')
+    parser.add_argument('--host-rate', type=float, default=20.0, help='politeness: requests per second per host')
+    parser.add_argument('--workers', type=int, default=10, help='threads/pipeline: workers')
+    parser.add_argument('--timeout', type=float, default=900, help='seconds allowed per case')
+    parser.add_argument('--output', default='bench_scraper_offline.json')
+    parser.add_argument('--compare', metavar='FILE', help='results of another version to compare with')
+    parser.add_argument('--child', choices=CASES, help=argparse.SUPPRESS)
+    parser.add_argument('--fixture-file', help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.fixture_file, args.workdir, args)
+        return
+
+    server, fixture = start_server(args)
+    results = {}
+    failed = False
+    try:
+        with tempfile.TemporaryDirectory(prefix='bench_offline_') as workdir:
+            fixture_file = os.path.join(workdir, 'fixture.json')
+            with open(fixture_file, 'w') as f:
+                json.dump(fixture, f)
+            print(f"🧪 Fixture: {fixture['google_results']} search results, {len(fixture['pubmed_ids'])} PMIDs, "
+                  f"{len(fixture['specialized'])} specialized pages on {len(fixture['hosts'])} hosts")
+
+            for case in args.cases:
+                try:
+                    result = summarize([run_case(case, fixture, fixture_file, args) for _ in range(args.repeat)])
+                except Exception as e:
+                    failed = True
+                    results[case] = {'error': str(e)}
+                    print(f"❌ {case:<10} {e}")
+                    continue
+                results[case] = result
+                print(f"✅ {case:<10} {result['urls']} URLs ({result['success']} ok) in {result['wall_s']:.1f}s | "
+                      f"{result['urls_per_s']:.1f} URLs/s | p50 {result['latency_p50_s']:.2f}s "
+                      f"p95 {result['latency_p95_s']:.2f}s | CPU {result['cpu_s']:.1f}s | "
+                      f"{result['peak_rss_mb']:.0f} MB | {result['requests_served']} requests")
+    finally:
+        server.terminate()
+        server.wait()
+
+    params = {key: getattr(args, key) for key in ('pages', 'pubmed', 'hosts', 'single_host', 'latency',
+                                                  'slow_delay', 'host_rate', 'workers', 'repeat')}
+    with open(args.output, 'w') as f:
+        json.dump({'python': sys.version.split()[0], 'commit': git_commit(), 'params': params,
+                   'results': results}, f, indent=2)
+    print(f"📁 Results saved to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,383 @@
+"""Local stand-in for the sites a scrape run talks to, used by the offline benchmarks.
+
+Serves a deterministic fixture corpus over plain HTTP on loopback
+addresses: PubMed-, WHO- and journal-like pages, huge pages, slow
+responders, a host that answers 429 (Retry-After) before serving each
+page, a host that only answers 5xx, and PDFs. The control host
+(127.0.0.1) also stands in for Google search (/search, JSON) and for
+E-utilities (/eutils/esearch.fcgi, epost.fcgi, efetch.fcgi).
+
+Content pages are spread over --hosts addresses (127.0.0.10, .11, ...)
+so per-host politeness and connection pools behave as on the real web;
+with --single-host everything stays on 127.0.0.1 (e.g. on macOS, where
+only that loopback address is configured).
+
+    python benchmarks/fixture_server.py --pages 240 --pubmed 100
+
+prints one JSON line describing the fixture (URLs per category, queries,
+endpoints) and serves until interrupted. GET /__stats returns the
+requests served, GET /__reset clears them and the 429 state.
+"""
+import argparse
+import json
+import random
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CONTROL_HOST = '127.0.0.1'
+THROTTLED_HOST = '127.0.0.2'
+FAILING_HOST = '127.0.0.3'
+FIRST_CONTENT_HOST = 10
+
+# Share of the Google results per kind of page
+MIX = [
+    ('pubmed_html', 0.20),
+    ('who', 0.15),
+    ('journal', 0.35),
+    ('huge', 0.05),
+    ('slow', 0.05),
+    ('rate_limited', 0.08),
+    ('server_error', 0.06),
+    ('pdf', 0.06),
+]
+GOOGLE_QUERIES = [
+    'leprosy mobile app diagnosis',
+    'hansen disease smartphone screening',
+    'leprosy artificial intelligence skin lesions',
+    'leprosy telemedicine digital health',
+]
+PUBMED_TERMS = ['leprosy mobile health', 'hansen disease deep learning']
+SPECIALIZED_PAGES = 8
+FIRST_PMID = 30000001
+
+WORDS = (
+    'leprosy hansen disease patients diagnosis screening skin lesions smartphone mobile app '
+    'application health workers community study results accuracy sensitivity specificity '
+    'artificial intelligence machine learning deep learning neural network computer vision '
+    'telemedicine telehealth digital health mhealth image classification treatment '
+    'multidrug therapy nerve damage disability endemic regions brazil india surveillance '
+    'early detection primary care training evaluation prototype validation cohort'
+).split()
+
+
+def sentence(rng, words=18):
+    text = ' '.join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + '.'
+
+
+def paragraph(rng, sentences=5):
+    return ' '.join(sentence(rng, rng.randint(12, 24)) for _ in range(sentences))
+
+
+def navigation(rng, links=120):
+    """Menus and footers of a portal page: lots of markup before the content"""
+    items = ''.join(f'<li><a href="/section/{i}">{rng.choice(WORDS).title()} {i}</a></li>' for i in range(links))
+    return f'<header><nav><ul class="menu">{items}</ul></nav></header>'
+
+
+def pubmed_page(n, title_prefix='Article'):
+    """PubMed-like article page: description meta in the head, structured abstract in the body"""
+    rng = random.Random(n)
+    title = f'{title_prefix} {n}: {sentence(rng, 9)[:-1]}'
+    abstract = paragraph(rng, 6)
+    sections = ''.join(f'<h3>{label}</h3><p>{paragraph(rng, 2)}</p>'
+                       for label in ('Background', 'Methods', 'Results', 'Conclusions'))
+    return (
+        f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{title} - PubMed</title>'
+        f'<meta name="description" content="{abstract[:300]}">'
+        f'<meta name="citation_title" content="{title}"></head>'
+        f'<body>{navigation(rng, 40)}<main><h1 class="heading-title">{title}</h1>'
+        f'<div class="abstract" id="abstract"><div class="abstract-content">{sections}</div></div>'
+        f'</main></body></html>'
+    )
+
+
+def who_page(n):
+    """WHO-like portal page: only og:description in the head, long body"""
+    rng = random.Random(10 ** 6 + n)
+    title = f'Leprosy fact sheet {n}'
+    body = ''.join(f'<section><h2>{sentence(rng, 4)}</h2><p>{paragraph(rng)}</p></section>' for _ in range(12))
+    return (
+        f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title>'
+        f'<meta property="og:description" content="{sentence(rng, 30)}">'
+        f'<link rel="stylesheet" href="/static/site.css"><script src="/static/site.js"></script></head>'
+        f'<body>{navigation(rng)}<main>{body}</main><footer>{navigation(rng, 60)}</footer></body></html>'
+    )
+
+
+def journal_page(n):
+    """Journal article page without description metas: the abstract is found in the body"""
+    rng = random.Random(2 * 10 ** 6 + n)
+    title = f'Journal article {n}: {sentence(rng, 10)[:-1]}'
+    body = ''.join(f'<h2>Section {i}</h2><p>{paragraph(rng)}</p>' for i in range(10))
+    return (
+        f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title>'
+        f'<meta name="citation_title" content="{title}"><meta name="citation_doi" content="10.1000/{n}">'
+        f'</head><body>{navigation(rng, 80)}<article><h1>{title}</h1>'
+        f'<div class="article-abstract"><h2>Abstract</h2><p>{paragraph(rng, 7)}</p></div>'
+        f'{body}</article></body></html>'
+    )
+
+
+def huge_body(size):
+    """Body of the huge pages: several MB of paragraphs and tables, no metas"""
+    rng = random.Random(3 * 10 ** 6)
+    chunk = ''.join(f'<p>{paragraph(rng)}</p><table><tr>' + '<td>cell</td>' * 20 + '</tr></table>'
+                    for _ in range(40))
+    return chunk * max(size // len(chunk), 1)
+
+
+class Fixture:
+    """Corpus, URL lists and request handling shared by every loopback server"""
+
+    def __init__(self, pages, pubmed, latency, slow_delay, huge_bytes, pdf_bytes):
+        self.pages = pages
+        self.pubmed = pubmed
+        self.latency = latency
+        self.slow_delay = slow_delay
+        self.huge_body = huge_body(huge_bytes)
+        self.pdf = b'%PDF-1.4\n' + bytes(random.Random(4).getrandbits(8) for _ in range(pdf_bytes))
+        self.lock = threading.Lock()
+        self.hits = Counter()
+        self.seen = set()
+        self.webenvs = {}
+
+    def describe(self, hosts):
+        """URLs of every kind of page, the queries that return them and the stand-in endpoints"""
+        control, content = hosts['control'], hosts['content']
+        kinds = [kind for kind, share in MIX for _ in range(max(round(share * self.pages), 1))]
+        random.Random(5).shuffle(kinds)
+
+        categories = {}
+        google = []
+        for n, kind in enumerate(kinds):
+            if kind == 'rate_limited':
+                url = f"{hosts['throttled']}/ratelimited/{n}"
+            elif kind == 'server_error':
+                url = f"{hosts['failing']}/error/{n}"
+            else:
+                path = {'pubmed_html': f'/pubmed/{n}/', 'who': f'/who/{n}', 'journal': f'/journal/{n}',
+                        'huge': f'/huge/{n}', 'slow': f'/slow/{n}', 'pdf': f'/pdf/{n}.pdf'}[kind]
+                url = content[n % len(content)] + path
+            categories[url] = kind
+            google.append(url)
+
+        specialized = [f'{content[n % len(content)]}/who/{self.pages + n}' for n in range(SPECIALIZED_PAGES)]
+        categories.update((url, 'who') for url in specialized)
+
+        # Each query returns an equal share of the results
+        share = -(-len(google) // len(GOOGLE_QUERIES))
+        self.results = {query: google[i * share:(i + 1) * share] for i, query in enumerate(GOOGLE_QUERIES)}
+
+        return {
+            'search_url': f'{control}/search',
+            'eutils_base': f'{control}/eutils',
+            'control': control,
+            'hosts': sorted({urlparse(url).hostname for url in [control, *content, hosts['throttled'],
+                                                                   hosts['failing']]}),
+            'queries': {'google': GOOGLE_QUERIES, 'pubmed': PUBMED_TERMS},
+            'google_results': len(google),
+            'specialized': specialized,
+            'pubmed_ids': [str(FIRST_PMID + i) for i in range(self.pubmed)],
+            'categories': categories,
+        }
+
+    def reset(self):
+        with self.lock:
+            self.hits.clear()
+            self.seen.clear()
+            self.webenvs.clear()
+
+    def _count(self, kind, size=0):
+        with self.lock:
+            self.hits['requests'] += 1
+            self.hits[kind] += 1
+            self.hits['bytes'] += size
+
+    def handle(self, request, body=b''):
+        """(status, content type, payload, extra headers) for a request"""
+        url = urlparse(request.path)
+        parts = [part for part in url.path.split('/') if part]
+        query = parse_qs(url.query)
+        query.update(parse_qs(body.decode('utf-8', 'replace')))
+        kind = parts[0] if parts else ''
+
+        if kind == '__stats':
+            with self.lock:
+                return 200, 'application/json', json.dumps(dict(self.hits)).encode(), {}
+        if kind == '__reset':
+            self.reset()
+            return 200, 'application/json', b'{}', {}
+        if kind == 'search':
+            return self._search(query)
+        if kind == 'eutils':
+            return self._eutils(parts[-1], query)
+
+        time.sleep(self.latency)
+        number = parts[1].split('.')[0] if len(parts) > 1 else ''
+        n = int(number) if number.isdigit() else 0
+        if kind == 'pubmed':
+            return 200, 'text/html; charset=utf-8', pubmed_page(n).encode(), {}
+        if kind == 'who':
+            return 200, 'text/html; charset=utf-8', who_page(n).encode(), {}
+        if kind == 'journal':
+            return 200, 'text/html; charset=utf-8', journal_page(n).encode(), {}
+        if kind == 'slow':
+            time.sleep(self.slow_delay)
+            return 200, 'text/html; charset=utf-8', journal_page(n).encode(), {}
+        if kind == 'huge':
+            page = f'<html><head><title>Huge page {n}</title></head><body>{self.huge_body}</body></html>'
+            return 200, 'text/html; charset=utf-8', page.encode(), {}
+        if kind == 'pdf':
+            return 200, 'application/pdf', self.pdf, {}
+        if kind == 'ratelimited':
+            with self.lock:
+                first = url.path not in self.seen
+                self.seen.add(url.path)
+            if first:
+                return 429, 'text/html', b'<html><body>Too Many Requests</body></html>', {'Retry-After': '1'}
+            return 200, 'text/html; charset=utf-8', pubmed_page(n, 'Throttled article').encode(), {}
+        if kind == 'error':
+            status = 500 if n % 2 == 0 else 503
+            return status, 'text/html', b'<html><body>Server Error</body></html>', {}
+        return 404, 'text/html', b'<html><body>Not Found</body></html>', {}
+
+    def _search(self, query):
+        """Google stand-in: one page of results of a fixture query"""
+        results = self.results.get(query.get('q', [''])[0], [])
+        start = int(query.get('start', ['0'])[0])
+        num = int(query.get('num', ['10'])[0])
+        return 200, 'application/json', json.dumps({'results': results[start:start + num]}).encode(), {}
+
+    def _eutils(self, endpoint, query):
+        """E-utilities stand-in: esearch (JSON), epost and efetch (XML) over the fixture PMIDs"""
+        time.sleep(self.latency)
+        pmids = [str(FIRST_PMID + i) for i in range(self.pubmed)]
+        if endpoint == 'esearch.fcgi':
+            start = int(query.get('retstart', ['0'])[0])
+            size = int(query.get('retmax', ['20'])[0])
+            result = {'esearchresult': {'count': str(len(pmids)), 'idlist': pmids[start:start + size]}}
+            return 200, 'application/json', json.dumps(result).encode(), {}
+        if endpoint == 'epost.fcgi':
+            with self.lock:
+                webenv = f'MCID_bench_{len(self.webenvs)}'
+                self.webenvs[webenv] = query.get('id', [''])[0].split(',')
+            xml = f'<ePostResult><QueryKey>1</QueryKey><WebEnv>{webenv}</WebEnv></ePostResult>'
+            return 200, 'text/xml', xml.encode(), {}
+        if endpoint == 'efetch.fcgi':
+            with self.lock:
+                ids = self.webenvs.get(query.get('WebEnv', [''])[0], [])
+            start = int(query.get('retstart', ['0'])[0])
+            size = int(query.get('retmax', ['20'])[0])
+            articles = ''.join(self._pubmed_article(pmid) for pmid in ids[start:start + size])
+            return 200, 'text/xml', f'<PubmedArticleSet>{articles}</PubmedArticleSet>'.encode(), {}
+        return 404, 'text/plain', b'unknown endpoint', {}
+
+    @staticmethod
+    def _pubmed_article(pmid):
+        rng = random.Random(int(pmid))
+        sections = ''.join(f'<AbstractText Label="{label}">{paragraph(rng, 2)}</AbstractText>'
+                           for label in ('BACKGROUND', 'METHODS', 'RESULTS', 'CONCLUSIONS'))
+        return (
+            f'<PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article>'
+            f'<ArticleTitle>{sentence(rng, 11)}</ArticleTitle><Abstract>{sections}</Abstract>'
+            f'</Article></MedlineCitation></PubmedArticle>'
+        )
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _respond(self, body=b''):
+        kind = urlparse(self.path).path.strip('/').split('/')[0]
+        status, content_type, payload, headers = self.server.fixture.handle(self, body)
+        if not kind.startswith('__'):
+            self.server.fixture._count(kind, len(payload))
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # Clients stop reading huge pages at their download cap
+            self.close_connection = True
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self._respond(self.rfile.read(length))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping a connection (download caps, closed pools) are expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def start_servers(fixture, hosts=8, single_host=False):
+    """Bind the control, throttled, failing and content servers; returns {role: base URL or list}"""
+    servers = []
+
+    def serve(address):
+        server = FixtureServer((address, 0), FixtureHandler)
+        server.fixture = fixture
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f'http://{address}:{server.server_address[1]}'
+
+    def address(last_octet):
+        return CONTROL_HOST if single_host else f'127.0.0.{last_octet}'
+
+    roles = {
+        'control': serve(CONTROL_HOST),
+        'throttled': serve(address(2)),
+        'failing': serve(address(3)),
+        'content': [serve(address(FIRST_CONTENT_HOST + i)) for i in range(max(hosts, 1))],
+    }
+    return roles, servers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=240, help='Google results in the fixture')
+    parser.add_argument('--pubmed', type=int, default=100, help='PMIDs returned by the E-utilities stand-in')
+    parser.add_argument('--hosts', type=int, default=8, help='loopback addresses serving content pages')
+    parser.add_argument('--single-host', action='store_true', help='serve everything on 127.0.0.1')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds added to every page response')
+    parser.add_argument('--slow-delay', type=float, default=1.5, help='extra seconds of the slow responders')
+    parser.add_argument('--huge-bytes', type=int, default=4 * 1024 * 1024)
+    parser.add_argument('--pdf-bytes', type=int, default=256 * 1024)
+    args = parser.parse_args()
+
+    fixture = Fixture(args.pages, args.pubmed, args.latency, args.slow_delay, args.huge_bytes, args.pdf_bytes)
+    roles, servers = start_servers(fixture, args.hosts, args.single_host)
+    sys.stdout.write(json.dumps(fixture.describe(roles)) + '\n')
+    sys.stdout.flush()
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        while True:
+            time.sleep(3600)
+    except (KeyboardInterrupt, SystemExit):
+        for server in servers:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
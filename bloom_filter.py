@@ -0,0 +1,149 @@
+import hashlib
+import math
+import mmap
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b'LEPBLOOM'
+HEADER = struct.Struct('<8sIQIQ16s')
+HEADER_SIZE = 64
+MASK64 = (1 << 64) - 1
+
+
+def _hashes(key):
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+
+
+def _hashes_many(keys):
+    digests = b''.join(hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest() for key in keys)
+    pairs = np.frombuffer(digests, dtype='<u8').reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def fingerprint(text):
+    """16-byte digest used to tie a filter to the data it was built from"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+class BloomFilter:
+    """Bloom filter stored in a file and memory-mapped on open.
+
+    Opening costs neither time nor resident memory proportional to the
+    number of keys: pages are only read when a lookup touches them. A
+    negative answer is exact; a positive one must be confirmed elsewhere.
+    Bits are set with double hashing over a blake2b digest; bulk operations
+    are vectorized with numpy.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, file_name, mm, num_bits, num_hashes, count, tag):
+        self.file_name = file_name
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.count = count
+        self.tag = tag
+        self._mm = mm
+        self._bits = np.frombuffer(mm, dtype=np.uint8, offset=HEADER_SIZE)
+
+    @staticmethod
+    def size_for(capacity, error_rate=0.01):
+        """(num_bits, num_hashes) for the target capacity and false positive rate"""
+        capacity = max(int(capacity), 1)
+        num_bits = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        num_bits = (num_bits + 7) // 8 * 8
+        num_hashes = max(1, int(round(num_bits / capacity * math.log(2))))
+        return num_bits, num_hashes
+
+    @classmethod
+    def create(cls, file_name, capacity, error_rate=0.01, tag=b''):
+        """Create an empty filter file sized for capacity keys"""
+        num_bits, num_hashes = cls.size_for(capacity, error_rate)
+        with open(file_name, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, cls.FORMAT_VERSION, num_bits, num_hashes, 0, tag.ljust(16, b'\0')[:16])
+                    .ljust(HEADER_SIZE, b'\0'))
+            f.truncate(HEADER_SIZE + num_bits // 8)
+        return cls.open(file_name)
+
+    @classmethod
+    def open(cls, file_name):
+        """Memory-map an existing filter file (None if it is missing or invalid)"""
+        if not os.path.exists(file_name):
+            return None
+        with open(file_name, 'r+b') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0)
+            except ValueError:
+                return None
+        try:
+            magic, version, num_bits, num_hashes, count, tag = HEADER.unpack_from(mm, 0)
+        except struct.error:
+            mm.close()
+            return None
+        if magic != MAGIC or version != cls.FORMAT_VERSION or len(mm) != HEADER_SIZE + num_bits // 8:
+            mm.close()
+            return None
+        return cls(file_name, mm, num_bits, num_hashes, count, tag)
+
+    def capacity(self, error_rate=0.01):
+        """Number of keys this filter holds at error_rate"""
+        return int(self.num_bits * math.log(2) ** 2 / -math.log(error_rate))
+
+    def __contains__(self, key):
+        h1, h2 = _hashes(key)
+        bits = self._mm
+        for i in range(self.num_hashes):
+            position = ((h1 + i * h2) & MASK64) % self.num_bits
+            if not bits[HEADER_SIZE + (position >> 3)] >> (position & 7) & 1:
+                return False
+        return True
+
+    def _positions(self, keys):
+        h1, h2 = _hashes_many(keys)
+        i = np.arange(self.num_hashes, dtype=np.uint64)
+        # uint64 arithmetic wraps exactly like the & MASK64 in __contains__
+        return (h1[:, None] + i[None, :] * h2[:, None]) % np.uint64(self.num_bits)
+
+    def contains_many(self, keys):
+        """Boolean array: probable membership of each key"""
+        keys = list(keys)
+        if not keys:
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(keys)
+        hits = (self._bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return hits.all(axis=1)
+
+    def add_many(self, keys, chunk_size=100000):
+        """Insert keys (the header count is updated by set_count)"""
+        keys = iter(keys)
+        while True:
+            chunk = [key for _, key in zip(range(chunk_size), keys)]
+            if not chunk:
+                break
+            positions = self._positions(chunk).ravel()
+            byte_index = positions >> np.uint64(3)
+            bit = (positions & np.uint64(7)).astype(np.uint8)
+            for b in range(8):
+                # Duplicated indexes are harmless: each pass ORs the same constant
+                selected = byte_index[bit == b]
+                self._bits[selected] |= np.uint8(1 << b)
+
+    def set_count(self, count):
+        """Record how many keys of the source data the filter reflects"""
+        self.count = count
+        self._mm[:HEADER_SIZE] = HEADER.pack(
+            MAGIC, self.FORMAT_VERSION, self.num_bits, self.num_hashes, count, self.tag.ljust(16, b'\0')[:16]
+        ).ljust(HEADER_SIZE, b'\0')
+
+    def flush(self):
+        self._mm.flush()
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.flush()
+            del self._bits
+            self._mm.close()
+            self._mm = None
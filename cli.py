@@ -0,0 +1,146 @@
+"""Command-line entry point.
+
+    python cli.py scrape [--mode threads] [--max-urls 120] [--resume] ...
+    python cli.py visualize [--corpus corpus_leprosy.db] [--output-dir dashboard] [--topics]
+    python cli.py history [--history-db historico_leprosy_colab.db]
+
+Each subcommand imports what it needs when it runs: `scrape` never loads
+pandas, matplotlib or seaborn, and numpy only once it opens the history's
+Bloom filter (history_bloom); `history` loads none of them and `--help`
+loads nothing beyond argparse.
+See benchmarks/bench_cli_startup.py for the startup-time budget.
+"""
+import argparse
+import logging
+import os
+import sys
+import warnings
+
+MODES = {
+    'sequential': 'executar_scraper_incremental',
+    'threads': 'executar_scraper_incremental_threads',
+    'async': 'executar_scraper_incremental_async',
+    'pipeline': 'executar_scraper_incremental_pipeline',
+}
+
+
+def comando_scrape(args):
+    import functions
+
+    options = {
+        'max_urls': args.max_urls,
+        'formatos': tuple(args.formats),
+        'ordenar_status': not args.no_sort,
+        'retornar_df': False,
+        'resume': args.resume,
+        'retry_budget': args.retry_budget,
+        'recrawl_budget': args.recrawl_budget,
+        'corpus_file': args.corpus or None,
+        'dashboard_dir': args.dashboard,
+        'scraper_options': {'history_db': args.history_db},
+    }
+    if args.mode == 'threads':
+        options.update(max_workers=args.workers, max_concurrency=args.max_concurrency,
+                       adaptive=not args.fixed_workers)
+    elif args.mode == 'async':
+        options.update(max_in_flight=args.max_in_flight)
+    elif args.mode == 'pipeline':
+        options.update(io_workers=args.workers)
+
+    getattr(functions, MODES[args.mode])(**options)
+    return 0
+
+
+def comando_visualize(args):
+    from dashboard import renderizar_dashboard
+
+    if not os.path.exists(args.corpus):
+        print(f"⚠️ Corpus {args.corpus} not found: run `python cli.py scrape` first")
+        return 1
+    files = renderizar_dashboard(args.corpus, args.output_dir, formats=tuple(args.formats), run_id=args.run)
+
+    if args.topics:
+        from corpus_store import CorpusStore
+        from topic_engine import default_matcher
+
+        corpus = CorpusStore(args.corpus)
+        try:
+            abstracts = corpus.load(['Abstract'], status='Sucesso', latest=True)['Abstract']
+        finally:
+            corpus.close()
+        frequency = default_matcher().count_matrix(abstracts).document_frequency()
+        print(f"\n🎯 TOPICS IN {len(abstracts)} ABSTRACTS:")
+        for topic, count in frequency[frequency > 0].sort_values(ascending=False).items():
+            print(f"   • {topic}: {count} documents")
+    return 0 if files else 1
+
+
+def comando_history(args):
+    from history_store import HistoryStore
+
+    if not os.path.exists(args.history_db):
+        print(f"🆕 No history yet ({args.history_db} does not exist)")
+        return 0
+    store = HistoryStore(args.history_db)
+    try:
+        store.mostrar_historico(sample=args.sample)
+    finally:
+        store.close()
+    return 0
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description='Incremental web scraper for leprosy research')
+    subparsers = parser.add_subparsers(dest='command', metavar='{scrape,visualize,history}')
+
+    scrape = subparsers.add_parser('scrape', help='search and scrape new URLs')
+    scrape.add_argument('--mode', choices=MODES, default='sequential', help='fetch engine (default: sequential)')
+    scrape.add_argument('--max-urls', type=int, default=120, help='Google results per run (default: 120)')
+    scrape.add_argument('--workers', type=int, default=10,
+                        help='threads: starting concurrency; pipeline: I/O threads (default: 10)')
+    scrape.add_argument('--max-concurrency', type=int, default=64, help='threads: concurrency ceiling')
+    scrape.add_argument('--fixed-workers', action='store_true', help='threads: disable adaptive concurrency')
+    scrape.add_argument('--max-in-flight', type=int, default=200, help='async: requests in flight')
+    scrape.add_argument('--resume', action='store_true', help='continue an interrupted run')
+    scrape.add_argument('--formats', nargs='+', default=['csv'], choices=['csv', 'jsonl'])
+    scrape.add_argument('--no-sort', action='store_true', help='do not group the CSV rows by status')
+    scrape.add_argument('--retry-budget', type=int, default=50)
+    scrape.add_argument('--recrawl-budget', type=int, default=20)
+    scrape.add_argument('--history-db', default='historico_leprosy_colab.db')
+    scrape.add_argument('--corpus', default='corpus_leprosy.db', help="consolidated corpus ('' to disable)")
+    scrape.add_argument('--dashboard', metavar='DIR', help='save the dashboard charts to DIR after the run')
+    scrape.set_defaults(handler=comando_scrape)
+
+    visualize = subparsers.add_parser('visualize', help='save the corpus dashboard as PNG/SVG')
+    visualize.add_argument('--corpus', default='corpus_leprosy.db')
+    visualize.add_argument('--output-dir', default='dashboard')
+    visualize.add_argument('--formats', nargs='+', default=['png', 'svg'])
+    visualize.add_argument('--run', help='run id (leprosy_incremental_<timestamp>) for the status chart')
+    visualize.add_argument('--topics', action='store_true', help='also print topic counts of the corpus')
+    visualize.set_defaults(handler=comando_visualize)
+
+    history = subparsers.add_parser('history', help='show the history of processed URLs')
+    history.add_argument('--history-db', default='historico_leprosy_colab.db')
+    history.add_argument('--sample', type=int, default=3, help='example URLs to show')
+    history.set_defaults(handler=comando_history)
+    return parser
+
+
+def main(argv=None, default_command=None):
+    """Run a subcommand; without one, default_command (if any) is used"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = criar_parser()
+    if default_command and (not argv or argv[0].startswith('-')) and not {'-h', '--help'} & set(argv):
+        argv = [default_command] + argv
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+
+    warnings.filterwarnings('ignore')
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,252 @@
+import csv
+import glob
+import os
+import sqlite3
+from urllib.parse import urlparse
+
+from sinks import COLUMNS
+
+# Output row field → column of the documents table
+FIELD_COLUMNS = {
+    'URL': 'url',
+    'Title': 'title',
+    'Abstract': 'abstract',
+    'Status': 'status',
+    'Source': 'source',
+    'Processing_Date': 'processed_at',
+    'Execution': 'execution',
+    'Domain': 'domain',
+    'Abstract_Length': 'abstract_length',
+    'Run': 'run_id',
+}
+# Abstract-length histogram kept in the aggregates: 50-character buckets over the 0-500 characters
+# abstracts are cut to, the last one open-ended. Placeholder abstracts are left out.
+ABSTRACT_BUCKET = 50
+ABSTRACT_BUCKETS = 10
+NO_ABSTRACT = 'Abstract not available'
+# Bumped whenever the aggregate triggers change, so older corpora get them rebuilt
+AGGREGATES_VERSION = 2
+FILTER_COLUMNS = {'status': 'status', 'source': 'source', 'domain': 'domain', 'execution': 'execution',
+                  'run': 'run_id'}
+
+
+def _domain(url):
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class CorpusStore:
+    """Every processed row of every run in one SQLite table with typed, indexed columns.
+
+    A run writes to it like any other sink (run_id tells runs apart, and
+    rewriting a row of the same run replaces it). load() reads only the
+    requested columns, with the filters evaluated by SQLite on the indexes,
+    instead of re-parsing every leprosy_incremental_*.csv.
+
+    Triggers keep running counts per status, source, domain, execution,
+    day and abstract-length bucket in the aggregates table, so summaries
+    (see dashboard) never scan the documents.
+    """
+
+    def __init__(self, db_file='corpus_leprosy.db', run_id=None, commit_every=50):
+        self.db_file = db_file
+        self.file_name = db_file
+        self.run_id = run_id
+        self.commit_every = commit_every
+        self.rows_written = 0
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                run_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                domain TEXT NOT NULL,
+                title TEXT,
+                abstract TEXT,
+                abstract_length INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                source TEXT NOT NULL,
+                execution TEXT NOT NULL,
+                processed_at TEXT NOT NULL,
+                UNIQUE (run_id, url)
+            );
+            CREATE INDEX IF NOT EXISTS idx_documents_url ON documents (url);
+            CREATE INDEX IF NOT EXISTS idx_documents_status ON documents (status, processed_at);
+            CREATE INDEX IF NOT EXISTS idx_documents_source ON documents (source, processed_at);
+            CREATE INDEX IF NOT EXISTS idx_documents_domain ON documents (domain);
+            CREATE INDEX IF NOT EXISTS idx_documents_processed_at ON documents (processed_at);
+            CREATE TABLE IF NOT EXISTS aggregates (
+                dimension TEXT NOT NULL,
+                key TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (dimension, key)
+            );
+        """)
+        if self._conn.execute('PRAGMA user_version').fetchone()[0] < AGGREGATES_VERSION:
+            # New corpus, or aggregates kept with older triggers: recount them from the documents
+            self._conn.executescript(''.join(f'DROP TRIGGER IF EXISTS documents_aggregate_{event};'
+                                             for event in ('insert', 'update', 'delete')))
+            self._conn.executescript(self._aggregate_triggers())
+            self.rebuild_aggregates()
+            self._conn.execute(f'PRAGMA user_version = {AGGREGATES_VERSION}')
+        self._conn.commit()
+
+    @staticmethod
+    def _aggregate_keys(row):
+        """(dimension, key SQL) pairs counted for a documents row (row is NEW or OLD in a trigger)"""
+        return [
+            ('status', f'{row}.status'),
+            ('source', f'{row}.source'),
+            ('domain', f'{row}.domain'),
+            ('execution', f'{row}.execution'),
+            ('day', f'substr({row}.processed_at, 1, 10)'),
+        ]
+
+    def _aggregate_triggers(self):
+        """Triggers keeping the aggregates table in step with every insert and rewrite of a row"""
+        def change(row, delta):
+            values = ', '.join(f"('{dimension}', {key}, {delta})" for dimension, key in self._aggregate_keys(row))
+            length_key = f"CAST(min({row}.abstract_length / {ABSTRACT_BUCKET}, {ABSTRACT_BUCKETS - 1}) " \
+                         f"* {ABSTRACT_BUCKET} AS TEXT)"
+            return f"""
+                INSERT INTO aggregates (dimension, key, count) VALUES {values}
+                    ON CONFLICT (dimension, key) DO UPDATE SET count = count + ({delta});
+                INSERT INTO aggregates (dimension, key, count)
+                    SELECT 'abstract_length', {length_key}, {delta}
+                    WHERE {row}.status = 'Sucesso' AND {row}.abstract IS NOT '{NO_ABSTRACT}'
+                    ON CONFLICT (dimension, key) DO UPDATE SET count = count + ({delta});"""
+
+        return f"""
+            CREATE TRIGGER IF NOT EXISTS documents_aggregate_insert AFTER INSERT ON documents BEGIN
+                {change('NEW', 1)}
+            END;
+            CREATE TRIGGER IF NOT EXISTS documents_aggregate_update AFTER UPDATE ON documents BEGIN
+                {change('OLD', -1)}
+                {change('NEW', 1)}
+            END;
+            CREATE TRIGGER IF NOT EXISTS documents_aggregate_delete AFTER DELETE ON documents BEGIN
+                {change('OLD', -1)}
+            END;
+        """
+
+    def rebuild_aggregates(self):
+        """Recompute the aggregates table from the documents (one scan of the corpus)"""
+        self._conn.execute('DELETE FROM aggregates')
+        for dimension, key in self._aggregate_keys('documents'):
+            self._conn.execute(
+                f"INSERT INTO aggregates (dimension, key, count) "
+                f"SELECT '{dimension}', {key}, COUNT(*) FROM documents GROUP BY 2"
+            )
+        self._conn.execute(
+            f"INSERT INTO aggregates (dimension, key, count) "
+            f"SELECT 'abstract_length', CAST(min(abstract_length / {ABSTRACT_BUCKET}, {ABSTRACT_BUCKETS - 1}) "
+            f"* {ABSTRACT_BUCKET} AS TEXT), COUNT(*) FROM documents "
+            f"WHERE status = 'Sucesso' AND abstract IS NOT '{NO_ABSTRACT}' GROUP BY 2"
+        )
+        self._conn.commit()
+
+    def aggregates(self, dimension, limit=None):
+        """{key: count} of one running aggregate (status, source, domain, execution, day, abstract_length),
+        largest counts first"""
+        query = 'SELECT key, count FROM aggregates WHERE dimension = ? AND count > 0 ORDER BY count DESC'
+        if limit is not None:
+            query += f' LIMIT {int(limit)}'
+        self._conn.commit()
+        return dict(self._conn.execute(query, (dimension,)).fetchall())
+
+    def run_counts(self, run_id, column='status'):
+        """{value: rows} of one run for a column (uses the (run_id, url) index)"""
+        self._conn.commit()
+        return dict(self._conn.execute(
+            f'SELECT {FIELD_COLUMNS.get(column, column)}, COUNT(*) FROM documents WHERE run_id = ? GROUP BY 1',
+            (run_id,)
+        ).fetchall())
+
+    def __len__(self):
+        return self._conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+
+    def _values(self, row, run_id):
+        abstract = row.get('Abstract') or ''
+        return (run_id, row['URL'], _domain(row['URL']), row.get('Title'), row.get('Abstract'), len(abstract),
+                row['Status'], row.get('Source') or '', row.get('Execution') or '', row['Processing_Date'])
+
+    def _insert(self, rows):
+        self._conn.executemany(
+            'INSERT INTO documents (run_id, url, domain, title, abstract, abstract_length, status, '
+            'source, execution, processed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT (run_id, url) DO UPDATE SET domain = excluded.domain, title = excluded.title, '
+            'abstract = excluded.abstract, abstract_length = excluded.abstract_length, status = excluded.status, '
+            'source = excluded.source, execution = excluded.execution, processed_at = excluded.processed_at', rows
+        )
+
+    def write(self, row):
+        """Append an output row of the current run (committed every commit_every rows)"""
+        self._insert([self._values(row, self.run_id)])
+        self.rows_written += 1
+        if self.rows_written % self.commit_every == 0:
+            self._conn.commit()
+
+    def import_csv(self, pattern='leprosy_incremental_*.csv'):
+        """Load the per-run CSV files written before the store existed (the file name is the run id)"""
+        imported = 0
+        for file_name in sorted(glob.glob(pattern)):
+            run_id = os.path.splitext(os.path.basename(file_name))[0]
+            try:
+                with open(file_name, newline='', encoding='utf-8') as f:
+                    self._insert(self._values(row, run_id) for row in csv.DictReader(f))
+                self._conn.commit()
+                imported += 1
+            except Exception as e:
+                self._conn.rollback()
+                print(f"⚠️ Could not import {file_name}: {e}")
+        return imported
+
+    def load(self, columns=None, status=None, source=None, domain=None, execution=None, run=None,
+             since=None, until=None, latest=False, limit=None):
+        """DataFrame with the requested columns (output field names, see FIELD_COLUMNS).
+
+        status/source/domain/execution/run take a value or a list of values;
+        since/until compare with Processing_Date ('YYYY-MM-DD' or a full
+        timestamp; until is exclusive). latest=True keeps only the most
+        recent row of each URL (a URL appears once per run that processed it).
+        """
+        import pandas as pd
+
+        columns = list(columns or COLUMNS)
+        unknown = [field for field in columns if field not in FIELD_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown corpus column(s) {unknown} (available: {', '.join(FIELD_COLUMNS)})")
+
+        where, params = [], []
+        for name, value in (('status', status), ('source', source), ('domain', domain),
+                            ('execution', execution), ('run', run)):
+            if value is None:
+                continue
+            values = [value] if isinstance(value, str) else list(value)
+            where.append(f"{FILTER_COLUMNS[name]} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        if since is not None:
+            where.append('processed_at >= ?')
+            params.append(str(since))
+        if until is not None:
+            where.append('processed_at < ?')
+            params.append(str(until))
+        if latest:
+            where.append('id IN (SELECT MAX(id) FROM documents GROUP BY url)')
+
+        query = 'SELECT ' + ', '.join(f'{FIELD_COLUMNS[field]} AS "{field}"' for field in columns) + ' FROM documents'
+        if where:
+            query += ' WHERE ' + ' AND '.join(where)
+        query += ' ORDER BY id'
+        if limit is not None:
+            query += f' LIMIT {int(limit)}'
+
+        self._conn.commit()
+        dates = ['Processing_Date'] if 'Processing_Date' in columns else None
+        return pd.read_sql_query(query, self._conn, params=params, parse_dates=dates)
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
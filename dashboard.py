@@ -0,0 +1,115 @@
+import os
+
+from corpus_store import ABSTRACT_BUCKET, CorpusStore
+
+STATUS_COLORS = {'Sucesso': '#2ecc71', 'Erro': '#e74c3c'}
+
+
+def _bar(ax, labels, values, title, xlabel, ylabel, colors=None):
+    bars = ax.bar(range(len(values)), values, color=colors)
+    ax.set_title(title, fontweight='bold')
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_xticks(range(len(labels)))
+    ax.set_xticklabels(labels, rotation=45, ha='right')
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2., height, f'{int(height)}', ha='center', va='bottom')
+
+
+def _palette(name, n):
+    """n colors of a qualitative matplotlib colormap (seaborn/pandas are not needed here)"""
+    from matplotlib import colormaps
+
+    colors = colormaps[name].colors
+    return [colors[i % len(colors)] for i in range(n)]
+
+
+def renderizar_dashboard(corpus_file='corpus_leprosy.db', output_dir='dashboard', formats=('png', 'svg'),
+                         run_id=None, top_domains=6, dpi=100):
+    """Write the dashboard charts to output_dir/dashboard.<format> without a display.
+
+    Everything is drawn from the running aggregates of the corpus store
+    (and the status counts of run_id, when given), so the cost does not
+    grow with the corpus. Uses the Agg canvas directly: no pyplot window,
+    no plt.show(), and the interactive backend is left alone.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    corpus = CorpusStore(corpus_file)
+    try:
+        status = corpus.aggregates('status')
+        run_status = corpus.run_counts(run_id) if run_id else {}
+        sources = corpus.aggregates('source')
+        domains = corpus.aggregates('domain', limit=top_domains)
+        days = sorted(corpus.aggregates('day').items())
+        lengths = sorted((int(key), count) for key, count in corpus.aggregates('abstract_length').items())
+    finally:
+        corpus.close()
+
+    if not status:
+        print(f"📊 Corpus {corpus_file} is empty: nothing to draw")
+        return []
+
+    fig = Figure(figsize=(18, 12))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(2, 3)
+    fig.suptitle('Corpus Dashboard - Leprosy/Hansen\'s Disease Research', fontsize=16, fontweight='bold')
+
+    # Chart 1: Status of this run (or of the whole corpus)
+    ax1 = axes[0, 0]
+    pie_counts = run_status or status
+    ax1.pie(list(pie_counts.values()), labels=list(pie_counts), autopct='%1.1f%%', startangle=90,
+            colors=[STATUS_COLORS.get(key, '#95a5a6') for key in pie_counts])
+    ax1.set_title('Status - This Run' if run_status else 'Status - All Runs', fontweight='bold')
+
+    # Chart 2: Sources
+    _bar(axes[0, 1], list(sources), list(sources.values()), 'URLs by Source', 'Sources', 'Number of URLs',
+         _palette("Set2", len(sources)))
+
+    # Chart 3: Corpus growth per day
+    ax3 = axes[0, 2]
+    if days:
+        cumulative = []
+        total = 0
+        for _, count in days:
+            total += count
+            cumulative.append(total)
+        ax3.plot(range(len(days)), cumulative, marker='o', color='#3498db')
+        step = max(len(days) // 8, 1)
+        ax3.set_xticks(range(0, len(days), step))
+        ax3.set_xticklabels([day for day, _ in days][::step], rotation=45, ha='right')
+    ax3.set_title('Database Growth', fontweight='bold')
+    ax3.set_ylabel('Rows processed (cumulative)')
+
+    # Chart 4: Most frequent domains
+    _bar(axes[1, 0], [d[:12] + '...' if len(d) > 12 else d for d in domains], list(domains.values()),
+         f'Top {top_domains} Domains', 'Domains', 'URLs', _palette("tab10", len(domains)))
+
+    # Chart 5: Distribution of abstract sizes
+    ax5 = axes[1, 1]
+    if lengths:
+        ax5.bar([start for start, _ in lengths], [count for _, count in lengths], width=ABSTRACT_BUCKET,
+                align='edge', color='skyblue', alpha=0.7, edgecolor='black')
+        total = sum(count for _, count in lengths)
+        mean = sum((start + ABSTRACT_BUCKET / 2) * count for start, count in lengths) / total
+        ax5.axvline(mean, color='red', linestyle='--', label=f'Mean: ~{mean:.0f}')
+        ax5.legend()
+    ax5.set_title('Abstract Lengths', fontweight='bold')
+    ax5.set_xlabel('Characters')
+    ax5.set_ylabel('Frequency')
+
+    # Chart 6: Results over all runs
+    _bar(axes[1, 2], ['Successes', 'Errors'], [status.get('Sucesso', 0), status.get('Erro', 0)],
+         'Execution Results - All Runs', '', 'Number of URLs', ['#2ecc71', '#e74c3c'])
+
+    fig.tight_layout()
+    os.makedirs(output_dir, exist_ok=True)
+    files = []
+    for fmt in formats:
+        file_name = os.path.join(output_dir, f'dashboard.{fmt}')
+        fig.savefig(file_name, dpi=dpi)
+        files.append(file_name)
+    print(f"📊 Dashboard saved: {', '.join(files)}")
+    return files
@@ -0,0 +1,87 @@
+from html.parser import HTMLParser
+
+from bs4 import UnicodeDammit
+
+# Tags that can only appear once the document body has started
+BODY_TAGS = {
+    'body', 'div', 'p', 'h1', 'h2', 'h3', 'main', 'article', 'section',
+    'header', 'footer', 'nav', 'table', 'ul', 'ol', 'form', 'span', 'a', 'img'
+}
+
+
+class _StopParsing(Exception):
+    pass
+
+
+class _HeadScanner(HTMLParser):
+    """Collects <title> and the description <meta> tags, stopping at the body"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = None
+        self.meta = {}
+        self._title_parts = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BODY_TAGS:
+            raise _StopParsing()
+
+        if tag == 'title' and self.title is None and self._title_parts is None:
+            self._title_parts = []
+        elif tag == 'meta':
+            attrs = dict(attrs)
+            for key in ('name', 'property'):
+                value = attrs.get(key)
+                if value in ('description', 'og:description'):
+                    # Only the first occurrence counts, as with soup.find()
+                    self.meta.setdefault(f'{key}:{value}', attrs.get('content'))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == 'title' and self._title_parts is not None:
+            self.title = ''.join(self._title_parts)
+            self._title_parts = None
+        elif tag == 'head':
+            raise _StopParsing()
+
+    def handle_data(self, data):
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+
+
+def extract_fast(content):
+    """Title/abstract from the document head without building a tree.
+
+    Returns (title, abstract) before size limits, or None when the head does
+    not settle both values (no <title> text, or no usable description meta),
+    in which case the full BeautifulSoup strategies must run.
+    """
+    markup = UnicodeDammit(content, is_html=True).unicode_markup
+    if markup is None:
+        return None
+
+    scanner = _HeadScanner()
+    try:
+        scanner.feed(markup)
+        scanner.close()
+    except _StopParsing:
+        pass
+    except Exception:
+        return None
+
+    title = (scanner.title or '').strip()
+    if not title:
+        return None
+
+    # Same order as _extract_abstract_multiple_strategies: description, then og:description
+    for key in ('name:description', 'property:og:description'):
+        value = scanner.meta.get(key)
+        if value and value.strip():
+            return title, value.strip()
+        if key not in scanner.meta:
+            # The tag may still exist further down the page
+            return None
+
+    return None
@@ -1,253 +1,346 @@
 from web_scraper_historico import WebScraperHistoricoColab
-import time
 from datetime import datetime
-import random
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from urllib.parse import urlparse
-import numpy as np
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-def executar_scraper_incremental(max_urls=120):
-    print("🚀 INCREMENTAL WEB SCRAPER")
-    print("🧠 ANTI-REPETITION SYSTEM ACTIVE")
-    print("=" * 55)
-
-    # Create scraper instance
-    scraper = WebScraperHistoricoColab()
-
-    # Show current history
-    scraper.mostrar_historico()
-
-    # Search URLs from multiple sources
-    print("\n🔍 STARTING MULTI-SOURCE SEARCH...")
-    print("=" * 50)
-
-    urls_google = scraper.buscar_google_inteligente_incremental(max_urls=max_urls)
-    urls_pubmed = scraper.buscar_pubmed_expandido()
-    urls_specialized = scraper.buscar_fontes_especializadas_expandidas()
-
-    # Combine all new URLs
-    all_new_urls = list(set(urls_google + urls_pubmed + urls_specialized))
-
-    print(f"\n📊 INCREMENTAL SEARCH SUMMARY:")
-    print(f"   🔍 Google (new): {len(urls_google)} URLs")
-    print(f"   🔬 PubMed (new): {len(urls_pubmed)} URLs")
-    print(f"   🏥 Specialized (new): {len(urls_specialized)} URLs")
-    print(f"   🆕 Total new URLs: {len(all_new_urls)} URLs")
-
-    if not all_new_urls:
-        print("\n✅ NO NEW URLS FOUND!")
-        print("🎯 All available URLs were already processed before.")
-        print("💡 This means the system is working perfectly!")
-        print("🔄 Try again in a few days to capture new content.")
-        print("📚 Or run with different parameters for deeper searches.")
-
-        # Show statistics even with no new URLs
-        if len(scraper.urls_processadas) > 0:
-            print(f"\n📊 YOUR HISTORY STATISTICS:")
-            print(f"   📚 Total URLs collected: {len(scraper.urls_processadas)}")
-            print(f"   🎯 Database successfully built!")
-
-        return None
-
-    # Process new URLs
-    print(f"\n🔄 PROCESSING {len(all_new_urls)} NEW URLs...")
-    print("=" * 50)
-
-    data = []
-    success_count = 0
-    error_count = 0
-
-    for i, url in enumerate(all_new_urls, 1):
-        print(f"[{i:2d}/{len(all_new_urls)}] {url[:55]}...")
-
-        title, abstract, status = scraper.extrair_resumo_completo(url)
-
-        # Identify source
-        if 'pubmed.ncbi.nlm.nih.gov' in url:
-            source = 'PubMed'
-        elif any(term in url for term in ['who.int', 'cdc.gov']):
-            source = 'Health Org.'
-        elif any(term in url for term in ['nlr', 'leprosy']):
-            source = 'Specialized'
-        elif any(term in url for term in ['springer', 'wiley', 'journals', 'plos', 'jmir', 'ieee']):
-            source = 'Journal'
-        else:
-            source = 'Google'
-
-        data.append({
-            'URL': url,
-            'Title': title,
-            'Abstract': abstract,
-            'Status': status,
-            'Source': source,
-            'Processing_Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'Execution': 'Incremental'
-        })
-
-        # Add to history
-        scraper.urls_processadas.add(url)
-
-        if status == "Sucesso":
-            success_count += 1
-        else:
-            error_count += 1
+from scrape_pipeline import (ScrapePipeline, fontes_padrao, motor_async, motor_processos, motor_sequencial,
+                             motor_threads)
+from sinks import DataFrameSink, criar_sinks, ordenar_csv_por_status
+from run_journal import RunJournal
+from corpus_store import CorpusStore
+from dashboard import renderizar_dashboard
+
+def _identificar_fonte(url):
+    """Identify the source category of a URL"""
+    if 'pubmed.ncbi.nlm.nih.gov' in url:
+        return 'PubMed'
+    elif any(term in url for term in ['who.int', 'cdc.gov']):
+        return 'Health Org.'
+    elif any(term in url for term in ['nlr', 'leprosy']):
+        return 'Specialized'
+    elif any(term in url for term in ['springer', 'wiley', 'journals', 'plos', 'jmir', 'ieee']):
+        return 'Journal'
+    else:
+        return 'Google'
+
+
+def _montar_registro(url, title, abstract, status, execution='Incremental'):
+    """Build the output row for a processed URL"""
+    return {
+        'URL': url,
+        'Title': title,
+        'Abstract': abstract,
+        'Status': status,
+        'Source': _identificar_fonte(url),
+        'Processing_Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'Execution': execution
+    }
 
-        if i % 5 == 0:
-            rate = (success_count / i) * 100
-            print(f"    📊 {i}/{len(all_new_urls)} | ✅ {success_count} | ❌ {error_count} | 📈 {rate:.1f}%")
 
-        time.sleep(random.uniform(1, 2))
+def carregar_corpus(columns=None, corpus_file='corpus_leprosy.db', import_csv=False, **filters):
+    """Load rows of every run from the consolidated corpus (see CorpusStore.load for the filters).
 
+    With import_csv=True the leprosy_incremental_*.csv files of older runs
+    in the current directory are imported first.
+    """
+    corpus = CorpusStore(corpus_file)
+    try:
+        if import_csv:
+            imported = corpus.import_csv()
+            print(f"🗃️ {imported} CSV files imported into {corpus_file}")
+        return corpus.load(columns, **filters)
+    finally:
+        corpus.close()
+
+
+def _finalizar_execucao(scraper, sinks, df_sink, success_count, error_count, ordenar_status=True, retry_count=0,
+                        recrawl_count=0, changed_count=0):
+    """Save history, finish the output files, print the final report and return (df, file_name, scraper)"""
     # Save updated history
-    scraper.salvar_historico()
+    scraper.save_history()
 
-    # Create DataFrame
-    df = pd.DataFrame(data)
-    df = df.sort_values('Status', ascending=False)  # Success first
+    # Rows are already on disk: grouping by Status is an optional post-step
+    files = [sink.file_name for sink in sinks]
+    if ordenar_status:
+        for file_name in files:
+            if file_name.endswith('.csv'):
+                ordenar_csv_por_status(file_name)
 
-    # Save CSV
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    file_name = f"leprosy_incremental_{timestamp}.csv"
-    df.to_csv(file_name, index=False, encoding='utf-8')
+    # The DataFrame is only built when the caller asked for it
+    df = df_sink.to_dataframe(sort_by_status=ordenar_status) if df_sink else None
+    file_name = files[0] if files else None
+    total = success_count + error_count
 
     # Final report
     print("\n" + "=" * 50)
     print("🎉 INCREMENTAL SEARCH COMPLETED!")
     print("=" * 50)
-    print(f"📁 File: {file_name}")
-    print(f"🆕 New URLs processed: {len(all_new_urls)}")
-    print(f"✅ Successes: {success_count} ({success_count/len(all_new_urls)*100:.1f}%)")
+    for output in files:
+        print(f"📁 File: {output}")
+    print(f"🆕 New URLs processed: {total}")
+    print(f"✅ Successes: {success_count} ({success_count/total*100:.1f}%)")
     print(f"❌ Errors: {error_count}")
-    print(f"📚 Total in history: {len(scraper.urls_processadas)} URLs")
+    if retry_count:
+        print(f"🔁 Queued for a later retry: {retry_count}")
+    if recrawl_count:
+        print(f"♻️ Known pages recrawled: {recrawl_count} ({changed_count} changed)")
+    print(f"📚 Total in history: {len(scraper.urls_processed)} URLs")
     print(f"🔄 Next run will only process new URLs!")
     print("=" * 50)
+    scraper.http.mostrar_estatisticas()
+    scraper.breaker.mostrar_estatisticas()
+    if scraper.cache:
+        scraper.cache.mostrar_estatisticas()
 
     return df, file_name, scraper
 
 
-def executar_scraper_incremental_threads(max_urls=120, max_workers=10):
-    print("🚀 INCREMENTAL WEB SCRAPER - MULTITHREAD MODE")
+def executar_pipeline(titulo, criar_motor, max_urls=120, scraper_options=None, formatos=('csv',),
+                      ordenar_status=True, retornar_df=True, resume=False,
+                      journal_file='run_journal_leprosy.jsonl', checkpoint_every=100, retry_budget=50,
+                      recrawl_budget=20, corpus_file='corpus_leprosy.db', dashboard_dir=None):
+    """Run the streaming search → filter → fetch → extract → sink pipeline.
+
+    criar_motor(scraper) returns the fetch engine (see scrape_pipeline);
+    scraper_options are passed to WebScraperHistoricoColab. Rows are written
+    to leprosy_incremental_<timestamp>.<format> as they arrive (see sinks);
+    the DataFrame is only kept in memory when retornar_df is true.
+
+    The run is recorded in journal_file (see run_journal) and the history is
+    saved every checkpoint_every rows. With resume=True an interrupted run
+    continues with the URLs that never finished and the same output files.
+
+    URLs that fail with a transient error are queued for retry instead of
+    being marked processed; up to retry_budget of the eligible ones are
+    fetched again per run. Up to recrawl_budget known pages that most
+    likely changed since their last fetch are fetched again as well.
+
+    Rows are also appended to the consolidated corpus_file (see
+    corpus_store), which analyses across runs query with carregar_corpus.
+    With dashboard_dir the dashboard charts of the corpus are saved there
+    as PNG/SVG at the end of the run (see dashboard).
+    """
+    print(f"🚀 {titulo}")
     print("🧠 ANTI-REPETITION SYSTEM ACTIVE")
     print("=" * 55)
 
-    scraper = WebScraperHistoricoColab()
+    # Create scraper instance
+    scraper = WebScraperHistoricoColab(**(scraper_options or {}))
+
+    # Show current history
     scraper.mostrar_historico()
 
-    print("\n🔍 STARTING MULTI-SOURCE SEARCH...")
+    sources = fontes_padrao(scraper, max_urls)
+    base_name = f"leprosy_incremental_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    journal = RunJournal(journal_file) if journal_file else None
+
+    resumed = bool(journal and resume and journal.load())
+    if resumed:
+        remaining = journal.pending()
+        base_name = journal.header['output']
+        formatos = journal.header['formats']
+        for url, row in journal.rows.items():
+            if row['Status'] == "Sucesso":
+                scraper.urls_processed.add(url)
+            elif not scraper.urls_processed.has_failure(url):
+                scraper.urls_processed.record_failure(url, journal.error_classes.get(url, 'unknown'), row['Abstract'])
+        scraper.urls_processed.allow_retry(remaining)
+        scraper.urls_processed.allow_recrawl([url for url in remaining if url in scraper.urls_processed])
+
+        print(f"♻️ RESUMING RUN STARTED AT {journal.header['started']}: "
+              f"{len(journal.rows)} URLs finished, {len(remaining)} pending")
+        if journal.search_done:
+            sources = {}
+        else:
+            print("🔍 The search stage was interrupted: searching again (finished URLs are skipped)")
+        sources['Resume'] = lambda: iter(remaining)
+    elif journal:
+        if resume:
+            print(f"ℹ️ No interrupted run to resume in {journal_file}: starting a new one")
+        elif journal.exists():
+            print(f"⚠️ Replacing the journal of an interrupted run ({journal_file}); "
+                  f"pass resume=True to continue it instead")
+        journal.start(base_name, formatos)
+
+    if not resumed and retry_budget:
+        retry_urls = scraper.urls_processed.failures_due(retry_budget)
+        if retry_urls:
+            print(f"🔁 Retrying {len(retry_urls)} previously failed URLs (budget: {retry_budget} per run)")
+            sources['Retry'] = lambda: iter(retry_urls)
+
+    if not resumed and recrawl_budget:
+        recrawl_urls = scraper.urls_processed.recrawl_candidates(recrawl_budget)
+        if recrawl_urls:
+            print(f"♻️ Recrawling {len(recrawl_urls)} known pages likely to have changed "
+                  f"(budget: {recrawl_budget} per run)")
+            sources['Recrawl'] = lambda: iter(recrawl_urls)
+
+    # Search and process URLs as they are discovered
+    print("\n🔍 STARTING MULTI-SOURCE SEARCH (URLs are processed as soon as they are found)...")
     print("=" * 50)
 
-    urls_google = scraper.buscar_google_inteligente_incremental(max_urls=max_urls)
-    urls_pubmed = scraper.buscar_pubmed_expandido()
-    urls_specialized = scraper.buscar_fontes_especializadas_expandidas()
+    def registro_journal(url, title, abstract, status):
+        execution = 'Recrawl' if scraper.urls_processed.is_recrawl(url) else 'Incremental'
+        return _montar_registro(url, title, abstract, status, execution)
+
+    pipeline = ScrapePipeline(scraper, criar_motor(scraper), sources, journal=journal,
+                              journal_row=registro_journal)
+
+    sinks = []
+    corpus = None
+    df_sink = DataFrameSink() if retornar_df else None
+    counts = {'Sucesso': 0, 'Erro': 0, 'retry': 0, 'recrawl': 0, 'changed': 0}
+
+    def registrar(row):
+        nonlocal sinks, corpus
+        if not sinks:
+            # Files are only created once there is something to write
+            sinks = criar_sinks(base_name, formatos)
+            if corpus_file:
+                corpus = CorpusStore(corpus_file, run_id=base_name)
+        for sink in sinks:
+            sink.write(row)
+        if corpus is not None:
+            corpus.write(row)
+        if df_sink:
+            df_sink.write(row)
+        counts['Sucesso' if row['Status'] == "Sucesso" else 'Erro'] += 1
+
+    try:
+        # Rows finished before an interruption are rewritten from the journal
+        if journal:
+            for row in journal.rows.values():
+                registrar(row)
+
+        for url, title, abstract, status in pipeline.run():
+            recrawl = scraper.urls_processed.is_recrawl(url)
+            row = _montar_registro(url, title, abstract, status, 'Recrawl' if recrawl else 'Incremental')
+            # The pipeline journaled the row when the fetch completed
+            error_class = None if status == "Sucesso" else scraper.failure_classes.pop(url, 'unknown')
+            registrar(row)
+
+            # Add to history (transient failures go to the retry queue instead)
+            if status == "Sucesso":
+                changed = scraper.urls_processed.record_fetch(url, title, abstract)
+                scraper.urls_processed.add(url)
+                if recrawl:
+                    counts['recrawl'] += 1
+                    counts['changed'] += bool(changed)
+            elif recrawl:
+                # The copy from the previous fetch stays valid; the page is picked again later
+                pass
+            elif scraper.urls_processed.record_failure(url, error_class, abstract) is not None:
+                counts['retry'] += 1
+
+            i = counts['Sucesso'] + counts['Erro']
+            if checkpoint_every and i % checkpoint_every == 0:
+                scraper.urls_processed.flush()
 
-    all_new_urls = list(set(urls_google + urls_pubmed + urls_specialized))
+            if i % 5 == 0:
+                rate = (counts['Sucesso'] / i) * 100
+                print(f"    📊 {i} processed | ✅ {counts['Sucesso']} | ❌ {counts['Erro']} | 📈 {rate:.1f}%")
+    except BaseException:
+        # Keep the journal so that resume=True can pick up from here
+        scraper.urls_processed.flush()
+        if journal:
+            journal.close()
+            print(f"💾 Progress kept in {journal_file}: run again with resume=True to continue")
+        raise
+    finally:
+        # Whatever was processed so far stays on disk
+        for sink in sinks:
+            sink.close()
+        if corpus is not None:
+            corpus.close()
+
+    pipeline.mostrar_resumo()
+    if corpus is not None:
+        print(f"🗃️ Corpus: {corpus_file} (+{corpus.rows_written} rows of this run)")
+        if dashboard_dir:
+            try:
+                renderizar_dashboard(corpus_file, dashboard_dir, run_id=base_name)
+            except Exception as e:
+                print(f"⚠️ Error rendering the dashboard: {e}")
+    if scraper.google_cache:
+        scraper.google_cache.mostrar_estatisticas()
+    success_count, error_count = counts['Sucesso'], counts['Erro']
 
-    print(f"\n📊 INCREMENTAL SEARCH SUMMARY:")
-    print(f"   🔍 Google (new): {len(urls_google)} URLs")
-    print(f"   🔬 PubMed (new): {len(urls_pubmed)} URLs")
-    print(f"   🏥 Specialized (new): {len(urls_specialized)} URLs")
-    print(f"   🆕 Total new URLs: {len(all_new_urls)} URLs")
+    if not success_count + error_count:
+        # Known pages the search returned were tracked for recrawling
+        scraper.save_history()
+        if journal:
+            journal.close(remove=True)
 
-    if not all_new_urls:
         print("\n✅ NO NEW URLS FOUND!")
         print("🎯 All available URLs were already processed before.")
         print("💡 This means the system is working perfectly!")
         print("🔄 Try again in a few days to capture new content.")
         print("📚 Or run with different parameters for deeper searches.")
 
-        if len(scraper.urls_processadas) > 0:
+        # Show statistics even with no new URLs
+        if len(scraper.urls_processed) > 0:
             print(f"\n📊 YOUR HISTORY STATISTICS:")
-            print(f"   📚 Total URLs collected: {len(scraper.urls_processadas)}")
+            print(f"   📚 Total URLs collected: {len(scraper.urls_processed)}")
             print(f"   🎯 Database successfully built!")
 
         return None
 
-    print(f"\n🔄 PROCESSING {len(all_new_urls)} NEW URLs USING {max_workers} THREADS...")
-    print("=" * 50)
-
-    data = []
-    success_count = 0
-    error_count = 0
-
-    def process_url(url):
-        """Helper function to process a single URL."""
-        title, abstract, status = scraper.extrair_resumo_completo(url)
-
-        # Identify source
-        if 'pubmed.ncbi.nlm.nih.gov' in url:
-            source = 'PubMed'
-        elif any(term in url for term in ['who.int', 'cdc.gov']):
-            source = 'Health Org.'
-        elif any(term in url for term in ['nlr', 'leprosy']):
-            source = 'Specialized'
-        elif any(term in url for term in ['springer', 'wiley', 'journals', 'plos', 'jmir', 'ieee']):
-            source = 'Journal'
-        else:
-            source = 'Google'
-
-        return {
-            'URL': url,
-            'Title': title,
-            'Abstract': abstract,
-            'Status': status,
-            'Source': source,
-            'Processing_Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'Execution': 'Incremental'
-        }
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_url = {executor.submit(process_url, url): url for url in all_new_urls}
-
-        for i, future in enumerate(as_completed(future_to_url), 1):
-            url = future_to_url[future]
-            try:
-                result = future.result()
-                data.append(result)
-                scraper.urls_processadas.add(url)
+    result = _finalizar_execucao(scraper, sinks, df_sink, success_count, error_count, ordenar_status,
+                                 counts['retry'], counts['recrawl'], counts['changed'])
+    if journal:
+        journal.close(remove=True)
+    return result
 
-                if result['Status'] == "Sucesso":
-                    success_count += 1
-                else:
-                    error_count += 1
 
-            except Exception as e:
-                print(f"⚠️ Error processing {url[:50]}... -> {e}")
-                error_count += 1
+def executar_scraper_incremental(max_urls=120, scraper_options=None, **pipeline_options):
+    return executar_pipeline("INCREMENTAL WEB SCRAPER", motor_sequencial, max_urls, scraper_options,
+                             **pipeline_options)
 
-            if i % 5 == 0:
-                rate = (success_count / i) * 100 if i > 0 else 0
-                print(f"    📊 {i}/{len(all_new_urls)} | ✅ {success_count} | ❌ {error_count} | 📈 {rate:.1f}%")
 
-    scraper.salvar_historico()
+def executar_scraper_incremental_threads(max_urls=120, max_workers=10, scraper_options=None, adaptive=True,
+                                         max_concurrency=64, min_concurrency=2, concurrency_log=None,
+                                         **pipeline_options):
+    """Threaded run; with adaptive=True max_workers is only the starting concurrency"""
+    options = dict({'pool_maxsize': max_concurrency if adaptive else max_workers}, **(scraper_options or {}))
+    return executar_pipeline(
+        "INCREMENTAL WEB SCRAPER - MULTITHREAD MODE",
+        lambda scraper: motor_threads(scraper, max_workers=max_workers, adaptive=adaptive,
+                                      max_concurrency=max_concurrency, min_concurrency=min_concurrency,
+                                      concurrency_log=concurrency_log),
+        max_urls, options, **pipeline_options
+    )
 
-    df = pd.DataFrame(data)
-    df = df.sort_values('Status', ascending=False)
 
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    file_name = f"leprosy_incremental_{timestamp}.csv"
-    df.to_csv(file_name, index=False, encoding='utf-8')
+def executar_scraper_incremental_async(max_urls=120, max_in_flight=200, limit_per_host=10, scraper_options=None,
+                                       **pipeline_options):
+    return executar_pipeline(
+        "INCREMENTAL WEB SCRAPER - ASYNC MODE",
+        lambda scraper: motor_async(scraper, max_in_flight=max_in_flight, limit_per_host=limit_per_host),
+        max_urls, scraper_options, **pipeline_options
+    )
 
-    print("\n" + "=" * 50)
-    print("🎉 INCREMENTAL SEARCH COMPLETED!")
-    print("=" * 50)
-    print(f"📁 File: {file_name}")
-    print(f"🆕 New URLs processed: {len(all_new_urls)}")
-    print(f"✅ Successes: {success_count} ({success_count/len(all_new_urls)*100:.1f}%)")
-    print(f"❌ Errors: {error_count}")
-    print(f"📚 Total in history: {len(scraper.urls_processadas)} URLs")
-    print(f"🔄 Next run will only process new URLs!")
-    print("=" * 50)
 
-    return df, file_name, scraper
+def executar_scraper_incremental_pipeline(max_urls=120, io_workers=16, parse_workers=None, queue_size=64,
+                                          scraper_options=None, **pipeline_options):
+    options = dict({'pool_maxsize': io_workers}, **(scraper_options or {}))
+    return executar_pipeline(
+        "INCREMENTAL WEB SCRAPER - PIPELINED MODE (I/O THREADS + PARSER PROCESSES)",
+        lambda scraper: motor_processos(scraper, io_workers=io_workers, parse_workers=parse_workers,
+                                        queue_size=queue_size),
+        max_urls, options, **pipeline_options
+    )
 
 
 def criar_visualizacoes_automaticas(df, scraper):
     """
-    Create automatic visualizations of collected data
+    Create automatic visualizations of collected data (interactive; for
+    headless servers use dashboard.renderizar_dashboard, which saves files)
     """
+    # Plotting libraries are only loaded when a chart is drawn
+    import matplotlib.pyplot as plt
+    import numpy as np
+    import seaborn as sns
+
+    plt.style.use('default')
+    sns.set_palette("husl")
+
     print("📊 GENERATING AUTOMATIC VISUALIZATIONS...")
 
     # Configure figure
@@ -280,7 +373,7 @@ def criar_visualizacoes_automaticas(df, scraper):
 
     # Chart 3: Historic vs New
     ax3 = axes[0, 2]
-    historic_size = len(scraper.urls_processadas) - len(df)
+    historic_size = len(scraper.urls_processed) - len(df)
     new_size = len(df)
 
     bars = ax3.bar(['Historic URLs', 'New URLs'], [historic_size, new_size],
@@ -293,17 +386,8 @@ def criar_visualizacoes_automaticas(df, scraper):
 
     # Chart 4: Most frequent domains
     ax4 = axes[1, 0]
-    domains = []
-    for url in df['URL']:
-        try:
-            domain = urlparse(url).netloc
-            if domain.startswith('www.'):
-                domain = domain[4:]
-            domains.append(domain)
-        except:
-            domains.append('Unknown')
-
-    df['Domain'] = domains
+    df['Domain'] = (df['URL'].str.extract(r'^[a-zA-Z][\w+.-]*://(?:www\.)?([^/?#:]+)', expand=False)
+                    .str.lower().fillna('Unknown'))
     domain_counts = df['Domain'].value_counts().head(6)
 
     if len(domain_counts) > 0:
@@ -355,36 +439,26 @@ def criar_visualizacoes_automaticas(df, scraper):
     analyze_topics_automatic(df)
 
 
-def analyze_topics_automatic(df):
-    """Automatically analyze topics in abstracts"""
+def analyze_topics_automatic(df, matcher=None):
+    """Automatically analyze topics in abstracts.
+
+    matcher is a topic_engine.TopicMatcher (DEFAULT_TOPICS by default); each
+    abstract is scanned once and the counts are aggregated with NumPy.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from topic_engine import default_matcher
+
     print("\n🎯 AUTOMATIC TOPIC ANALYSIS:")
 
     successes = df[df['Status'] == 'Sucesso']
+    abstracts = successes['Abstract'].where(successes['Abstract'] != 'Resumo não disponível')
 
-    relevant_topics = {
-        'mobile app': 0,
-        'artificial intelligence': 0,
-        'machine learning': 0,
-        'diagnosis': 0,
-        'screening': 0,
-        'digital health': 0,
-        'mhealth': 0,
-        'smartphone': 0,
-        'telemedicine': 0,
-        'neural network': 0,
-        'computer vision': 0,
-        'deep learning': 0
-    }
-
-    for abstract in successes['Abstract']:
-        if abstract and abstract != 'Resumo não disponível':
-            abs_lower = abstract.lower()
-            for topic in relevant_topics:
-                if topic in abs_lower:
-                    relevant_topics[topic] += 1
+    matrix = (matcher or default_matcher()).count_matrix(abstracts)
+    relevant_topics = matrix.document_frequency()
 
     # Show only found topics
-    found_topics = {k: v for k, v in relevant_topics.items() if v > 0}
+    found_topics = relevant_topics[relevant_topics > 0].to_dict()
 
     if found_topics:
         print("📊 Topics identified in abstracts:")
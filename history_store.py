@@ -0,0 +1,522 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from recrawl import DAY, PRIOR_CHANGE_RATE, change_probability, content_hash, due_at, estimate_change_rate
+from retry_policy import RETRYABLE_ERRORS
+from url_canonical import URLCanonicalizer
+
+
+class HistoryStore:
+    """SQLite-backed history of processed URLs.
+
+    Opening the store does not read the URL table: membership checks are
+    answered by an index and only URLs added during the current run are
+    written back on flush(). URLs are compared by canonical key (see
+    url_canonical), so tracking parameters, http/https, 'www.' or DOI vs
+    publisher URLs of an already processed document count as known.
+
+    With bloom_file, an mmap-loaded Bloom filter of the canonical keys
+    answers most lookups (new URLs) without touching SQLite; only probable
+    hits are confirmed against the index. The filter is rebuilt when it no
+    longer matches the table (row count, key rules or capacity).
+
+    URLs that failed with a transient error are not marked processed: they
+    go to a failures table with their error class, attempt count and the
+    time they become eligible again (exponential backoff), and a later run
+    retries the eligible ones (see failures_due).
+
+    Successful fetches update a fetch_state table (last fetch, hash of the
+    extracted text, estimated change rate) used to pick known pages worth
+    recrawling (see recrawl_candidates).
+    """
+
+    VERSION = 'Colab_History_v3.0'
+
+    def __init__(self, db_file='historico_leprosy_colab.db', legacy_json=None, canonicalizer=None,
+                 bloom_file=None, bloom_error_rate=0.01, bloom_min_capacity=1000000,
+                 max_failure_attempts=5, retry_base_seconds=3600, retry_max_seconds=7 * 24 * 3600,
+                 retry_classes=RETRYABLE_ERRORS | {'circuit_open'}):
+        self.db_file = db_file
+        self.canonicalizer = canonicalizer or URLCanonicalizer()
+        self.bloom = None
+        self.bloom_stats = {'skipped': 0, 'confirmed': 0, 'false_positives': 0}
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.max_failure_attempts = max_failure_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.retry_classes = set(retry_classes)
+        self._retrying = set()
+        self._recrawling = set()
+        self._to_track = {}
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                added_at TEXT NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS failures (
+                url TEXT PRIMARY KEY,
+                canonical_key TEXT NOT NULL,
+                error_class TEXT NOT NULL,
+                attempts INTEGER NOT NULL,
+                last_error TEXT,
+                last_attempt TEXT NOT NULL,
+                next_eligible REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_failures_canonical_key ON failures (canonical_key);
+            CREATE INDEX IF NOT EXISTS idx_failures_next_eligible ON failures (next_eligible);
+            CREATE TABLE IF NOT EXISTS fetch_state (
+                url TEXT PRIMARY KEY,
+                canonical_key TEXT NOT NULL,
+                first_fetched REAL NOT NULL,
+                last_fetched REAL NOT NULL,
+                last_changed REAL,
+                content_hash TEXT,
+                checks INTEGER NOT NULL,
+                changes INTEGER NOT NULL,
+                change_rate REAL NOT NULL,
+                due_at REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_fetch_state_canonical_key ON fetch_state (canonical_key);
+            CREATE INDEX IF NOT EXISTS idx_fetch_state_due_at ON fetch_state (due_at);
+        """)
+        self._conn.commit()
+        self._total = int(self.get_meta('total_urls', 0))
+        self._build_canonical_index()
+        # Failed URLs are few: keep their keys in memory for the router
+        self._failures = dict(self._conn.execute('SELECT canonical_key, next_eligible FROM failures'))
+        if bloom_file:
+            self._open_bloom(bloom_file, bloom_error_rate, bloom_min_capacity)
+
+        if legacy_json:
+            self.migrate_from_json(legacy_json)
+
+    # ------------------------------------------------------------------
+    # Metadata
+    # ------------------------------------------------------------------
+    def get_meta(self, key, default=None):
+        """Read a metadata value"""
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self._conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, str(value)))
+
+    # ------------------------------------------------------------------
+    # Canonical-key index
+    # ------------------------------------------------------------------
+    def _build_canonical_index(self, batch_size=10000):
+        """Add/refresh the canonical_key column when missing or the rules changed"""
+        columns = [row[1] for row in self._conn.execute('PRAGMA table_info(urls)')]
+        if 'canonical_key' not in columns:
+            self._conn.execute('ALTER TABLE urls ADD COLUMN canonical_key TEXT')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_urls_canonical_key ON urls (canonical_key)')
+        self._conn.commit()
+
+        version = self.canonicalizer.version
+        if self.get_meta('canonical_rules') == version:
+            return
+
+        # Walk the primary key in batches so memory stays flat on large histories
+        last_url = ''
+        updated = 0
+        while True:
+            rows = self._conn.execute(
+                'SELECT url FROM urls WHERE url > ? ORDER BY url LIMIT ?', (last_url, batch_size)
+            ).fetchall()
+            if not rows:
+                break
+            self._conn.executemany(
+                'UPDATE urls SET canonical_key = ? WHERE url = ?',
+                ((self.canonicalizer.key(url), url) for (url,) in rows)
+            )
+            updated += len(rows)
+            last_url = rows[-1][0]
+
+        for table in ('failures', 'fetch_state'):
+            for (url,) in self._conn.execute(f'SELECT url FROM {table}').fetchall():
+                self._conn.execute(f'UPDATE OR REPLACE {table} SET canonical_key = ? WHERE url = ?',
+                                   (self.canonicalizer.key(url), url))
+        self._set_meta('canonical_rules', version)
+        self._conn.commit()
+        if updated:
+            print(f"🔑 Canonical keys rebuilt for {updated} URLs in history")
+
+    # ------------------------------------------------------------------
+    # Bloom pre-filter
+    # ------------------------------------------------------------------
+    def _open_bloom(self, bloom_file, error_rate, min_capacity):
+        """Map the filter file, rebuilding it from the table when stale"""
+        # numpy comes with the filter: histories without one never load it
+        from bloom_filter import BloomFilter, fingerprint
+
+        tag = fingerprint(self.canonicalizer.version)
+        bloom = BloomFilter.open(bloom_file)
+        if bloom and (bloom.tag != tag or bloom.count != self._total or bloom.capacity(error_rate) < self._total):
+            bloom.close()
+            bloom = None
+
+        if bloom is None:
+            capacity = max(min_capacity, 2 * self._total)
+            bloom = BloomFilter.create(bloom_file, capacity, error_rate, tag=tag)
+            cursor = self._conn.execute('SELECT canonical_key FROM urls')
+
+            def keys():
+                while True:
+                    rows = cursor.fetchmany(50000)
+                    if not rows:
+                        return
+                    for (key,) in rows:
+                        yield key
+
+            bloom.add_many(keys())
+            bloom.set_count(self._total)
+            bloom.flush()
+            if self._total:
+                print(f"🌸 Bloom filter rebuilt for {self._total} URLs ({bloom.num_bits // 8 / 1024 / 1024:.1f} MB)")
+        self.bloom = bloom
+
+    def canonical_key(self, url):
+        """Key used to compare url with the history"""
+        return self.canonicalizer.key(url)
+
+    # ------------------------------------------------------------------
+    # Set-like interface
+    # ------------------------------------------------------------------
+    def __len__(self):
+        return self._total + len(self._pending)
+
+    def __contains__(self, url):
+        key = self.canonical_key(url)
+        if key in self._pending:
+            return True
+        if self.bloom and key not in self.bloom:
+            self.bloom_stats['skipped'] += 1
+            return False
+        with self._lock:
+            row = self._conn.execute('SELECT 1 FROM urls WHERE canonical_key = ? LIMIT 1', (key,)).fetchone()
+        self._count_confirmation(row is not None)
+        return row is not None
+
+    def _count_confirmation(self, found, probable=1):
+        if self.bloom:
+            self.bloom_stats['confirmed'] += probable
+            self.bloom_stats['false_positives'] += probable - found
+
+    def add(self, url):
+        """Mark a URL as processed (persisted on the next flush)"""
+        if url not in self:
+            with self._lock:
+                self._pending.setdefault(self.canonical_key(url), url)
+
+    def known_urls(self, urls, chunk_size=500):
+        """Return the subset of urls already in history using batched index lookups"""
+        keys = {url: self.canonical_key(url) for url in urls}
+        known_keys = self.known_keys(keys.values(), chunk_size)
+        return {url for url, key in keys.items() if key in known_keys}
+
+    def known_keys(self, keys, chunk_size=500):
+        """Return the subset of canonical keys already in history.
+
+        With the Bloom filter, all keys are tested in one contains_many call
+        and only the probable hits are queried in SQLite.
+        """
+        unique_keys = set(keys)
+        known_keys = {key for key in unique_keys if key in self._pending}
+        unique_keys = list(unique_keys - known_keys)
+        if self.bloom and unique_keys:
+            probable = self.bloom.contains_many(unique_keys)
+            self.bloom_stats['skipped'] += len(unique_keys) - int(probable.sum())
+            unique_keys = [key for key, hit in zip(unique_keys, probable) if hit]
+        confirmed_before = len(known_keys)
+        with self._lock:
+            for start in range(0, len(unique_keys), chunk_size):
+                chunk = unique_keys[start:start + chunk_size]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT canonical_key FROM urls WHERE canonical_key IN ({placeholders})', chunk
+                ).fetchall()
+                known_keys.update(key for (key,) in rows)
+        self._count_confirmation(len(known_keys) - confirmed_before, len(unique_keys))
+        return known_keys
+
+    def sample(self, n=3):
+        """Return up to n URLs from history without scanning the table"""
+        with self._lock:
+            rows = self._conn.execute('SELECT url FROM urls LIMIT ?', (n,)).fetchall()
+        urls = [url for (url,) in rows]
+        if len(urls) < n:
+            urls.extend(list(self._pending.values())[:n - len(urls)])
+        return urls
+
+    # ------------------------------------------------------------------
+    # Retry queue
+    # ------------------------------------------------------------------
+    def record_failure(self, url, error_class, message=None):
+        """Queue a failed URL for a later run, or mark it processed if it will not be retried.
+
+        Returns the number of seconds until the next attempt, or None when
+        the error is permanent or max_failure_attempts was reached.
+        """
+        key = self.canonical_key(url)
+        with self._lock:
+            row = self._conn.execute('SELECT attempts FROM failures WHERE canonical_key = ?', (key,)).fetchone()
+            attempts = (row[0] if row else 0) + 1
+
+            if error_class not in self.retry_classes or attempts >= self.max_failure_attempts:
+                self._conn.execute('DELETE FROM failures WHERE canonical_key = ?', (key,))
+                self._conn.commit()
+                self._failures.pop(key, None)
+                give_up = True
+            else:
+                delay = min(self.retry_base_seconds * 4 ** (attempts - 1), self.retry_max_seconds)
+                next_eligible = time.time() + delay
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO failures '
+                    '(url, canonical_key, error_class, attempts, last_error, last_attempt, next_eligible) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (url, key, error_class, attempts, (message or '')[:200], datetime.now().isoformat(),
+                     next_eligible)
+                )
+                self._conn.commit()
+                self._failures[key] = next_eligible
+                self._retrying.discard(key)
+                give_up = False
+
+        if give_up:
+            self.add(url)
+            return None
+        return delay
+
+    def has_failure(self, url):
+        """True if url is waiting in the retry queue"""
+        return self.canonical_key(url) in self._failures
+
+    def is_deferred(self, url):
+        """True if url failed before and is not scheduled for retry in this run"""
+        key = self.canonical_key(url)
+        return key in self._failures and key not in self._retrying
+
+    def failures_due(self, limit):
+        """Select up to limit eligible failed URLs (oldest first) for retry in this run"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT url, canonical_key FROM failures WHERE next_eligible <= ? ORDER BY next_eligible LIMIT ?',
+                (time.time(), limit)
+            ).fetchall()
+        self._retrying.update(key for _, key in rows)
+        return [url for url, _ in rows]
+
+    def allow_retry(self, urls):
+        """Let previously failed urls through is_deferred (e.g. when resuming a run)"""
+        self._retrying.update(self.canonical_key(url) for url in urls)
+
+    def failure_stats(self):
+        """(queued, eligible now) failed URLs"""
+        now = time.time()
+        return len(self._failures), sum(1 for next_eligible in self._failures.values() if next_eligible <= now)
+
+    # ------------------------------------------------------------------
+    # Recrawl state
+    # ------------------------------------------------------------------
+    def record_fetch(self, url, title, abstract, now=None):
+        """Update the fetch state of a successfully extracted URL.
+
+        Returns True/False when the extracted text changed since the last
+        fetch, or None on the first observation.
+        """
+        now = now or time.time()
+        key = self.canonical_key(url)
+        digest = content_hash(title, abstract)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT first_fetched, last_changed, content_hash, checks, changes '
+                'FROM fetch_state WHERE canonical_key = ?', (key,)
+            ).fetchone()
+
+            if row is None or row[2] is None:
+                # First observation (tracked pages only had their history date)
+                changed = None
+                first_fetched, last_changed, checks, changes = now, None, 1, 0
+            else:
+                first_fetched, last_changed, old_digest, checks, changes = row
+                changed = digest != old_digest
+                checks += 1
+                if changed:
+                    changes += 1
+                    last_changed = now
+
+            rate = estimate_change_rate(checks, changes, now - first_fetched)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO fetch_state (url, canonical_key, first_fetched, last_fetched, last_changed, '
+                'content_hash, checks, changes, change_rate, due_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, key, first_fetched, now, last_changed, digest, checks, changes, rate, due_at(now, rate))
+            )
+            self._conn.commit()
+        return changed
+
+    def track(self, url):
+        """Start following a known URL that has no fetch state yet (written on flush)"""
+        key = self.canonical_key(url)
+        # The router thread tracks while checkpoints flush from the consumer
+        with self._lock:
+            self._to_track.setdefault(key, url)
+
+    def _flush_tracked(self):
+        if not self._to_track:
+            return
+        now = time.time()
+        rows = []
+        for key, url in self._to_track.items():
+            added = self._conn.execute(
+                'SELECT added_at FROM urls WHERE canonical_key = ? LIMIT 1', (key,)
+            ).fetchone()
+            try:
+                fetched = datetime.fromisoformat(added[0]).timestamp() if added else now
+            except ValueError:
+                fetched = now
+            rows.append((url, key, fetched, fetched, PRIOR_CHANGE_RATE, due_at(fetched, PRIOR_CHANGE_RATE)))
+        self._conn.executemany(
+            'INSERT OR IGNORE INTO fetch_state (url, canonical_key, first_fetched, last_fetched, content_hash, '
+            'checks, changes, change_rate, due_at) VALUES (?, ?, ?, ?, NULL, 0, 0, ?, ?)', rows
+        )
+        self._conn.commit()
+        self._to_track.clear()
+
+    def recrawl_candidates(self, budget, min_age=DAY, now=None):
+        """Select up to budget known URLs most likely to have changed since their last fetch"""
+        now = now or time.time()
+        with self._lock:
+            self._flush_tracked()
+            rows = self._conn.execute(
+                'SELECT url, canonical_key, last_fetched, change_rate FROM fetch_state '
+                'WHERE due_at <= ? AND last_fetched <= ? ORDER BY due_at LIMIT ?',
+                (now, now - min_age, budget * 10)
+            ).fetchall()
+        ranked = sorted(rows, key=lambda row: change_probability(row[3], now - row[2]), reverse=True)[:budget]
+        self._recrawling.update(key for _, key, _, _ in ranked)
+        return [url for url, _, _, _ in ranked]
+
+    def allow_recrawl(self, urls):
+        """Let known urls through is_recrawl (e.g. when resuming a run)"""
+        self._recrawling.update(self.canonical_key(url) for url in urls)
+
+    def is_recrawl(self, url):
+        """True if url was selected for recrawl in this run"""
+        return self.canonical_key(url) in self._recrawling
+
+    def recrawl_stats(self, now=None):
+        """(tracked pages, pages due for a recrawl)"""
+        now = now or time.time()
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(due_at <= ?), 0) FROM fetch_state', (now,)
+            ).fetchone()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def flush(self):
+        """Persist only the URLs added since the last flush"""
+        with self._lock:
+            self._flush_tracked()
+            if not self._pending:
+                return 0
+            now = datetime.now().isoformat()
+            before = self._conn.total_changes
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO urls (url, added_at, canonical_key) VALUES (?, ?, ?)',
+                ((url, now, key) for key, url in self._pending.items())
+            )
+            inserted = self._conn.total_changes - before
+            self._total += inserted
+            self._set_meta('total_urls', self._total)
+            self._set_meta('last_update', now)
+            self._set_meta('version', self.VERSION)
+            # URLs that finally succeeded leave the retry queue
+            resolved = [key for key in self._pending if key in self._failures]
+            self._conn.executemany('DELETE FROM failures WHERE canonical_key = ?', ((key,) for key in resolved))
+            for key in resolved:
+                del self._failures[key]
+            self._conn.commit()
+            if self.bloom:
+                self.bloom.add_many(self._pending)
+                self.bloom.set_count(self._total)
+                self.bloom.flush()
+            self._pending.clear()
+        return inserted
+
+    def mostrar_historico(self, sample=3):
+        """Show history information"""
+        print("📊 HISTORY INFORMATION")
+        print("=" * 35)
+        print(f"📚 Total URLs processed: {len(self)}")
+
+        last_update = self.get_meta('last_update', 'N/A')
+        if last_update != 'N/A':
+            try:
+                last_update = datetime.fromisoformat(last_update).strftime('%Y-%m-%d %H:%M:%S')
+            except ValueError:
+                pass
+        print(f"🕒 Last update: {last_update}")
+        print(f"📝 Version: {self.get_meta('version', 'N/A')}")
+        queued, due = self.failure_stats()
+        if queued:
+            print(f"🔁 Failed URLs waiting for retry: {queued} ({due} eligible now)")
+        tracked, stale = self.recrawl_stats()
+        if tracked:
+            print(f"♻️ Pages tracked for recrawl: {tracked} ({stale} likely changed)")
+
+        if len(self) > 0:
+            print("\n📋 Example URLs in history:")
+            for i, url in enumerate(self.sample(sample), 1):
+                print(f"   {i}. {url[:55]}...")
+            if len(self) > sample:
+                print(f"   ... and {len(self) - sample} more URLs")
+
+        print("=" * 35)
+
+    def migrate_from_json(self, json_file):
+        """One-shot import of the legacy JSON history file"""
+        if self.get_meta('migrated_from') or not os.path.exists(json_file):
+            return 0
+
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                history = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Error reading legacy history: {e}")
+            return 0
+
+        legacy_urls = history.get('urls_processadas', [])
+        for url in legacy_urls:
+            self._pending.setdefault(self.canonical_key(url), url)
+        inserted = self.flush()
+
+        with self._lock:
+            self._set_meta('migrated_from', os.path.abspath(json_file))
+            self._conn.commit()
+
+        os.replace(json_file, json_file + '.migrated')
+        print(f"📦 Migrated {inserted} URLs from {json_file} to {self.db_file}")
+        return inserted
+
+    def close(self):
+        """Flush pending URLs and close the database"""
+        self.flush()
+        with self._lock:
+            self._conn.close()
+            if self.bloom:
+                self.bloom.close()
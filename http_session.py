@@ -0,0 +1,121 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'application/xml', 'text/xml')
+
+
+class NonHTMLContent(Exception):
+    """Raised when a response is not a parseable HTML page (PDF, image, ...)"""
+
+    def __init__(self, content_type):
+        super().__init__(f"non-HTML content: {content_type}")
+        self.content_type = content_type
+
+
+def check_html_content_type(headers):
+    """Raise NonHTMLContent unless the Content-Type header looks like HTML"""
+    content_type = (headers.get('Content-Type') or '').split(';')[0].strip().lower()
+    if content_type and content_type not in HTML_CONTENT_TYPES:
+        raise NonHTMLContent(content_type)
+
+
+def read_capped(response, max_bytes, chunk_size=64 * 1024):
+    """Read at most max_bytes from a streamed requests response"""
+    chunks = []
+    received = 0
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            chunks.append(chunk)
+            received += len(chunk)
+            if received >= max_bytes:
+                break
+    finally:
+        response.close()
+    return b''.join(chunks)[:max_bytes]
+
+
+class SessionPool:
+    """Shared keep-alive HTTP layer for search and extraction.
+
+    Every thread gets its own requests.Session (cookies and headers are not
+    shared between threads), but all sessions are mounted on the same
+    HTTPAdapter, so TCP/TLS connections are pooled per host and reused across
+    workers.
+    """
+
+    def __init__(self, pool_maxsize=10, pool_connections=50, pool_block=False):
+        self.pool_maxsize = pool_maxsize
+        self.pool_connections = pool_connections
+        self.pool_block = pool_block
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=0
+        )
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers['Connection'] = 'keep-alive'
+            session.mount('http://', self._adapter)
+            session.mount('https://', self._adapter)
+            self._local.session = session
+        return session
+
+    def request(self, method, url, **kwargs):
+        """Send a request through the calling thread's pooled session"""
+        return self._session().request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        """GET through the calling thread's pooled session"""
+        return self.request('GET', url, **kwargs)
+
+    def stats(self):
+        """Per-host request and connection counters.
+
+        'connections' is the number of TCP connections opened by the pool for
+        that host; every other request reused a kept-alive connection.
+        """
+        per_host = {}
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = pool.host if pool.port in (None, 80, 443) else f"{pool.host}:{pool.port}"
+            entry = per_host.setdefault(host, {'requests': 0, 'connections': 0})
+            entry['requests'] += pool.num_requests
+            entry['connections'] += pool.num_connections
+
+        for entry in per_host.values():
+            entry['reused'] = max(entry['requests'] - entry['connections'], 0)
+
+        total_requests = sum(e['requests'] for e in per_host.values())
+        total_connections = sum(e['connections'] for e in per_host.values())
+        return {
+            'requests': total_requests,
+            'connections': total_connections,
+            'reused': max(total_requests - total_connections, 0),
+            'per_host': per_host
+        }
+
+    def mostrar_estatisticas(self, top=5):
+        """Print connection reuse counters"""
+        stats = self.stats()
+        if not stats['requests']:
+            return
+        reuse_rate = stats['reused'] / stats['requests'] * 100
+        print(f"🔌 HTTP POOL: {stats['requests']} requests | "
+              f"{stats['connections']} connections | ♻️ {stats['reused']} reused ({reuse_rate:.1f}%)")
+        busiest = sorted(stats['per_host'].items(), key=lambda x: x[1]['requests'], reverse=True)
+        for host, entry in busiest[:top]:
+            print(f"   • {host}: {entry['requests']} req / {entry['connections']} conn")
+
+    def close(self):
+        """Close pooled connections"""
+        self._adapter.close()
@@ -1,18 +1,11 @@
-import logging
-import matplotlib.pyplot as plt
-import seaborn as sns
-import warnings
-from functions import executar_scraper_incremental_threads, criar_visualizacoes_automaticas, executar_scraper_incremental
+import sys
 
-warnings.filterwarnings('ignore')
+from cli import main
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-plt.style.use('default')
-sns.set_palette("husl")
-
-# Run with a single-thread incremental scraper
-result = executar_scraper_incremental(max_urls=120)
-
-# This one runs with 10 threads
-# result = executar_scraper_incremental_threads(max_urls=120)
+if __name__ == '__main__':
+    # Same as `python cli.py scrape` (single-thread incremental scraper). Other modes and subcommands:
+    #   python main.py scrape --mode threads      (concurrency adapts to the hosts, starting at 10)
+    #   python main.py scrape --mode pipeline     (download with threads, parse on every core)
+    #   python main.py visualize | history
+    # The __main__ guard is required by the process pool of the pipeline mode.
+    sys.exit(main(default_command='scrape'))
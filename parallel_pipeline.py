@@ -0,0 +1,112 @@
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+_FEED_DONE = object()
+
+
+class FetchParsePipeline:
+    """Download with I/O threads, parse in a process pool.
+
+    I/O threads only fetch bytes and put them on a bounded queue; the caller's
+    thread moves them to a ProcessPoolExecutor (one worker per core by
+    default) that runs the scraper's title/abstract strategies. Both the
+    queue and the number of pages waiting for a parser are bounded, so memory
+    stays flat however long the frontier is.
+    """
+
+    def __init__(self, scraper, io_workers=16, parse_workers=None, queue_size=64):
+        self.scraper = scraper
+        self.io_workers = io_workers
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+
+    def iter_results(self, urls):
+        """Yield (url, title, abstract, status) as each page is parsed.
+
+        urls may be any iterable, including a blocking generator fed by the
+        search stage; it is consumed lazily by a feeder thread.
+        """
+        downloaded = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        parse = type(self.scraper)._parse_content
+
+        def put(item):
+            # Blocks while parsers fall behind (back-pressure), unless the consumer is gone
+            while not stop.is_set():
+                try:
+                    downloaded.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def download(url):
+            if stop.is_set():
+                return
+            try:
+                content, failure = self.scraper.baixar_conteudo(url)
+            except Exception as e:
+                content, failure = None, ("Access Error", f"Error: {str(e)[:80]}", "Erro")
+            put((url, content, failure))
+
+        def feed(io_pool):
+            submitted = 0
+            try:
+                for url in urls:
+                    if stop.is_set():
+                        break
+                    io_pool.submit(download, url)
+                    submitted += 1
+            except RuntimeError:
+                # Pool already shut down by an early exit
+                pass
+            finally:
+                put((_FEED_DONE, submitted, None))
+
+        # Search/I-O threads may already be running: avoid plain fork() where possible
+        start_methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in start_methods else None)
+
+        with ProcessPoolExecutor(max_workers=self.parse_workers, mp_context=context) as parse_pool:
+            with ThreadPoolExecutor(max_workers=self.io_workers) as io_pool:
+                feeder = threading.Thread(target=feed, args=(io_pool,), daemon=True)
+                feeder.start()
+                expected = None
+                received = 0
+                parsing = {}
+
+                try:
+                    while expected is None or received < expected or parsing:
+                        # Keep at most queue_size pages waiting for (or inside) a parser
+                        while (expected is None or received < expected) and len(parsing) < self.queue_size:
+                            try:
+                                url, content, failure = downloaded.get(timeout=0.05 if parsing else 1)
+                            except queue.Empty:
+                                break
+                            if url is _FEED_DONE:
+                                expected = content
+                                continue
+                            received += 1
+                            if failure:
+                                yield (url,) + failure
+                            else:
+                                parsing[parse_pool.submit(parse, content)] = url
+
+                        if not parsing:
+                            continue
+
+                        done, _ = wait(parsing, timeout=0.05, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            url = parsing.pop(future)
+                            try:
+                                title, abstract = future.result()
+                                yield url, title, abstract, "Sucesso"
+                            except Exception as e:
+                                self.scraper.failure_classes[url] = 'parse'
+                                yield url, "Access Error", f"Error: {str(e)[:80]}", "Erro"
+                finally:
+                    # Release blocked threads and drop queued downloads if the consumer stopped early
+                    stop.set()
+                    io_pool.shutdown(wait=False, cancel_futures=True)
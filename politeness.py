@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Requests per second for hosts that need gentler (or allow faster) pacing
+DEFAULT_DOMAIN_RATES = {
+    'google.com': 0.1,               # ~1 query every 10s
+    'eutils.ncbi.nlm.nih.gov': 3.0,  # NCBI limit without an API key
+    'pubmed.ncbi.nlm.nih.gov': 2.0,
+}
+
+
+def domain_of(url):
+    """Host used as the politeness key (lowercase, without 'www.')"""
+    host = (urlparse(url).hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return host
+
+
+def parse_retry_after(value):
+    """Convert a Retry-After header (seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(retry_at.timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations instead of blocking.
+
+    reserve() always takes a token (the balance may go negative) and returns
+    how long the caller must wait before using it, so concurrent callers are
+    queued fairly without holding a lock while sleeping.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def reserve(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+
+        delay = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+        return max(delay, self.blocked_until - now)
+
+
+class DomainScheduler:
+    """Per-domain rate limiting consulted by every fetch path.
+
+    Each host has its own bucket, so requests to different hosts never wait
+    on each other. 429/503 responses block only the offending host for the
+    duration announced in Retry-After (or penalty_seconds).
+    """
+
+    def __init__(self, default_rate=1.0, burst=2, domain_rates=None, penalty_seconds=30):
+        self.default_rate = default_rate
+        self.burst = burst
+        self.domain_rates = dict(DEFAULT_DOMAIN_RATES)
+        self.domain_rates.update(domain_rates or {})
+        self.penalty_seconds = penalty_seconds
+        self._buckets = {}
+        self._lock = threading.Lock()
+        # Number of 429/Retry-After responses seen (a congestion signal for adaptive concurrency)
+        self.throttled = 0
+
+    def rate_for(self, domain):
+        """Configured rate for a domain (parent domains match subdomains)"""
+        parts = domain.split('.')
+        for i in range(len(parts)):
+            rate = self.domain_rates.get('.'.join(parts[i:]))
+            if rate is not None:
+                return rate
+        return self.default_rate
+
+    def _bucket(self, domain):
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            rate = self.rate_for(domain)
+            bucket = TokenBucket(rate, capacity=self.burst if rate >= 1 else 1)
+            self._buckets[domain] = bucket
+        return bucket
+
+    def reserve(self, url):
+        """Reserve a request slot for url and return the required delay in seconds"""
+        with self._lock:
+            return self._bucket(domain_of(url)).reserve(time.monotonic())
+
+    def wait(self, url):
+        """Block the calling thread until a request to url is allowed"""
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def wait_async(self, url):
+        """Event-loop friendly version of wait()"""
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def penalize(self, url, seconds=None):
+        """Stop sending requests to url's host for a while"""
+        seconds = self.penalty_seconds if seconds is None else seconds
+        domain = domain_of(url)
+        with self._lock:
+            bucket = self._bucket(domain)
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + seconds)
+        print(f"   ⏳ {domain} asked us to slow down - pausing this host for {seconds:.0f}s")
+
+    def observe(self, url, status_code, headers=None):
+        """Feed a response back so 429/503 + Retry-After are honoured per host"""
+        if status_code in (429, 503):
+            retry_after = parse_retry_after((headers or {}).get('Retry-After'))
+            if status_code == 429 or retry_after is not None:
+                with self._lock:
+                    self.throttled += 1
+                self.penalize(url, retry_after)
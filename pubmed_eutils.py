@@ -0,0 +1,176 @@
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+EUTILS_BASE = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils'
+PUBMED_ARTICLE_RE = re.compile(r'^https?://pubmed\.ncbi\.nlm\.nih\.gov/(\d+)/?$')
+
+# esearch refuses retstart beyond this for db=pubmed
+ESEARCH_MAX_RECORDS = 10000
+
+
+def pmid_from_url(url):
+    """Return the PMID of a PubMed article page URL, or None"""
+    match = PUBMED_ARTICLE_RE.match(url.strip())
+    return match.group(1) if match else None
+
+
+def _text(element):
+    return ' '.join(''.join(element.itertext()).split()) if element is not None else ''
+
+
+class PubMedEutils:
+    """Batched PubMed metadata through E-utilities.
+
+    PMIDs are uploaded once with epost and then read back in pages of
+    batch_size with efetch (WebEnv/query_key), so a few hundred articles cost
+    a handful of requests instead of one HTML page each.
+    """
+
+    def __init__(self, http, scheduler, base_url=EUTILS_BASE, batch_size=200, api_key=None, timeout=30):
+        self.http = http
+        self.scheduler = scheduler
+        self.base_url = base_url.rstrip('/')
+        self.batch_size = batch_size
+        self.api_key = api_key
+        self.timeout = timeout
+        self.requests_made = 0
+        # Searches run their queries from a thread pool
+        self._lock = threading.Lock()
+
+    def _call(self, endpoint, params, post=False):
+        url = f"{self.base_url}/{endpoint}"
+        params = dict(params, tool='greyreview_leprosy')
+        if self.api_key:
+            params['api_key'] = self.api_key
+
+        self.scheduler.wait(url)
+        if post:
+            response = self.http.request('POST', url, data=params, timeout=self.timeout)
+        else:
+            response = self.http.get(url, params=params, timeout=self.timeout)
+        with self._lock:
+            self.requests_made += 1
+        self.scheduler.observe(url, response.status_code, response.headers)
+        response.raise_for_status()
+        return response
+
+    def esearch(self, term, retstart=0, retmax=500):
+        """One esearch page: returns (pmids, total_count)"""
+        params = {
+            'db': 'pubmed',
+            'term': term,
+            'retstart': retstart,
+            'retmax': retmax,
+            'retmode': 'json'
+        }
+        result = self._call('esearch.fcgi', params).json().get('esearchresult', {})
+        if 'ERROR' in result:
+            raise ValueError(result['ERROR'])
+        return result.get('idlist', []), int(result.get('count', 0))
+
+    def search_pmids(self, term, max_results=None, page_size=500):
+        """Harvest every PMID for term, paging with retstart/retmax.
+
+        Returns (pmids, total_count, elapsed_seconds). max_results=None means
+        the full result set (up to the esearch limit of 10,000 records).
+        """
+        started = time.perf_counter()
+        limit = ESEARCH_MAX_RECORDS if max_results is None else min(max_results, ESEARCH_MAX_RECORDS)
+
+        pmids, total = self.esearch(term, 0, min(page_size, limit))
+        wanted = min(total, limit)
+        while len(pmids) < wanted:
+            page, _ = self.esearch(term, len(pmids), min(page_size, wanted - len(pmids)))
+            if not page:
+                break
+            pmids.extend(page)
+
+        if total > limit:
+            print(f"   ⚠️ {total} results for this query, harvested the first {limit}")
+        return pmids, total, time.perf_counter() - started
+
+    def epost(self, pmids):
+        """Upload PMIDs to the history server and return (webenv, query_key)"""
+        response = self._call('epost.fcgi', {'db': 'pubmed', 'id': ','.join(pmids)}, post=True)
+        root = ET.fromstring(response.content)
+        webenv = root.findtext('WebEnv')
+        query_key = root.findtext('QueryKey')
+        if not webenv or not query_key:
+            raise ValueError(f"epost did not return a WebEnv: {_text(root.find('ERROR'))[:80]}")
+        return webenv, query_key
+
+    def efetch_history(self, webenv, query_key, retstart, retmax):
+        """Fetch one page of PubMed XML from the history server"""
+        params = {
+            'db': 'pubmed',
+            'WebEnv': webenv,
+            'query_key': query_key,
+            'retstart': retstart,
+            'retmax': retmax,
+            'retmode': 'xml',
+            'rettype': 'abstract'
+        }
+        return self._call('efetch.fcgi', params).content
+
+    @staticmethod
+    def parse_articles(xml_content):
+        """Parse efetch XML into {pmid: (title, abstract)}"""
+        articles = {}
+        root = ET.fromstring(xml_content)
+
+        for article in root.iter('PubmedArticle'):
+            pmid = article.findtext('MedlineCitation/PMID')
+            if not pmid:
+                continue
+            title = _text(article.find('MedlineCitation/Article/ArticleTitle'))
+            sections = article.findall('MedlineCitation/Article/Abstract/AbstractText')
+            articles[pmid.strip()] = (title, PubMedEutils._join_abstract(sections))
+
+        for book in root.iter('PubmedBookArticle'):
+            pmid = book.findtext('BookDocument/PMID')
+            if not pmid:
+                continue
+            title = _text(book.find('BookDocument/ArticleTitle')) or _text(book.find('BookDocument/Book/BookTitle'))
+            sections = book.findall('BookDocument/Abstract/AbstractText')
+            articles[pmid.strip()] = (title, PubMedEutils._join_abstract(sections))
+
+        return articles
+
+    @staticmethod
+    def _join_abstract(sections):
+        parts = []
+        for section in sections:
+            text = _text(section)
+            if not text:
+                continue
+            label = section.get('Label')
+            parts.append(f"{label}: {text}" if label else text)
+        return ' '.join(parts)
+
+    def fetch_articles(self, pmids):
+        """Return {pmid: (title, abstract)} for all PMIDs using epost + paged efetch"""
+        pmids = list(dict.fromkeys(pmids))
+        articles = {}
+        if not pmids:
+            return articles
+
+        # epost accepts large lists, but keep uploads bounded
+        upload_size = self.batch_size * 10
+        for start in range(0, len(pmids), upload_size):
+            chunk = pmids[start:start + upload_size]
+            try:
+                webenv, query_key = self.epost(chunk)
+            except Exception as e:
+                print(f"   ⚠️ epost failed for {len(chunk)} PMIDs: {e}")
+                continue
+
+            for retstart in range(0, len(chunk), self.batch_size):
+                try:
+                    xml_content = self.efetch_history(webenv, query_key, retstart, self.batch_size)
+                    articles.update(self.parse_articles(xml_content))
+                except Exception as e:
+                    print(f"   ⚠️ efetch failed at offset {start + retstart}: {e}")
+
+        return articles
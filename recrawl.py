@@ -0,0 +1,42 @@
+import hashlib
+import math
+
+DAY = 24 * 3600
+
+# Change rate assumed for a page seen only once (about one change a month)
+PRIOR_CHANGE_RATE = 1 / (30 * DAY)
+# Pages never seen changing are still rechecked about once a year
+MIN_CHANGE_RATE = 1 / (365 * DAY)
+
+
+def content_hash(title, abstract):
+    """Hash of the extracted text, so markup noise (ads, nonces, dates) is not a change"""
+    text = ' '.join(f"{title or ''}\n{abstract or ''}".split())
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def estimate_change_rate(checks, changes, elapsed):
+    """Changes per second of a page modelled as a Poisson process.
+
+    checks is the number of fetches, changes how many of the checks-1
+    revisits found a different hash and elapsed the seconds between the
+    first and last fetch. Uses the Cho & Garcia-Molina estimator
+    -log((n - X + 0.5) / (n + 0.5)) / I, which stays finite when every
+    revisit saw a change.
+    """
+    intervals = checks - 1
+    if intervals <= 0 or elapsed <= 0:
+        return PRIOR_CHANGE_RATE
+    mean_interval = elapsed / intervals
+    rate = -math.log((intervals - changes + 0.5) / (intervals + 0.5)) / mean_interval
+    return max(rate, MIN_CHANGE_RATE)
+
+
+def change_probability(rate, age):
+    """Probability that a page changed in the age seconds since it was fetched"""
+    return 1 - math.exp(-rate * max(age, 0))
+
+
+def due_at(last_fetched, rate):
+    """Time at which the page has a 50% chance of having changed (indexed for candidate lookup)"""
+    return last_fetched + math.log(2) / rate
@@ -0,0 +1,118 @@
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    """Persistent HTTP response cache with conditional revalidation.
+
+    Bodies are stored per URL together with their ETag/Last-Modified. The
+    next request for the same URL sends If-None-Match/If-Modified-Since and a
+    304 is answered from disk. Total size is bounded by max_bytes with
+    least-recently-used eviction.
+    """
+
+    def __init__(self, db_file='http_cache_leprosy.db', max_bytes=256 * 1024 * 1024):
+        self.db_file = db_file
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access);
+        """)
+        self._conn.commit()
+        self._total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0, 'bytes_saved': 0}
+
+    def conditional_headers(self, url):
+        """Validators to send for url (empty when nothing is cached)"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+        headers = {}
+        if row:
+            etag, last_modified = row
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def hit(self, url):
+        """Return the cached body after a 304, or None if it is gone"""
+        with self._lock:
+            row = self._conn.execute('SELECT body FROM responses WHERE url = ?', (url,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE responses SET last_access = ? WHERE url = ?', (time.time(), url))
+            self._conn.commit()
+            self.stats['hits'] += 1
+            self.stats['bytes_saved'] += len(row[0])
+        return row[0]
+
+    def store(self, url, body, headers):
+        """Cache a 200 response body when it carries validators"""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+
+        with self._lock:
+            self.stats['misses'] += 1
+            if not etag and not last_modified:
+                return False
+            if len(body) > self.max_bytes:
+                return False
+
+            now = time.time()
+            old = self._conn.execute('SELECT size FROM responses WHERE url = ?', (url,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(url, etag, last_modified, content_type, body, size, stored_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, etag, last_modified, headers.get('Content-Type'), body, len(body), now, now)
+            )
+            self._total_bytes += len(body) - (old[0] if old else 0)
+            self.stats['stored'] += 1
+            self._evict()
+            self._conn.commit()
+        return True
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                'SELECT url, size FROM responses ORDER BY last_access LIMIT 50'
+            ).fetchall()
+            if not rows:
+                break
+            for url, size in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+                self._total_bytes -= size
+                self.stats['evicted'] += 1
+
+    def mostrar_estatisticas(self):
+        """Print cache hit/miss counters and bandwidth saved"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        if not lookups:
+            return
+        hit_rate = self.stats['hits'] / lookups * 100
+        print(f"🗄️ HTTP CACHE: ✅ {self.stats['hits']} hits | ❌ {self.stats['misses']} misses "
+              f"({hit_rate:.1f}% hit rate) | 💾 {self.stats['bytes_saved'] / 1024:.0f} KB saved | "
+              f"{self._total_bytes / 1024 / 1024:.1f} MB on disk")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
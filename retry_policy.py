@@ -0,0 +1,180 @@
+import random
+import socket
+import ssl
+import threading
+import time
+
+from http_session import NonHTMLContent
+from politeness import domain_of
+
+# Error classes that say something about the host, not just the page
+HOST_ERRORS = {'timeout', 'connection', 'dns', 'tls', 'server_error'}
+PAGE_ERRORS = {'not_found', 'client_error', 'non_html'}
+RETRYABLE_ERRORS = {'timeout', 'connection', 'server_error', 'rate_limited', 'unknown'}
+
+
+def _exception_chain(exc):
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        yield exc
+        exc = exc.__cause__ or exc.__context__
+
+
+def _status_of(exc):
+    response = getattr(exc, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if status is None:
+        status = getattr(exc, 'status', None)  # aiohttp.ClientResponseError
+    return status if isinstance(status, int) else None
+
+
+def classify_error(exc):
+    """Map a download exception (requests or aiohttp) to an error class.
+
+    Classes: not_found, client_error, rate_limited, server_error, non_html,
+    circuit_open, dns, tls, timeout, connection, unknown. See RETRYABLE_ERRORS.
+    """
+    if isinstance(exc, NonHTMLContent):
+        return 'non_html'
+    if isinstance(exc, HostUnavailable):
+        return 'circuit_open'
+
+    status = _status_of(exc)
+    if status is not None:
+        if status in (404, 410):
+            return 'not_found'
+        if status == 429:
+            return 'rate_limited'
+        if status == 408:
+            return 'timeout'
+        if status >= 500:
+            return 'server_error'
+        return 'client_error'
+
+    for error in _exception_chain(exc):
+        name = type(error).__name__
+        text = str(error)
+        if isinstance(error, socket.gaierror) or 'NameResolution' in name or 'DNSError' in name \
+                or 'Failed to resolve' in text or 'Name or service not known' in text:
+            return 'dns'
+        if isinstance(error, (ssl.SSLError, ssl.CertificateError)) or 'SSL' in name or 'Certificate' in name:
+            return 'tls'
+    for error in _exception_chain(exc):
+        name = type(error).__name__
+        if isinstance(error, (TimeoutError, socket.timeout)) or 'Timeout' in name:
+            return 'timeout'
+        if isinstance(error, ConnectionError) or 'Connect' in name or 'Disconnected' in name:
+            return 'connection'
+    return 'unknown'
+
+
+class HostUnavailable(Exception):
+    """Raised instead of fetching while a host's circuit is open"""
+
+    def __init__(self, domain, retry_in):
+        super().__init__(f"circuit open for {domain} (retry in {retry_in:.0f}s)")
+        self.domain = domain
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, only for retryable error classes"""
+
+    def __init__(self, max_attempts=3, base_delay=1.0, max_delay=30.0, retryable=RETRYABLE_ERRORS):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable = set(retryable)
+
+    def should_retry(self, error_class, attempt):
+        """attempt counts from 0 for the first try"""
+        return error_class in self.retryable and attempt + 1 < self.max_attempts
+
+    def delay(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Per-domain circuit breaker.
+
+    After failure_threshold consecutive URLs fail with host-level errors
+    (timeouts, refused connections, DNS/TLS errors, 5xx) the domain is opened and
+    its URLs fail immediately for reset_timeout seconds. Then a single trial
+    request is let through: success closes the circuit, failure opens it
+    again with twice the timeout (up to max_reset_timeout).
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=60.0, max_reset_timeout=900.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._state = {}
+        self._lock = threading.Lock()
+        self.stats = {'opened': 0, 'fast_failed': 0}
+
+    def _domain_state(self, domain):
+        state = self._state.get(domain)
+        if state is None:
+            state = self._state[domain] = {
+                'failures': 0, 'open_until': 0.0, 'timeout': self.reset_timeout, 'trial': None
+            }
+        return state
+
+    def check(self, url):
+        """Raise HostUnavailable if url's domain is open; may admit one trial request"""
+        domain = domain_of(url)
+        now = time.monotonic()
+        with self._lock:
+            state = self._domain_state(domain)
+            if state['failures'] < self.failure_threshold:
+                return
+            trial = state['trial']
+            if trial and trial[0] == url:
+                # Retries of the trial request itself
+                return
+            if now >= state['open_until'] and (not trial or now - trial[1] > state['timeout']):
+                state['trial'] = (url, now)
+                return
+            self.stats['fast_failed'] += 1
+            raise HostUnavailable(domain, max(state['open_until'] - now, 0.0))
+
+    def record_success(self, url):
+        with self._lock:
+            state = self._domain_state(domain_of(url))
+            state.update(failures=0, open_until=0.0, timeout=self.reset_timeout, trial=None)
+
+    def record_failure(self, url, error_class):
+        """Record the final outcome of a failed URL (429 is left to the politeness scheduler)"""
+        if error_class in PAGE_ERRORS:
+            # The host answered: a 404 or a PDF says nothing about its health
+            self.record_success(url)
+            return
+        with self._lock:
+            state = self._domain_state(domain_of(url))
+            if error_class not in HOST_ERRORS:
+                state['trial'] = None
+                return
+            state['failures'] += 1
+            if state['trial']:
+                state['timeout'] = min(state['timeout'] * 2, self.max_reset_timeout)
+            if state['failures'] >= self.failure_threshold:
+                if state['trial'] or state['failures'] == self.failure_threshold:
+                    self.stats['opened'] += 1
+                state['open_until'] = time.monotonic() + state['timeout']
+            state['trial'] = None
+
+    def open_domains(self):
+        now = time.monotonic()
+        with self._lock:
+            return [domain for domain, state in self._state.items()
+                    if state['failures'] >= self.failure_threshold and state['open_until'] > now]
+
+    def mostrar_estatisticas(self):
+        """Print how many URLs were fast-failed by open circuits"""
+        if not self.stats['opened']:
+            return
+        print(f"🔌 CIRCUIT BREAKER: opened {self.stats['opened']}x | "
+              f"⏭️ {self.stats['fast_failed']} URLs fast-failed")
+        for domain in self.open_domains()[:5]:
+            print(f"   • {domain} still unavailable")
@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+
+class RunJournal:
+    """Append-only write-ahead journal of a scraping run.
+
+    Every URL accepted into the frontier, the end of the search stage and
+    every finished row are appended (and flushed) as JSON lines before the
+    run moves on. After a crash, load() replays the file so a resumed run
+    fetches exactly the URLs that never finished and rewrites the rows that
+    already did. A truncated last line is ignored.
+    """
+
+    def __init__(self, file_name='run_journal_leprosy.jsonl'):
+        self.file_name = file_name
+        self.header = None
+        self.search_done = False
+        self.frontier = []
+        self.rows = {}
+        self.error_classes = {}
+        self._frontier_set = set()
+        self._lock = threading.Lock()
+        self._file = None
+
+    def exists(self):
+        return os.path.exists(self.file_name)
+
+    def load(self):
+        """Replay an existing journal; return True if it holds a resumable run"""
+        if not self.exists():
+            return False
+
+        with open(self.file_name, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Partial write at the moment of the crash
+                    continue
+                kind = record.get('type')
+                if kind == 'start':
+                    self.header = record
+                elif kind == 'frontier':
+                    if record['url'] not in self._frontier_set:
+                        self._frontier_set.add(record['url'])
+                        self.frontier.append(record['url'])
+                elif kind == 'search_done':
+                    self.search_done = True
+                elif kind in ('done', 'failed'):
+                    self.rows[record['row']['URL']] = record['row']
+                    if record.get('error_class'):
+                        self.error_classes[record['row']['URL']] = record['error_class']
+
+        if self.header is None:
+            return False
+        self._file = open(self.file_name, 'a', encoding='utf-8')
+        return True
+
+    def start(self, output, formats):
+        """Begin a new journal, replacing any previous one"""
+        self.header = {
+            'type': 'start',
+            'output': output,
+            'formats': list(formats),
+            'started': datetime.now().isoformat(),
+        }
+        self._file = open(self.file_name, 'w', encoding='utf-8')
+        self._append(self.header)
+
+    def _append(self, record):
+        with self._lock:
+            if self._file is None:
+                # Fetches still completing after an interruption closed the journal
+                return
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._file.flush()
+
+    def pending(self):
+        """Frontier URLs that have no result yet, in discovery order"""
+        return [url for url in self.frontier if url not in self.rows]
+
+    def add_frontier(self, url):
+        """Record a URL accepted for fetching"""
+        with self._lock:
+            if url in self._frontier_set:
+                return
+            self._frontier_set.add(url)
+        self._append({'type': 'frontier', 'url': url})
+
+    def mark_search_done(self):
+        """Record that every search source finished, so a resume can skip searching"""
+        self.search_done = True
+        self._append({'type': 'search_done'})
+
+    def write(self, row, error_class=None):
+        """Record a finished row (sink interface)"""
+        record = {'type': 'done' if row['Status'] == 'Sucesso' else 'failed', 'row': row}
+        if error_class:
+            record['error_class'] = error_class
+        self._append(record)
+
+    def close(self, remove=False):
+        """Close the journal; remove it once the run completed"""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+        if remove and self.exists():
+            os.remove(self.file_name)
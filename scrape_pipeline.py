@@ -0,0 +1,264 @@
+import asyncio
+import queue
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from adaptive_concurrency import AIMDController
+from parallel_pipeline import FetchParsePipeline
+from pubmed_eutils import pmid_from_url
+
+_END = object()
+
+
+# ----------------------------------------------------------------------
+# Fetch engines: engine(urls, emit) consumes a (possibly blocking) URL
+# iterable and calls emit((url, title, abstract, status)) per result.
+# ----------------------------------------------------------------------
+def motor_sequencial(scraper):
+    """One URL at a time (politeness comes from the per-domain scheduler)"""
+    def run(urls, emit):
+        for url in urls:
+            print(f"🔗 {url[:55]}...")
+            emit((url,) + scraper.extrair_resumo_completo(url))
+    return run
+
+
+def motor_threads(scraper, max_workers=10, adaptive=True, max_concurrency=64, min_concurrency=2,
+                  concurrency_log=None):
+    """Thread pool; with adaptive=True the number of in-flight fetches follows an
+    AIMD controller (see adaptive_concurrency) starting at max_workers"""
+    def process_url(url, emit):
+        try:
+            emit((url,) + scraper.extrair_resumo_completo(url))
+        except Exception as e:
+            emit((url, "Access Error", f"Error: {str(e)[:80]}", "Erro"))
+
+    def run(urls, emit):
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for url in urls:
+                executor.submit(process_url, url, emit)
+
+    def run_adaptive(urls, emit):
+        controller = AIMDController(initial=max_workers, minimum=min_concurrency, maximum=max_concurrency,
+                                    log_file=concurrency_log)
+
+        def process_measured(url):
+            # Only network time is judged: politeness waits and retry backoff are excluded
+            scraper.take_request_time()
+            error_class = None
+            try:
+                result = scraper.extrair_resumo_completo(url)
+                if result[2] != "Sucesso":
+                    error_class = scraper.failure_classes.get(url, 'unknown')
+                item = (url,) + result
+            except Exception as e:
+                error_class = 'unknown'
+                item = (url, "Access Error", f"Error: {str(e)[:80]}", "Erro")
+            controller.release(scraper.take_request_time(), error_class, scraper.scheduler.throttled)
+            emit(item)
+
+        with ThreadPoolExecutor(max_workers=controller.maximum) as executor:
+            for url in urls:
+                controller.acquire()
+                executor.submit(process_measured, url)
+        controller.mostrar_estatisticas()
+
+    return run_adaptive if adaptive else run
+
+
+def motor_async(scraper, max_in_flight=200, limit_per_host=10):
+    """Single event loop with hundreds of in-flight requests"""
+    def run(urls, emit):
+        # aiohttp is only imported when the async engine is used
+        from async_fetch import AsyncFetcher
+
+        fetcher = AsyncFetcher(scraper, max_in_flight=max_in_flight, limit_per_host=limit_per_host)
+
+        async def consume():
+            async for item in fetcher.iter_results(urls):
+                emit(item)
+
+        # The fetch stage has its own thread, so there is never a running loop here
+        asyncio.run(consume())
+    return run
+
+
+def motor_processos(scraper, io_workers=16, parse_workers=None, queue_size=64):
+    """I/O threads for downloads, process pool for parsing"""
+    def run(urls, emit):
+        pipeline = FetchParsePipeline(scraper, io_workers=io_workers,
+                                      parse_workers=parse_workers, queue_size=queue_size)
+        for item in pipeline.iter_results(urls):
+            emit(item)
+    return run
+
+
+def fontes_padrao(scraper, max_urls=120):
+    """The default search stage: Google, PubMed and the curated specialized sources"""
+    return {
+        'Google': lambda: scraper.iter_google_urls(max_urls=max_urls),
+        'PubMed': scraper.iter_pubmed_urls,
+        'Specialized': scraper.iter_specialized_urls,
+    }
+
+
+class ScrapePipeline:
+    """Streaming run: search → filter_new_urls → fetch → extract → sink.
+
+    Every search source runs in its own thread and pushes URLs into a
+    frontier queue as soon as they are discovered. A router thread drops
+    URLs already seen in this run or in the history (compared by canonical
+    key, see url_canonical), resolves PubMed articles in E-utilities
+    batches, and forwards the rest to the fetch engine. Fetching therefore
+    overlaps the slow, rate-limited searches.
+
+    With a journal (see run_journal), every accepted URL and the end of the
+    search stage are recorded before they are fetched, and every result as
+    soon as its fetch completes (journal_row(url, title, abstract, status)
+    builds the recorded row), so results the consumer has not reached yet
+    are not fetched again by a resumed run.
+    """
+
+    def __init__(self, scraper, engine, sources, pubmed_batch=200, journal=None, journal_row=None):
+        self.scraper = scraper
+        self.engine = engine
+        self.sources = sources
+        self.pubmed_batch = pubmed_batch
+        self.journal = journal
+        self.journal_row = journal_row or (
+            lambda url, title, abstract, status: {'URL': url, 'Title': title, 'Abstract': abstract, 'Status': status}
+        )
+        self.stats = {label: Counter() for label in sources}
+        self.errors = []
+        self.failed_sources = []
+
+    def _guard(self, target, *args):
+        try:
+            target(*args)
+        except Exception as e:
+            self.errors.append(e)
+            print(f"⚠️ Pipeline stage failed: {e}")
+
+    def _finish(self, results, item):
+        """Journal a result as soon as it exists, then hand it to the consumer"""
+        if self.journal:
+            url, status = item[0], item[3]
+            error_class = None if status == "Sucesso" else self.scraper.failure_classes.get(url, 'unknown')
+            self.journal.write(self.journal_row(*item), error_class)
+        results.put(item)
+
+    def _search(self, label, frontier):
+        try:
+            for url in self.sources[label]():
+                frontier.put((label, url))
+        except Exception as e:
+            # A failing source must not discard what the other stages already did
+            self.failed_sources.append(label)
+            print(f"⚠️ Search source '{label}' failed: {e}")
+        finally:
+            frontier.put((label, _END))
+
+    def _route(self, frontier, fetch_queue, results):
+        seen = set()
+        pubmed_urls = []
+
+        def flush_pubmed():
+            if not pubmed_urls:
+                return
+            resolved = self.scraper.extrair_pubmed_em_lote(pubmed_urls)
+            for url in pubmed_urls:
+                if url in resolved:
+                    self._finish(results, (url,) + resolved[url])
+                else:
+                    fetch_queue.put(url)
+            pubmed_urls.clear()
+
+        try:
+            finished = 0
+            while finished < len(self.sources):
+                label, url = frontier.get()
+                if url is _END:
+                    finished += 1
+                    flush_pubmed()
+                    continue
+
+                stats = self.stats[label]
+                stats['found'] += 1
+                key = self.scraper.canonicalizer.key(url)
+                if key in seen:
+                    stats['duplicate'] += 1
+                    continue
+                seen.add(key)
+                history = self.scraper.urls_processed
+                if url in history and not history.is_recrawl(url):
+                    # Pages the search keeps returning become candidates for recrawling
+                    history.track(url)
+                    stats['known'] += 1
+                    continue
+                if self.scraper.urls_processed.is_deferred(url):
+                    # Failed before and not yet due (or over this run's retry budget)
+                    stats['deferred'] += 1
+                    continue
+                stats['new'] += 1
+                if self.journal:
+                    self.journal.add_frontier(url)
+
+                if pmid_from_url(url):
+                    pubmed_urls.append(url)
+                    if len(pubmed_urls) >= self.pubmed_batch:
+                        flush_pubmed()
+                else:
+                    fetch_queue.put(url)
+
+            if self.journal and not self.failed_sources:
+                self.journal.mark_search_done()
+            flush_pubmed()
+        finally:
+            fetch_queue.put(_END)
+
+    def _fetch(self, fetch_queue, results):
+        try:
+            self.engine(iter(fetch_queue.get, _END), lambda item: self._finish(results, item))
+        finally:
+            results.put(_END)
+
+    def run(self):
+        """Yield (url, title, abstract, status) for every new URL as soon as it is processed"""
+        frontier = queue.Queue()
+        fetch_queue = queue.Queue()
+        results = queue.Queue()
+
+        threads = [
+            threading.Thread(target=self._search, args=(label, frontier), daemon=True)
+            for label in self.sources
+        ]
+        threads.append(threading.Thread(target=self._guard, args=(self._route, frontier, fetch_queue, results),
+                                        daemon=True))
+        threads.append(threading.Thread(target=self._guard, args=(self._fetch, fetch_queue, results),
+                                        daemon=True))
+        for thread in threads:
+            thread.start()
+
+        while True:
+            item = results.get()
+            if item is _END:
+                break
+            yield item
+
+        for thread in threads:
+            thread.join()
+
+        if self.errors:
+            raise self.errors[0]
+
+    def mostrar_resumo(self):
+        """Print the per-source search summary"""
+        print(f"\n📊 INCREMENTAL SEARCH SUMMARY:")
+        total_new = 0
+        for label, stats in self.stats.items():
+            total_new += stats['new']
+            print(f"   🔍 {label}: {stats['found']} found | 🆕 {stats['new']} new | "
+                  f"🔄 {stats['known']} already in history | ♊ {stats['duplicate']} duplicates | "
+                  f"⏳ {stats['deferred']} waiting for retry")
+        print(f"   🆕 Total new URLs: {total_new} URLs")
@@ -0,0 +1,137 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_QUERIES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'search_queries.json')
+PAGE_SIZE = 10
+
+
+def load_queries(config_file=None):
+    """Search queries per source ({'google': [...], 'pubmed': [...]}) from a JSON file"""
+    config_file = config_file or DEFAULT_QUERIES_FILE
+    with open(config_file, encoding='utf-8') as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError(f"{config_file}: expected an object with one list of queries per source")
+    return {source: [query for query in queries if query.strip()] for source, queries in config.items()}
+
+
+class SearchResultCache:
+    """Persistent per-query cache of search result URLs with a resumable cursor.
+
+    Each query remembers the URLs it returned, how deep its results have
+    been read (the cursor, in result positions) and when its first page was
+    last fetched. Within ttl seconds a query is answered from disk and only
+    pages past the cursor are requested, until max_depth or the end of the
+    results. After ttl the first pages are fetched again to pick up new
+    results.
+    """
+
+    def __init__(self, db_file='google_cache_leprosy.db', ttl=7 * 24 * 3600, max_depth=100):
+        self.db_file = db_file
+        self.ttl = ttl
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS queries (
+                query TEXT PRIMARY KEY,
+                cursor INTEGER NOT NULL DEFAULT 0,
+                exhausted INTEGER NOT NULL DEFAULT 0,
+                refreshed_at REAL NOT NULL DEFAULT 0,
+                last_fetch REAL NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                query TEXT NOT NULL,
+                url TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                found_at REAL NOT NULL,
+                PRIMARY KEY (query, url)
+            );
+        """)
+        self._conn.commit()
+        self.stats = {'cached_queries': 0, 'fetched_queries': 0, 'cached_urls': 0, 'new_urls': 0}
+
+    def cached_urls(self, query):
+        """URLs already known for query, in result order"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT url FROM results WHERE query = ? ORDER BY position', (query,)
+            ).fetchall()
+        self.stats['cached_urls'] += len(rows)
+        return [row[0] for row in rows]
+
+    def next_fetch(self, query, wanted, now=None):
+        """(start, count) of the results to request for query, or None to skip the search.
+
+        count is rounded up to whole result pages.
+        """
+        now = time.time() if now is None else now
+        wanted = max(PAGE_SIZE, -(-wanted // PAGE_SIZE) * PAGE_SIZE)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT cursor, exhausted, refreshed_at FROM queries WHERE query = ?', (query,)
+            ).fetchone()
+        if row is None or now - row[2] >= self.ttl:
+            self.stats['fetched_queries'] += 1
+            return 0, min(wanted, self.max_depth)
+        cursor, exhausted, _ = row
+        if exhausted or cursor >= self.max_depth:
+            self.stats['cached_queries'] += 1
+            return None
+        self.stats['fetched_queries'] += 1
+        return cursor, min(wanted, self.max_depth - cursor)
+
+    def age(self, query, now=None):
+        """Seconds since the first results page of query was fetched (None if never)"""
+        with self._lock:
+            row = self._conn.execute('SELECT refreshed_at FROM queries WHERE query = ?', (query,)).fetchone()
+        return None if row is None else (time.time() if now is None else now) - row[0]
+
+    def record(self, query, start, urls, consumed, requested, complete, now=None):
+        """Store the results read from position start.
+
+        consumed counts every result read (duplicates included) so the cursor
+        stays aligned with the engine's offsets. complete is False when the
+        search was interrupted; a complete search that returned fewer than
+        requested results marks the query as exhausted.
+        """
+        now = time.time() if now is None else now
+        end = start + consumed
+        exhausted = int(complete and consumed < requested)
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO results (query, url, position, found_at) VALUES (?, ?, ?, ?)',
+                ((query, url, start + i, now) for i, url in enumerate(urls))
+            )
+            row = self._conn.execute(
+                'SELECT cursor, refreshed_at FROM queries WHERE query = ?', (query,)
+            ).fetchone()
+            cursor, refreshed_at = row if row else (0, 0.0)
+            if start == 0 and consumed:
+                # A new head page: deeper results may only have shifted down, so
+                # the cursor keeps its place and the end is searched again
+                refreshed_at = now
+            self._conn.execute(
+                'INSERT OR REPLACE INTO queries (query, cursor, exhausted, refreshed_at, last_fetch) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (query, max(cursor, end), exhausted, refreshed_at, now)
+            )
+            self._conn.commit()
+        self.stats['new_urls'] += len(urls)
+
+    def mostrar_estatisticas(self):
+        """Print how many queries were answered without searching"""
+        total = self.stats['cached_queries'] + self.stats['fetched_queries']
+        if not total:
+            return
+        print(f"🗂️ SEARCH CACHE: {self.stats['cached_queries']}/{total} queries served from cache | "
+              f"{self.stats['cached_urls']} cached URLs | {self.stats['new_urls']} URLs fetched")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
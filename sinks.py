@@ -0,0 +1,107 @@
+import csv
+import json
+import os
+
+COLUMNS = ['URL', 'Title', 'Abstract', 'Status', 'Source', 'Processing_Date', 'Execution']
+
+
+class CSVSink:
+    """Append rows to a CSV file, flushing each one to disk"""
+
+    def __init__(self, file_name, columns=COLUMNS):
+        self.file_name = file_name
+        self.rows_written = 0
+        self._file = open(file_name, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=columns, extrasaction='ignore')
+        self._writer.writeheader()
+        self._file.flush()
+
+    def write(self, row):
+        self._writer.writerow(row)
+        self._file.flush()
+        self.rows_written += 1
+
+    def close(self):
+        self._file.close()
+
+
+class JSONLSink:
+    """Append rows to a JSON Lines file, flushing each one to disk"""
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.rows_written = 0
+        self._file = open(file_name, 'w', encoding='utf-8')
+
+    def write(self, row):
+        self._file.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self.rows_written += 1
+
+    def close(self):
+        self._file.close()
+
+
+class DataFrameSink:
+    """Keep rows in memory to build a DataFrame at the end (only when requested)"""
+
+    def __init__(self):
+        self.file_name = None
+        self.rows = []
+        self.rows_written = 0
+
+    def write(self, row):
+        self.rows.append(row)
+        self.rows_written += 1
+
+    def close(self):
+        pass
+
+    def to_dataframe(self, sort_by_status=True):
+        import pandas as pd
+
+        df = pd.DataFrame(self.rows, columns=COLUMNS)
+        if sort_by_status:
+            df = df.sort_values('Status', ascending=False)  # Success first
+        return df
+
+
+SINKS = {
+    'csv': CSVSink,
+    'jsonl': JSONLSink,
+}
+
+
+def criar_sinks(base_name, formats=('csv',)):
+    """Create one file sink per format: <base_name>.<format>"""
+    sinks = []
+    for fmt in formats:
+        if fmt not in SINKS:
+            raise ValueError(f"Unknown output format '{fmt}' (available: {', '.join(SINKS)})")
+        sinks.append(SINKS[fmt](f"{base_name}.{fmt}"))
+    return sinks
+
+
+def ordenar_csv_por_status(file_name, descending=True):
+    """Rewrite a CSV with rows grouped by Status ('Sucesso' first).
+
+    One pass collects the distinct statuses (a handful of values) and one
+    pass per status streams the matching rows out, so memory stays constant
+    whatever the file size.
+    """
+    with open(file_name, newline='', encoding='utf-8') as f:
+        statuses = sorted({row['Status'] for row in csv.DictReader(f)}, reverse=descending)
+
+    tmp_name = file_name + '.tmp'
+    with open(tmp_name, 'w', newline='', encoding='utf-8') as out:
+        writer = None
+        for status in statuses:
+            with open(file_name, newline='', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                if writer is None:
+                    writer = csv.DictWriter(out, fieldnames=reader.fieldnames)
+                    writer.writeheader()
+                for row in reader:
+                    if row['Status'] == status:
+                        writer.writerow(row)
+    os.replace(tmp_name, file_name)
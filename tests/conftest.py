@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+
+# The modules live flat at the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+@pytest.fixture
+def offline_run(tmp_path, monkeypatch):
+    """executar_scraper_incremental on throwaway files, with run(urls) as the whole search stage.
+
+    Pages are not downloaded: every URL extracts to a fixed title/abstract.
+    """
+    import functions
+    from web_scraper_historico import WebScraperHistoricoColab
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(WebScraperHistoricoColab, 'extrair_resumo_completo',
+                        lambda self, url, timeout=12: (f'Title of {url}', f'Abstract of {url}. ' * 10, 'Sucesso'))
+
+    def run(urls, **options):
+        monkeypatch.setattr(functions, 'fontes_padrao',
+                            lambda scraper, max_urls: {'Specialized': lambda: iter(urls)})
+        scraper_options = {'history_db': str(tmp_path / 'history.db'),
+                           'history_file': str(tmp_path / 'history.json'),
+                           'cache_file': None, 'google_cache_file': None}
+        scraper_options.update(options.pop('scraper_options', {}))
+        options.setdefault('corpus_file', str(tmp_path / 'corpus.db'))
+        options.setdefault('journal_file', str(tmp_path / 'journal.jsonl'))
+        return functions.executar_scraper_incremental(scraper_options=scraper_options, retornar_df=False, **options)
+
+    return run
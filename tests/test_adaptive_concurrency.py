@@ -0,0 +1,53 @@
+import threading
+import time
+
+from politeness import DomainScheduler
+from scrape_pipeline import motor_threads
+from web_scraper_historico import WebScraperHistoricoColab
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+
+def test_request_time_excludes_politeness_waits(tmp_path, monkeypatch):
+    scraper = WebScraperHistoricoColab(history_db=str(tmp_path / 'history.db'),
+                                       history_file=str(tmp_path / 'history.json'),
+                                       cache_file=None, google_cache_file=None)
+    monkeypatch.setattr(scraper.scheduler, 'wait', lambda url: time.sleep(0.2))
+    monkeypatch.setattr(scraper.http, 'get', lambda url, **kwargs: time.sleep(0.01) or FakeResponse())
+
+    scraper._get_streamed('https://example.org/a', {}, 5)
+    assert 0.01 <= scraper.take_request_time() < 0.1
+    assert scraper.take_request_time() is None
+
+
+class QueuedHostScraper:
+    """All URLs on one paced host: the politeness wait grows with the queue, responses stay fast"""
+
+    def __init__(self, rate):
+        self.scheduler = DomainScheduler(default_rate=rate)
+        self.failure_classes = {}
+        self._local = threading.local()
+
+    def extrair_resumo_completo(self, url):
+        self.scheduler.wait(url)
+        time.sleep(0.005)
+        self._local.seconds = 0.005
+        return 'Title', 'Abstract long enough to count', 'Sucesso'
+
+    def take_request_time(self):
+        seconds = getattr(self._local, 'seconds', None)
+        self._local.seconds = None
+        return seconds
+
+
+def test_politeness_queue_does_not_cut_concurrency(capsys):
+    scraper = QueuedHostScraper(rate=100.0)
+    results = []
+    run = motor_threads(scraper, max_workers=16, adaptive=True, max_concurrency=32)
+    run([f'https://slow-host.example.org/{i}' for i in range(150)], results.append)
+
+    assert len(results) == 150
+    assert '(p50' not in capsys.readouterr().out
@@ -0,0 +1,17 @@
+import sqlite3
+
+
+def documents(db_file):
+    conn = sqlite3.connect(db_file)
+    try:
+        return conn.execute('SELECT url, status FROM documents ORDER BY id').fetchall()
+    finally:
+        conn.close()
+
+
+def test_fresh_run_writes_every_row_to_the_corpus(tmp_path, offline_run, capsys):
+    urls = [f'https://journal{i}.example.org/article/{i}' for i in range(12)]
+    offline_run(urls)
+
+    assert documents(str(tmp_path / 'corpus.db')) == [(url, 'Sucesso') for url in urls]
+    assert '🗃️ Corpus: ' in capsys.readouterr().out
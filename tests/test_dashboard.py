@@ -0,0 +1,52 @@
+import os
+import sqlite3
+
+import cli
+from corpus_store import CorpusStore
+
+
+def row(url, abstract, status='Sucesso'):
+    return {'URL': url, 'Title': 'T', 'Abstract': abstract, 'Status': status, 'Source': 'Google',
+            'Processing_Date': '2025-01-01 10:00:00', 'Execution': 'Incremental'}
+
+
+def test_run_with_dashboard_dir_writes_the_charts(tmp_path, offline_run, capsys):
+    dashboard_dir = tmp_path / 'dashboard'
+    offline_run([f'https://journal{i}.example.org/article/{i}' for i in range(6)], dashboard_dir=str(dashboard_dir))
+
+    for fmt in ('png', 'svg'):
+        assert os.path.getsize(dashboard_dir / f'dashboard.{fmt}') > 0
+
+    # The corpus the scraper built is not empty for `cli.py visualize` either
+    output_dir = tmp_path / 'visualize'
+    assert cli.main(['visualize', '--corpus', str(tmp_path / 'corpus.db'), '--output-dir', str(output_dir),
+                     '--formats', 'png']) == 0
+    assert 'is empty' not in capsys.readouterr().out
+    assert os.path.getsize(output_dir / 'dashboard.png') > 0
+
+
+def test_abstract_length_buckets_skip_placeholders(tmp_path):
+    corpus = CorpusStore(str(tmp_path / 'corpus.db'), run_id='run')
+    for i, abstract in enumerate(['x' * 30, 'x' * 120, 'x' * 480, 'x' * 500 + '...', 'Abstract not available']):
+        corpus.write(row(f'https://example.org/{i}', abstract))
+    corpus.write(row('https://example.org/error', 'Error: timeout', status='Erro'))
+
+    assert corpus.aggregates('abstract_length') == {'450': 2, '0': 1, '100': 1}
+    corpus.close()
+
+
+def test_older_aggregates_are_rebuilt(tmp_path):
+    db_file = str(tmp_path / 'corpus.db')
+    corpus = CorpusStore(db_file, run_id='run')
+    corpus.write(row('https://example.org/a', 'x' * 120))
+    corpus.close()
+
+    conn = sqlite3.connect(db_file)
+    conn.execute("UPDATE aggregates SET key = '0' WHERE dimension = 'abstract_length'")
+    conn.execute('PRAGMA user_version = 1')
+    conn.commit()
+    conn.close()
+
+    corpus = CorpusStore(db_file)
+    assert corpus.aggregates('abstract_length') == {'100': 1}
+    corpus.close()
@@ -0,0 +1,36 @@
+"""Parity of the head-only fast path with the BeautifulSoup strategies"""
+import glob
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+from fast_extract import extract_fast
+from web_scraper_historico import WebScraperHistoricoColab
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'fixtures', 'extraction', '*.html')))
+
+
+def soup_only(content):
+    """What _parse_content returned before the fast path existed"""
+    soup = BeautifulSoup(content, 'html.parser')
+    return (WebScraperHistoricoColab._extract_title(soup),
+            WebScraperHistoricoColab._extract_abstract_multiple_strategies(soup))
+
+
+@pytest.mark.parametrize('fixture', FIXTURES, ids=os.path.basename)
+def test_parse_content_matches_soup_only(fixture):
+    with open(fixture, 'rb') as f:
+        content = f.read()
+    assert WebScraperHistoricoColab._parse_content(content) == soup_only(content)
+
+
+def test_fast_path_settles_typical_pages():
+    # Otherwise the parity above would only compare the soup path with itself
+    settled = []
+    for fixture in FIXTURES:
+        with open(fixture, 'rb') as f:
+            if extract_fast(f.read()):
+                settled.append(os.path.basename(fixture))
+    assert {'basic.html', 'entities.html', 'latin1.html', 'bom_utf8.html'} <= set(settled)
+    assert 'abstract_div.html' not in settled
@@ -0,0 +1,121 @@
+import sqlite3
+import threading
+
+from history_store import HistoryStore
+
+
+def fetch_state_rows(db_file):
+    conn = sqlite3.connect(db_file)
+    try:
+        return conn.execute('SELECT COUNT(*) FROM fetch_state').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_track_while_flushing(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.db'))
+    errors = []
+
+    def router():
+        for i in range(20000):
+            store.track(f'https://example.org/page/{i}')
+
+    def checkpoints():
+        try:
+            for _ in range(200):
+                store.flush()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=router), threading.Thread(target=checkpoints)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.close()
+
+    assert errors == []
+    # No tracked URL is lost between a flush and the next one
+    assert fetch_state_rows(str(tmp_path / 'history.db')) == 20000
+
+
+def test_run_with_only_known_urls_keeps_tracked_pages(tmp_path, offline_run):
+    url = 'https://www.who.int/news-room/fact-sheets/detail/leprosy'
+    history = HistoryStore(str(tmp_path / 'history.db'))
+    history.add(url)
+    history.close()
+
+    assert offline_run([url]) is None  # nothing new to process
+    assert fetch_state_rows(str(tmp_path / 'history.db')) == 1
+
+
+class Clock:
+    def __init__(self, now=1700000000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_failures_back_off_by_four_until_the_attempt_cap(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr('history_store.time.time', clock)
+    url = 'https://example.org/slow'
+    store = HistoryStore(str(tmp_path / 'history.db'))
+
+    delays = [store.record_failure(url, 'timeout', 'Read timed out') for _ in range(4)]
+    assert delays == [3600, 4 * 3600, 16 * 3600, 64 * 3600]
+    assert store.has_failure(url) and url not in store
+
+    # The fifth attempt is the last one: the URL is given up and marked processed
+    assert store.record_failure(url, 'timeout') is None
+    assert not store.has_failure(url) and url in store
+    store.close()
+
+
+def test_backoff_is_capped_and_attempts_survive_a_reopen(tmp_path, monkeypatch):
+    monkeypatch.setattr('history_store.time.time', Clock())
+    db_file = str(tmp_path / 'history.db')
+    url = 'https://example.org/flaky'
+    options = {'max_failure_attempts': 10, 'retry_max_seconds': 20000}
+
+    store = HistoryStore(db_file, **options)
+    assert [store.record_failure(url, 'server_error') for _ in range(2)] == [3600, 14400]
+    store.close()
+
+    store = HistoryStore(db_file, **options)
+    assert store.has_failure(url)
+    assert [store.record_failure(url, 'connection') for _ in range(2)] == [20000, 20000]
+    store.close()
+
+
+def test_permanent_errors_are_never_requeued(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.db'))
+
+    for error_class in ('not_found', 'dns', 'tls'):
+        url = f'https://example.org/{error_class}'
+        assert store.record_failure(url, error_class) is None
+        assert not store.has_failure(url) and url in store
+    assert store.failure_stats() == (0, 0)
+    assert store.failures_due(10) == []
+    store.close()
+
+
+def test_failures_become_due_after_their_backoff(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr('history_store.time.time', clock)
+    store = HistoryStore(str(tmp_path / 'history.db'))
+    first, second = 'https://example.org/a', 'https://example.org/b'
+    store.record_failure(first, 'timeout')
+    clock.now += 60
+    store.record_failure(second, 'rate_limited')
+
+    assert store.failures_due(10) == []
+    assert store.is_deferred(first)
+
+    clock.now += 3600
+    assert store.failure_stats() == (2, 2)
+    assert store.failures_due(1) == [first]
+    assert not store.is_deferred(first) and store.is_deferred(second)
+    assert store.failures_due(10) == [first, second]
+    store.close()
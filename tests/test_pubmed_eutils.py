@@ -0,0 +1,146 @@
+import json
+import re
+import threading
+
+from pubmed_eutils import PubMedEutils
+from web_scraper_historico import WebScraperHistoricoColab
+
+FIRST_PMID = 30000001
+
+
+class Response:
+    def __init__(self, content, status_code=200):
+        self.content = content.encode() if isinstance(content, str) else content
+        self.status_code = status_code
+        self.headers = {}
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f'HTTP {self.status_code}')
+
+
+class FakeEutils:
+    """E-utilities stand-in: terms match PMIDs by name, epost/efetch go through a WebEnv"""
+
+    def __init__(self, terms):
+        self.terms = terms
+        self.calls = []
+        self.webenvs = {}
+        self.lock = threading.Lock()
+
+    def _pmids(self, term):
+        return list(dict.fromkeys(pmid for name, pmids in self.terms.items() if name in term for pmid in pmids))
+
+    def get(self, url, params=None, timeout=None):
+        endpoint = url.rsplit('/', 1)[1]
+        with self.lock:
+            self.calls.append((endpoint, dict(params)))
+        start, size = int(params.get('retstart', 0)), int(params.get('retmax', 20))
+        if endpoint == 'esearch.fcgi':
+            pmids = self._pmids(params['term'])
+            return Response(json.dumps({'esearchresult': {'count': str(len(pmids)),
+                                                          'idlist': pmids[start:start + size]}}))
+        ids = self.webenvs[params['WebEnv']][start:start + size]
+        articles = ''.join(
+            f'<PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article>'
+            f'<ArticleTitle>Title <i>{pmid}</i></ArticleTitle><Abstract>'
+            f'<AbstractText Label="BACKGROUND">Background of\n  {pmid}.</AbstractText>'
+            f'<AbstractText Label="RESULTS">Results of {pmid}.</AbstractText>'
+            f'</Abstract></Article></MedlineCitation></PubmedArticle>' for pmid in ids
+        )
+        return Response(f'<PubmedArticleSet>{articles}</PubmedArticleSet>')
+
+    def request(self, method, url, data=None, timeout=None):
+        with self.lock:
+            self.calls.append(('epost.fcgi', dict(data)))
+            webenv = f'MCID_{len(self.webenvs)}'
+            self.webenvs[webenv] = data['id'].split(',')
+        return Response(f'<ePostResult><QueryKey>1</QueryKey><WebEnv>{webenv}</WebEnv></ePostResult>')
+
+
+class NoWait:
+    def wait(self, url):
+        pass
+
+    def observe(self, url, status, headers):
+        pass
+
+
+def pmids(n, first=FIRST_PMID):
+    return [str(first + i) for i in range(n)]
+
+
+def test_search_pmids_pages_with_retstart_and_retmax():
+    http = FakeEutils({'leprosy': pmids(1234)})
+    eutils = PubMedEutils(http, NoWait())
+
+    found, total, _ = eutils.search_pmids('leprosy', page_size=500)
+
+    assert (found, total) == (pmids(1234), 1234)
+    assert [(params['retstart'], params['retmax']) for _, params in http.calls] == [(0, 500), (500, 500), (1000, 234)]
+    assert eutils.requests_made == 3
+
+
+def test_search_pmids_stops_at_the_esearch_limit(capsys):
+    http = FakeEutils({'leprosy': pmids(10500)})
+
+    found, total, _ = PubMedEutils(http, NoWait()).search_pmids('leprosy', page_size=5000)
+
+    assert (len(found), total) == (10000, 10500)
+    assert [(params['retstart'], params['retmax']) for _, params in http.calls] == [(0, 5000), (5000, 5000)]
+    assert 'harvested the first 10000' in capsys.readouterr().out
+
+
+def test_fetch_articles_posts_once_and_reads_batches_of_200():
+    http = FakeEutils({})
+    ids = pmids(450)
+
+    articles = PubMedEutils(http, NoWait()).fetch_articles(ids + ids[:10])
+
+    assert [endpoint for endpoint, _ in http.calls] == ['epost.fcgi'] + ['efetch.fcgi'] * 3
+    assert [(params['WebEnv'], params['retstart'], params['retmax']) for _, params in http.calls[1:]] == [
+        ('MCID_0', 0, 200), ('MCID_0', 200, 200), ('MCID_0', 400, 200)]
+    assert list(articles) == ids
+    assert articles[ids[0]] == (f'Title {ids[0]}', f'BACKGROUND: Background of {ids[0]}. RESULTS: Results of {ids[0]}.')
+
+
+def test_parse_articles_joins_abstract_sections_and_reads_books():
+    xml = (
+        '<PubmedArticleSet>'
+        '<PubmedArticle><MedlineCitation><PMID> 1 </PMID><Article><ArticleTitle>Plain</ArticleTitle>'
+        '<Abstract><AbstractText>Only one section.</AbstractText><AbstractText Label="EMPTY"/></Abstract>'
+        '</Article></MedlineCitation></PubmedArticle>'
+        '<PubmedArticle><MedlineCitation><PMID>2</PMID><Article><ArticleTitle>No abstract</ArticleTitle>'
+        '</Article></MedlineCitation></PubmedArticle>'
+        '<PubmedBookArticle><BookDocument><PMID>3</PMID><Book><BookTitle>Leprosy handbook</BookTitle></Book>'
+        '<Abstract><AbstractText Label="SUMMARY">A book.</AbstractText></Abstract></BookDocument></PubmedBookArticle>'
+        '</PubmedArticleSet>'
+    )
+
+    assert PubMedEutils.parse_articles(xml) == {
+        '1': ('Plain', 'Only one section.'),
+        '2': ('No abstract', ''),
+        '3': ('Leprosy handbook', 'SUMMARY: A book.'),
+    }
+
+
+def test_combined_search_reports_every_term(tmp_path, capsys):
+    scraper = WebScraperHistoricoColab(history_db=str(tmp_path / 'history.db'),
+                                       history_file=str(tmp_path / 'history.json'),
+                                       cache_file=None, google_cache_file=None)
+    http = FakeEutils({'leprosy app': pmids(3), 'hansen screening': pmids(2, FIRST_PMID + 2)})
+    scraper.pubmed = PubMedEutils(http, NoWait())
+
+    urls = list(scraper.iter_pubmed_urls(terms=['leprosy app', 'hansen screening']))
+
+    assert urls == [f'https://pubmed.ncbi.nlm.nih.gov/{pmid}/' for pmid in pmids(4)]
+    out = capsys.readouterr().out
+    assert re.search(r'2 terms combined \(OR\)\s+4 hits \|\s+4 harvested', out)
+    assert re.search(r'leprosy app\s+3 hits \| +count only', out)
+    assert re.search(r'hansen screening\s+2 hits \| +count only', out)
+    counts = [params for endpoint, params in http.calls if endpoint == 'esearch.fcgi' and params['retmax'] == 0]
+    assert len(counts) == 2
+    scraper.urls_processed.close()
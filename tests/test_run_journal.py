@@ -0,0 +1,63 @@
+import csv
+import glob
+import json
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import functions
+from web_scraper_historico import WebScraperHistoricoColab
+
+URLS = [f'https://journal{i}.example.org/article/{i}' for i in range(15)]
+
+
+def journaled_rows(journal_file):
+    with open(journal_file, encoding='utf-8') as f:
+        return sum(1 for line in f if json.loads(line)['type'] in ('done', 'failed'))
+
+
+def test_resume_after_interruption_fetches_nothing_twice(tmp_path, offline_run, monkeypatch):
+    fetched = []
+    lock = threading.Lock()
+
+    def extract(self, url, timeout=12):
+        with lock:
+            fetched.append(url)
+        return f'Title of {url}', f'Abstract of {url}. ' * 10, 'Sucesso'
+
+    monkeypatch.setattr(WebScraperHistoricoColab, 'extrair_resumo_completo', extract)
+
+    journal_file = str(tmp_path / 'journal.jsonl')
+    consumed = []
+    write = functions.CorpusStore.write
+
+    def interrupting_write(self, row):
+        consumed.append(row['URL'])
+        if len(consumed) == 6:
+            # Let the fetch engine run ahead of the consumer before stopping the run
+            deadline = time.time() + 5
+            while journaled_rows(journal_file) < len(URLS) and time.time() < deadline:
+                time.sleep(0.01)
+            raise KeyboardInterrupt
+        write(self, row)
+
+    monkeypatch.setattr(functions.CorpusStore, 'write', interrupting_write)
+    with pytest.raises(KeyboardInterrupt):
+        offline_run(URLS)
+    assert sorted(fetched) == sorted(URLS)
+
+    monkeypatch.setattr(functions.CorpusStore, 'write', write)
+    fetched.clear()
+    offline_run(URLS, resume=True)
+
+    assert fetched == []
+    [csv_file] = glob.glob(str(tmp_path / 'leprosy_incremental_*.csv'))
+    with open(csv_file, newline='', encoding='utf-8') as f:
+        assert sorted(row['URL'] for row in csv.DictReader(f)) == sorted(URLS)
+    conn = sqlite3.connect(str(tmp_path / 'corpus.db'))
+    try:
+        assert sorted(url for (url,) in conn.execute('SELECT url FROM documents')) == sorted(URLS)
+    finally:
+        conn.close()
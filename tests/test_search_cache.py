@@ -0,0 +1,89 @@
+import json
+
+import web_scraper_historico
+from search_cache import SearchResultCache
+from web_scraper_historico import WebScraperHistoricoColab
+
+NOW = 1700000000.0
+DAY = 24 * 3600
+
+
+def results(start, count):
+    return [f'https://example.org/result/{n}' for n in range(start, start + count)]
+
+
+def test_cursor_resumes_past_the_results_already_read(tmp_path):
+    cache = SearchResultCache(str(tmp_path / 'google.db'), ttl=7 * DAY, max_depth=100)
+    query = 'leprosy mobile app'
+
+    assert cache.next_fetch(query, 15, now=NOW) == (0, 20)
+    cache.record(query, 0, results(0, 20), 20, 20, True, now=NOW)
+
+    assert cache.next_fetch(query, 15, now=NOW + DAY) == (20, 20)
+    cache.record(query, 20, results(20, 20), 20, 20, True, now=NOW + DAY)
+    assert cache.next_fetch(query, 15, now=NOW + DAY) == (40, 20)
+    assert cache.cached_urls(query) == results(0, 40)
+    cache.close()
+
+
+def test_interrupted_search_resumes_where_it_stopped(tmp_path):
+    cache = SearchResultCache(str(tmp_path / 'google.db'))
+    query = 'hansen disease screening'
+
+    # Duplicates returned by the engine still move the cursor
+    cache.record(query, 0, results(0, 5), 7, 20, False, now=NOW)
+
+    assert cache.next_fetch(query, 20, now=NOW + 60) == (7, 20)
+
+
+def test_exhausted_or_deep_queries_are_served_from_cache(tmp_path):
+    cache = SearchResultCache(str(tmp_path / 'google.db'), ttl=7 * DAY, max_depth=30)
+    cache.record('short', 0, results(0, 4), 4, 20, True, now=NOW)
+    cache.record('deep', 0, results(0, 30), 30, 30, True, now=NOW)
+
+    assert cache.next_fetch('short', 20, now=NOW + DAY) is None
+    assert cache.next_fetch('deep', 20, now=NOW + DAY) is None
+    assert cache.next_fetch('new', 50, now=NOW + DAY) == (0, 30)
+    assert cache.stats['cached_queries'] == 2
+
+
+def test_expired_queries_fetch_the_first_pages_again(tmp_path):
+    cache = SearchResultCache(str(tmp_path / 'google.db'), ttl=7 * DAY)
+    query = 'leprosy telemedicine'
+    cache.record(query, 0, results(0, 3), 3, 20, True, now=NOW)
+    cache.record('deep', 0, results(0, 40), 40, 40, True, now=NOW)
+
+    assert cache.next_fetch(query, 20, now=NOW + 7 * DAY - 1) is None
+    assert cache.next_fetch(query, 20, now=NOW + 7 * DAY) == (0, 20)
+    assert cache.age(query, now=NOW + 7 * DAY) == 7 * DAY
+
+    # A refreshed head page restarts the TTL but keeps the cursor of the deeper pages
+    cache.record('deep', 0, results(0, 20), 20, 20, True, now=NOW + 7 * DAY)
+    assert cache.next_fetch('deep', 20, now=NOW + 7 * DAY + 60) == (40, 20)
+
+
+def test_google_search_reads_only_new_pages_on_the_next_run(tmp_path, monkeypatch):
+    calls = []
+
+    def search(query, num_results=10, start_num=0, **kwargs):
+        calls.append((start_num, num_results))
+        yield from results(start_num, num_results)
+
+    monkeypatch.setattr(web_scraper_historico, 'search', search)
+    queries_file = tmp_path / 'queries.json'
+    queries_file.write_text(json.dumps({'google': ['leprosy app'], 'pubmed': []}))
+
+    def run():
+        scraper = WebScraperHistoricoColab(history_db=str(tmp_path / 'history.db'),
+                                           history_file=str(tmp_path / 'history.json'), cache_file=None,
+                                           google_cache_file=str(tmp_path / 'google.db'),
+                                           queries_file=str(queries_file), domain_rates={'google.com': 1000.0})
+        try:
+            return list(scraper.iter_google_urls(max_urls=20))
+        finally:
+            scraper.google_cache.close()
+            scraper.urls_processed.close()
+
+    assert run() == results(0, 20)
+    assert run() == results(0, 40)
+    assert calls == [(0, 20), (20, 20)]
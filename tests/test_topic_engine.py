@@ -0,0 +1,55 @@
+from topic_engine import DEFAULT_TOPICS, default_matcher
+
+# Abstract-like sentences written with the baseline topic names
+SAMPLE = [
+    'We developed a mobile application to support the diagnosis of leprosy by community health workers.',
+    'Machine learning and deep learning models were trained on skin lesion photographs.',
+    'A convolutional neural network reached 90% accuracy; neural networks outperformed dermatologists.',
+    'Telemedicine services extend specialist care to endemic regions.',
+    'Digital health interventions, including mHealth tools, improved treatment adherence.',
+    'Computer vision methods for the classification of Hansen disease lesions.',
+    'Artificial intelligence can support early diagnosis and screening campaigns.',
+    'Mobile apps on a smartphone allowed offline data collection during screening.',
+    'Leprosy remains a public health problem in Brazil and India.',
+    'Diagnosis was confirmed by slit-skin smear in most patients.',
+    'Participants used smartphones to send images through a telemedicine platform.',
+    'An mhealth mobile app for contact screening and a deep learning classifier.',
+    'No relevant terms in this abstract about multidrug therapy.',
+    '',
+]
+# Wording only the synonyms (or overlapping terms) pick up
+SYNONYM_SAMPLE = [
+    'A smartphone app for leprosy screening in primary care.',
+    'Teledermatology and telehealth consultations; e-health records.',
+    'Image classification on a mobile phone with digital-health support.',
+    'Diagnostic accuracy of a smartphone application.',
+]
+
+
+def substring_counts(abstracts):
+    """The loop analyze_topics_automatic used before the topic engine"""
+    counts = {topic: 0 for topic in DEFAULT_TOPICS}
+    for abstract in abstracts:
+        if abstract:
+            abs_lower = abstract.lower()
+            for topic in counts:
+                if topic in abs_lower:
+                    counts[topic] += 1
+    return counts
+
+
+def test_baseline_topics_count_the_same_documents_as_the_substring_loop():
+    assert default_matcher().count_matrix(SAMPLE).document_frequency().to_dict() == substring_counts(SAMPLE)
+
+
+def test_synonyms_never_take_documents_away_from_a_topic():
+    matcher = default_matcher()
+    for abstract in SAMPLE + SYNONYM_SAMPLE:
+        found = {matcher.topics[index] for index in matcher.find(abstract)}
+        assert set(topic for topic, count in substring_counts([abstract]).items() if count) <= found, abstract
+
+
+def test_overlapping_terms_count_for_every_topic():
+    matcher = default_matcher()
+    found = [matcher.topics[index] for index in matcher.find('A smartphone app for leprosy screening')]
+    assert found == ['smartphone', 'mobile app', 'screening']
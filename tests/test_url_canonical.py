@@ -0,0 +1,93 @@
+import pytest
+
+import url_canonical
+from history_store import HistoryStore
+from url_canonical import URLCanonicalizer, canonical_key
+
+
+@pytest.mark.parametrize('url, key', [
+    ('https://doi.org/10.1371/journal.pntd.0001234', 'doi:10.1371/journal.pntd.0001234'),
+    ('http://dx.doi.org/10.1371%2FJournal.PNTD.0001234/', 'doi:10.1371/journal.pntd.0001234'),
+    ('https://onlinelibrary.wiley.com/doi/full/10.1111/tmi.13456', 'doi:10.1111/tmi.13456'),
+    ('https://onlinelibrary.wiley.com/doi/epdf/10.1111/tmi.13456', 'doi:10.1111/tmi.13456'),
+    ('https://link.springer.com/content/pdf/10.1007/s10096-020-03928-1.pdf', 'doi:10.1007/s10096-020-03928-1'),
+    ('https://journals.plos.org/plosntds/article?id=10.1371/journal.pntd.0001234',
+     'doi:10.1371/journal.pntd.0001234'),
+    ('https://www.frontiersin.org/articles/10.3389/fmed.2021.123456/full', 'doi:10.3389/fmed.2021.123456'),
+])
+def test_doi_urls_reduce_to_the_doi(url, key):
+    assert canonical_key(url) == key
+
+
+def test_publisher_url_without_doi_falls_back_to_the_generic_key():
+    assert canonical_key('https://link.springer.com/journal/10096/') == 'link.springer.com/journal/10096'
+
+
+@pytest.mark.parametrize('url, key', [
+    ('https://pubmed.ncbi.nlm.nih.gov/34567890/', 'pmid:34567890'),
+    ('http://pubmed.ncbi.nlm.nih.gov/34567890', 'pmid:34567890'),
+    ('https://www.ncbi.nlm.nih.gov/pubmed/34567890', 'pmid:34567890'),
+    ('https://www.ncbi.nlm.nih.gov/pmc/articles/pmc8123456/', 'pmc:PMC8123456'),
+    ('https://pubmed.ncbi.nlm.nih.gov/?term=leprosy', 'pubmed.ncbi.nlm.nih.gov/?term=leprosy'),
+])
+def test_pubmed_and_pmc_urls_reduce_to_their_ids(url, key):
+    assert canonical_key(url) == key
+
+
+def test_tracking_parameters_are_dropped_and_the_rest_sorted():
+    url = 'https://www.who.int/news/item/leprosy/?utm_source=x&b=2&gclid=abc&a=1&UTM_Campaign=y&fbclid=z#top'
+    assert canonical_key(url) == 'who.int/news/item/leprosy?a=1&b=2'
+
+
+def test_scheme_www_default_port_fragment_and_trailing_slash_are_ignored():
+    variants = ['http://www.cdc.gov/leprosy/', 'https://cdc.gov/leprosy', 'https://cdc.gov:443/leprosy#about']
+    assert {canonical_key(url) for url in variants} == {'cdc.gov/leprosy'}
+    assert canonical_key('http://cdc.gov:8080/leprosy') == 'cdc.gov:8080/leprosy'
+
+
+def test_google_redirect_is_unwrapped():
+    target = 'https%3A%2F%2Fpubmed.ncbi.nlm.nih.gov%2F34567890%2F'
+    assert canonical_key(f'https://www.google.com/url?q={target}&sa=U&ved=abc&usg=def') == 'pmid:34567890'
+    assert canonical_key('https://www.google.com/url?url=https://www.who.int/leprosy/?utm_medium=x') == \
+        'who.int/leprosy'
+    assert canonical_key('https://www.google.com/search?q=leprosy') == 'google.com/search?q=leprosy'
+
+
+def test_custom_rules_match_subdomains():
+    canonicalizer = URLCanonicalizer({'example.org': lambda parts: 'ex:' + parts.path.strip('/').lower()})
+    assert canonicalizer.key('https://journals.example.org/Article/7/') == 'ex:article/7'
+
+
+def test_version_is_explicit(monkeypatch):
+    rule = lambda parts: None  # noqa: E731
+    default = URLCanonicalizer().version
+    custom = URLCanonicalizer({'example.org': rule}).version
+
+    assert URLCanonicalizer({'example.org': lambda parts: 'other'}).version == custom
+    assert URLCanonicalizer({'example.org': rule}, rules_version=2).version != custom
+    assert URLCanonicalizer({'example.net': rule}).version != custom
+    monkeypatch.setattr(url_canonical, 'RULES_VERSION', url_canonical.RULES_VERSION + 1)
+    assert URLCanonicalizer().version != default
+
+
+def test_history_is_rekeyed_when_the_rules_version_changes(tmp_path):
+    db_file = str(tmp_path / 'history.db')
+    store = HistoryStore(db_file)
+    store.add('https://example.org/Article/7')
+    store.flush()
+    store.close()
+
+    rule = {'example.org': lambda parts: 'ex:' + parts.path.lower()}
+    store = HistoryStore(db_file, canonicalizer=URLCanonicalizer(rule))
+    assert 'https://example.org/article/7' in store
+    store.close()
+
+    # An edited rule keeps the domain: only the explicit version tells the store
+    edited = {'example.org': lambda parts: 'ex:' + parts.path}
+    store = HistoryStore(db_file, canonicalizer=URLCanonicalizer(edited))
+    assert 'https://example.org/Article/7' not in store
+    store.close()
+    store = HistoryStore(db_file, canonicalizer=URLCanonicalizer(edited, rules_version=2))
+    assert 'https://example.org/Article/7' in store
+    assert 'https://example.org/article/7' not in store
+    store.close()
@@ -0,0 +1,166 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Topic → terms that count as a mention (matched case-insensitively, as whole
+# words; spaces also match hyphens and a trailing plural "s" is accepted).
+# Terms may overlap: "smartphone app" counts for both mobile app and smartphone.
+DEFAULT_TOPICS = {
+    'mobile app': ['mobile app', 'mobile application', 'smartphone app', 'smartphone application'],
+    'artificial intelligence': ['artificial intelligence'],
+    'machine learning': ['machine learning'],
+    'diagnosis': ['diagnosis', 'diagnoses', 'diagnostic'],
+    'screening': ['screening'],
+    'digital health': ['digital health', 'e-health', 'ehealth'],
+    'mhealth': ['mhealth', 'mobile health'],
+    'smartphone': ['smartphone', 'mobile phone', 'cell phone'],
+    'telemedicine': ['telemedicine', 'telehealth', 'teledermatology'],
+    'neural network': ['neural network'],
+    'computer vision': ['computer vision', 'image recognition', 'image classification'],
+    'deep learning': ['deep learning'],
+}
+
+_SEPARATOR = re.compile(r'[\s\-]+')
+
+
+def _normalize(term):
+    return _SEPARATOR.sub(' ', term.strip().casefold())
+
+
+def _trie_pattern(node):
+    """Regex for the terms below a trie node, longest alternatives preferred"""
+    branches = [(r'[\s\-]+' if char == ' ' else re.escape(char)) + _trie_pattern(child)
+                for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # The node ends a term: the longer terms below it are optional
+        return f'(?:{pattern})?'
+    return pattern
+
+
+def _term_end(term, i):
+    """Whether a term ending at term[i] ends on a word boundary of term (plural "s" allowed)"""
+    rest = term[i + 1:i + 3]
+    return rest in ('', ' ', 's') or rest == 's ' or rest[0] == ' '
+
+
+class TopicMatcher:
+    """Dictionary of topics compiled once into a single regular expression.
+
+    The terms are merged into a character trie before being turned into a
+    regex, so at each position the engine follows one branch instead of
+    trying every term: a scan costs time proportional to the text, not to
+    the number of terms. Each text is scanned once, whatever the number of
+    topics.
+
+    Matches overlap, as if every topic were searched on its own: the regex
+    is a lookahead that finds the longest term at each word start, and the
+    shorter terms it begins with are read off the trie along that match.
+    """
+
+    def __init__(self, topics=None):
+        topics = DEFAULT_TOPICS if topics is None else topics
+        self.topics = list(topics)
+        trie = {}
+        for index, topic in enumerate(self.topics):
+            for term in [topic, *topics[topic]]:
+                term = _normalize(term)
+                if not term:
+                    continue
+                node = trie
+                for char in term:
+                    node = node.setdefault(char, {})
+                # A term listed under two topics counts for the first one
+                node.setdefault('', index)
+        self._trie = trie
+        self.pattern = re.compile(r'(?<!\w)(?=(' + _trie_pattern(trie) + r's?)(?!\w))',
+                                  re.IGNORECASE) if trie else None
+
+    def _topics_at(self, match):
+        """Topics of the terms that begin match (the longest term found at a position)"""
+        term = _normalize(match)
+        found = []
+        node = self._trie
+        for i, char in enumerate(term):
+            node = node.get(char)
+            if node is None:
+                break
+            if '' in node and node[''] not in found and _term_end(term, i):
+                found.append(node[''])
+        return found
+
+    def find(self, text):
+        """Topic indexes of every mention in text, in order (one per topic and position)"""
+        if not text or self.pattern is None:
+            return []
+        return [index for match in self.pattern.findall(text) for index in self._topics_at(match)]
+
+    def count_matrix(self, texts, index=None):
+        """Sparse document × topic mention counts for an iterable of texts"""
+        rows, cols = [], []
+        num_texts = 0
+        for row, text in enumerate(texts):
+            num_texts += 1
+            found = self.find(text) if isinstance(text, str) else []
+            rows.extend([row] * len(found))
+            cols.extend(found)
+        return TopicMatrix(np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64), self.topics,
+                           index=pd.RangeIndex(num_texts) if index is None else index)
+
+
+class TopicMatrix:
+    """Document × topic counts in coordinate form (only non-zero cells are stored)"""
+
+    def __init__(self, rows, cols, topics, index):
+        self.topics = list(topics)
+        self.index = pd.Index(index)
+        num_topics = max(len(self.topics), 1)
+        # Repeated (document, topic) pairs are merged into counts
+        cells, counts = np.unique(rows * num_topics + cols, return_counts=True)
+        self.rows = cells // num_topics
+        self.cols = cells % num_topics
+        self.counts = counts
+
+    @property
+    def shape(self):
+        return len(self.index), len(self.topics)
+
+    def document_frequency(self):
+        """Number of documents mentioning each topic"""
+        return pd.Series(np.bincount(self.cols, minlength=len(self.topics)), index=self.topics)
+
+    def mentions(self):
+        """Total number of mentions of each topic"""
+        return pd.Series(np.bincount(self.cols, weights=self.counts, minlength=len(self.topics)).astype(np.int64),
+                         index=self.topics)
+
+    def by_group(self, labels):
+        """Documents mentioning each topic per group (labels aligned with the documents)"""
+        codes, groups = pd.factorize(pd.Series(list(labels)), use_na_sentinel=False)
+        cells = np.bincount(codes[self.rows] * len(self.topics) + self.cols,
+                            minlength=len(groups) * len(self.topics))
+        return pd.DataFrame(cells.reshape(len(groups), len(self.topics)), index=groups, columns=self.topics)
+
+    def to_frame(self):
+        """Long format (document, topic, count), one row per non-zero cell"""
+        return pd.DataFrame({
+            'document': self.index[self.rows],
+            'topic': pd.Categorical.from_codes(self.cols, categories=self.topics),
+            'count': self.counts,
+        })
+
+    def to_dense(self):
+        """Full document × topic DataFrame (only for small corpora)"""
+        dense = np.zeros(self.shape, dtype=np.int64)
+        dense[self.rows, self.cols] = self.counts
+        return pd.DataFrame(dense, index=self.index, columns=self.topics)
+
+
+@lru_cache(maxsize=1)
+def default_matcher():
+    """TopicMatcher for DEFAULT_TOPICS, compiled on first use"""
+    return TopicMatcher()
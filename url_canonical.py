@@ -0,0 +1,162 @@
+import re
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+
+from politeness import domain_of
+
+DOI_RE = re.compile(r'(10\.\d{4,9}/[^\s?#&]+)', re.IGNORECASE)
+
+# Query parameters that only track the click and never change the page
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'dclid', 'mc_cid', 'mc_eid', '_ga', '_gl', 'ved', 'usg', 'ei'}
+TRACKING_PREFIXES = ('utm_',)
+
+# Trailing path parts publishers add to the same DOI (full text, PDF, ...)
+DOI_VIEW_SUFFIXES = ('/full', '/abstract', '/epdf', '/pdf', '/fulltext', '/html', '.pdf', '.html')
+
+
+def _clean_doi(doi):
+    doi = unquote(doi).lower().rstrip('/.')
+    changed = True
+    while changed:
+        changed = False
+        for suffix in DOI_VIEW_SUFFIXES:
+            if doi.endswith(suffix):
+                doi = doi[:-len(suffix)]
+                changed = True
+    return 'doi:' + doi
+
+
+def rule_doi_resolver(parts):
+    """doi.org/10.x/y → doi:10.x/y"""
+    match = DOI_RE.search(unquote(parts.path))
+    return _clean_doi(match.group(1)) if match else None
+
+
+def rule_doi_in_url(parts):
+    """Publisher landing pages that carry the DOI in the path or query → doi:..."""
+    match = DOI_RE.search(unquote(parts.path)) or DOI_RE.search(unquote(parts.query))
+    return _clean_doi(match.group(1)) if match else None
+
+
+def rule_pubmed(parts):
+    """PubMed and PMC article pages → pmid:N / pmc:PMCN"""
+    match = re.match(r'^/(?:pubmed/)?(\d+)/?$', parts.path)
+    if match:
+        return 'pmid:' + match.group(1)
+    match = re.match(r'^/pmc/articles/(PMC\d+)/?$', parts.path, re.IGNORECASE)
+    if match:
+        return 'pmc:' + match.group(1).upper()
+    return None
+
+
+def rule_google_redirect(parts):
+    """google.com/url?q=<target> → key of the target"""
+    if parts.path == '/url':
+        query = dict(parse_qsl(parts.query))
+        target = query.get('q') or query.get('url')
+        if target and target.startswith(('http://', 'https://')):
+            return canonical_key(target)
+    return None
+
+
+# Bump whenever a default rule or the generic normalization changes: stored keys are rebuilt
+RULES_VERSION = 2
+
+# Rules return a canonical key, or None to fall back to the generic normalization
+DEFAULT_DOMAIN_RULES = {
+    'doi.org': rule_doi_resolver,
+    'dx.doi.org': rule_doi_resolver,
+    'onlinelibrary.wiley.com': rule_doi_in_url,
+    'link.springer.com': rule_doi_in_url,
+    'journals.plos.org': rule_doi_in_url,
+    'tandfonline.com': rule_doi_in_url,
+    'journals.sagepub.com': rule_doi_in_url,
+    'frontiersin.org': rule_doi_in_url,
+    'pubmed.ncbi.nlm.nih.gov': rule_pubmed,
+    'ncbi.nlm.nih.gov': rule_pubmed,
+    'google.com': rule_google_redirect,
+}
+
+
+class URLCanonicalizer:
+    """Map URL variants of the same document to one canonical key.
+
+    The generic normalization ignores the scheme (http/https), 'www.',
+    default ports, fragments, tracking parameters (utm_*, gclid, ...),
+    query parameter order and trailing slashes. Per-domain rules (parent
+    domains match subdomains) can map URLs to identifiers such as DOIs or
+    PMIDs so that resolver and publisher URLs collapse together.
+
+    Rule bodies cannot be compared, so the rule set is versioned explicitly:
+    RULES_VERSION covers the default rules and rules_version the domain_rules
+    passed in (bump it when one of them changes).
+    """
+
+    def __init__(self, domain_rules=None, rules_version=None):
+        self.domain_rules = dict(DEFAULT_DOMAIN_RULES)
+        self.domain_rules.update(domain_rules or {})
+        self.custom_domains = sorted(domain_rules or {})
+        self.rules_version = rules_version
+
+    @property
+    def version(self):
+        """Identifies the rule set, so stored keys are rebuilt when it changes"""
+        version = f'canonical_v{RULES_VERSION}'
+        if self.custom_domains:
+            version += f":{self.rules_version or 0}:{','.join(self.custom_domains)}"
+        return version
+
+    def rule_for(self, domain):
+        """Rule configured for a domain (parent domains match subdomains)"""
+        parts = domain.split('.')
+        for i in range(len(parts)):
+            rule = self.domain_rules.get('.'.join(parts[i:]))
+            if rule is not None:
+                return rule
+        return None
+
+    def key(self, url):
+        """Canonical key of url (not necessarily a fetchable URL)"""
+        url = url.strip()
+        try:
+            parts = urlsplit(url)
+            domain = domain_of(url)
+        except ValueError:
+            return url
+
+        if not domain:
+            return url
+
+        rule = self.rule_for(domain)
+        if rule:
+            try:
+                key = rule(parts)
+            except Exception:
+                key = None
+            if key:
+                return key
+
+        try:
+            port = parts.port if parts.port not in (80, 443) else None
+        except ValueError:
+            port = None
+        host = f'{domain}:{port}' if port else domain
+
+        path = parts.path or '/'
+        if len(path) > 1:
+            path = path.rstrip('/') or '/'
+
+        params = [
+            (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if name.lower() not in TRACKING_PARAMS and not name.lower().startswith(TRACKING_PREFIXES)
+        ]
+        query = urlencode(sorted(params))
+
+        return host + path + ('?' + query if query else '')
+
+
+_default = URLCanonicalizer()
+
+
+def canonical_key(url):
+    """Canonical key using the default rules"""
+    return _default.key(url)
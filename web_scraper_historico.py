@@ -1,17 +1,51 @@
-import json
 import os
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from googlesearch import search
 import time
 import random
-import requests
 from bs4 import BeautifulSoup
+from history_store import HistoryStore
+from http_session import SessionPool, check_html_content_type, read_capped
+from politeness import DomainScheduler
+from pubmed_eutils import EUTILS_BASE, PubMedEutils, pmid_from_url
+from response_cache import ResponseCache
+from fast_extract import extract_fast
+from url_canonical import URLCanonicalizer
+from retry_policy import CircuitBreaker, RetryPolicy, classify_error
+from search_cache import SearchResultCache, load_queries
+
+GOOGLE_SEARCH_URL = 'https://www.google.com/search'
 
 class WebScraperHistoricoColab:
-    def __init__(self, history_file='historico_leprosy_colab.json'):
+    def __init__(self, history_db='historico_leprosy_colab.db', history_file='historico_leprosy_colab.json',
+                 pool_maxsize=10, pool_connections=50, default_rate=1.0, domain_rates=None,
+                 eutils_base=EUTILS_BASE, ncbi_api_key=None,
+                 cache_file='http_cache_leprosy.db', cache_max_bytes=256 * 1024 * 1024,
+                 max_download_bytes=1024 * 1024, canonical_rules=None, canonical_rules_version=None,
+                 history_bloom=True, max_attempts=3, retry_base_delay=1.0, breaker_threshold=5, breaker_reset=60.0,
+                 queries_file=None, google_cache_file='google_cache_leprosy.db', google_cache_ttl=7 * 24 * 3600,
+                 google_max_depth=100):
+        self.history_db = history_db
         self.history_file = history_file
+        self.canonicalizer = URLCanonicalizer(canonical_rules, canonical_rules_version)
+        self.history_bloom = history_bloom
         self.urls_processed = self.load_history()
         self.data_processed = []
+        self.http = SessionPool(pool_maxsize=pool_maxsize, pool_connections=pool_connections)
+        self.scheduler = DomainScheduler(default_rate=default_rate, domain_rates=domain_rates)
+        self.pubmed = PubMedEutils(self.http, self.scheduler, base_url=eutils_base, api_key=ncbi_api_key)
+        self.cache = ResponseCache(cache_file, max_bytes=cache_max_bytes) if cache_file else None
+        self.max_download_bytes = max_download_bytes
+        self.retry_policy = RetryPolicy(max_attempts=max_attempts, base_delay=retry_base_delay)
+        self.breaker = CircuitBreaker(failure_threshold=breaker_threshold, reset_timeout=breaker_reset)
+        # Error class of the last failure per URL, consumed when the result is recorded
+        self.failure_classes = {}
+        # Seconds spent in HTTP requests per thread (see take_request_time)
+        self._request_time = threading.local()
+        self.queries = load_queries(queries_file)
+        self.google_cache = SearchResultCache(google_cache_file, ttl=google_cache_ttl,
+                                              max_depth=google_max_depth) if google_cache_file else None
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -27,31 +61,16 @@ class WebScraperHistoricoColab:
         print()
 
     def load_history(self):
-        """Load history of already processed URLs"""
-        if os.path.exists(self.history_file):
-            try:
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    history = json.load(f)
-                    return set(history.get('urls_processadas', []))
-            except Exception as e:
-                print(f"⚠️ Error loading history: {e}")
-                return set()
-        return set()
+        """Open the history store, migrating the legacy JSON file on first use"""
+        bloom_file = os.path.splitext(self.history_db)[0] + '.bloom' if self.history_bloom else None
+        return HistoryStore(self.history_db, legacy_json=self.history_file, canonicalizer=self.canonicalizer,
+                            bloom_file=bloom_file)
 
     def save_history(self):
-        """Save history of processed URLs"""
+        """Persist URLs processed during this run"""
         try:
-            history = {
-                'urls_processadas': list(self.urls_processed),
-                'last_update': datetime.now().isoformat(),
-                'total_urls': len(self.urls_processed),
-                'version': 'Colab_History_v2.0'
-            }
-
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(history, f, ensure_ascii=False, indent=2)
-
-            print(f"💾 History updated: {len(self.urls_processed)} URLs")
+            inserted = self.urls_processed.flush()
+            print(f"💾 History updated: +{inserted} URLs ({len(self.urls_processed)} total)")
         except Exception as e:
             print(f"⚠️ Error saving history: {e}")
 
@@ -59,12 +78,18 @@ class WebScraperHistoricoColab:
         """Filter only new URLs not processed before"""
         new_urls = []
         repeated_urls = []
+        known_urls = self.urls_processed.known_urls(found_urls)
+        seen_keys = set()
 
         for url in found_urls:
-            if url not in self.urls_processed:
-                new_urls.append(url)
-            else:
+            key = self.canonicalizer.key(url)
+            if url in known_urls or key in seen_keys or self.urls_processed.is_deferred(url):
+                # Variants of a document already in history or earlier in this list,
+                # or failures waiting for their retry time
                 repeated_urls.append(url)
+            else:
+                seen_keys.add(key)
+                new_urls.append(url)
 
         print(f"🔍 ANTI-REPETITION FILTER:")
         print(f"   📊 URLs found in search: {len(found_urls)}")
@@ -85,108 +110,157 @@ class WebScraperHistoricoColab:
 
     def buscar_google_inteligente_incremental(self, max_urls=100):
         """Google search considering history"""
+        return self.filter_new_urls(list(self.iter_google_urls(max_urls)))
+
+    def iter_google_urls(self, max_urls=100):
+        """Yield Google result URLs as they are found (not filtered by history).
+
+        Cached results are yielded first; Google is only asked for the pages
+        past each query's cursor, or for the first pages once the cache expires.
+        """
         print("🔍 GOOGLE INCREMENTAL SEARCH")
         print("=" * 40)
 
-        # Expanded queries for deeper search
-        queries = [
-            '("mobile app" AND "Leprosy") after:2016',
-            '("web application" AND "Hansen\'s Disease") after:2016',
-            '("smartphone" AND "Leprosy diagnosis") after:2016',
-            '("mHealth" AND "Leprosy") after:2016',
-            '("digital health" AND "Hansen\'s Disease") after:2016',
-            '("AI" AND "Leprosy detection") after:2016',
-            '("machine learning" AND "Leprosy") after:2016',
-            '("telemedicine" AND "Hansen\'s Disease") after:2016',
-            '("computer vision" AND "Leprosy lesion") after:2016',
-            '("neural network" AND "Hansen\'s Disease") after:2016'
-        ]
+        queries = self.queries.get('google', [])
+        if not queries:
+            print("   ⚠️ No Google queries configured")
+            return
 
         found_urls = set()
+        max_per_query = max(max_urls // len(queries), 1)
 
         for i, query in enumerate(queries, 1):
             print(f"\n🔍 Query {i}/{len(queries)}: {query}")
 
+            cached = self.google_cache.cached_urls(query) if self.google_cache else []
+            for url in cached:
+                if url not in found_urls:
+                    found_urls.add(url)
+                    yield url
+
+            if self.google_cache:
+                fetch = self.google_cache.next_fetch(query, max_per_query)
+                if fetch is None:
+                    age = self.google_cache.age(query) / 3600
+                    print(f"   🗂️ {len(cached)} cached URLs (fetched {age:.0f}h ago, no new pages to read)")
+                    continue
+                start, count = fetch
+            else:
+                start, count = 0, max_per_query
+
+            # Google pacing comes from its per-host bucket
+            pause = self.scheduler.reserve(GOOGLE_SEARCH_URL)
+            if pause > 0:
+                print(f"   ⏳ Pausing {pause:.1f}s...")
+                time.sleep(pause)
+
+            urls_this_query = []
+            consumed = 0
+            complete = False
             try:
-                urls_this_query = 0
-                max_per_query = max_urls // len(queries)
+                if cached:
+                    print(f"   🗂️ {len(cached)} cached URLs, reading results {start + 1}-{start + count}")
 
-                for url in search(query, num_results=max_per_query, sleep_interval=random.uniform(3, 6)):
-                    if url not in found_urls:
+                for url in search(query, num_results=count, start_num=start, sleep_interval=random.uniform(3, 6)):
+                    consumed += 1
+                    if url and url not in found_urls:
                         found_urls.add(url)
-                        urls_this_query += 1
+                        urls_this_query.append(url)
+                        yield url
 
-                    if urls_this_query % 5 == 0:
-                        print(f"   📊 {urls_this_query} URLs from this query")
+                        if len(urls_this_query) % 5 == 0:
+                            print(f"   📊 {len(urls_this_query)} URLs from this query")
 
-                print(f"   ✅ {urls_this_query} URLs found")
+                complete = True
+                print(f"   ✅ {len(urls_this_query)} URLs found")
 
             except Exception as e:
                 print(f"   ⚠️ Error: {e}")
                 if "429" in str(e):
                     print("   ⏳ Google blocked - waiting...")
-                    time.sleep(30)
-
-            # Pause between queries
-            if i < len(queries):
-                pause = random.uniform(8, 15)
-                print(f"   ⏳ Pausing {pause:.1f}s...")
-                time.sleep(pause)
+                    self.scheduler.penalize(GOOGLE_SEARCH_URL)
+            finally:
+                # Also runs when the consumer stops early, so the next run resumes from here
+                if self.google_cache:
+                    try:
+                        self.google_cache.record(query, start, urls_this_query, consumed, count, complete)
+                    except Exception as e:
+                        print(f"   ⚠️ Error caching results: {e}")
+
+    def buscar_pubmed_expandido(self, terms=None, combine_terms=True, max_results=None, max_workers=3):
+        """Expanded PubMed search.
+
+        With combine_terms=True all terms run as a single OR query (plus a
+        count-only query per term for the report); otherwise each term is
+        searched concurrently (eutils pacing still applies). Results are
+        paginated instead of truncated.
+        """
+        unique_urls = list(self.iter_pubmed_urls(terms, combine_terms, max_results, max_workers))
+        new_urls = self.filter_new_urls(unique_urls)
 
-        # Filter new URLs
-        new_urls = self.filter_new_urls(list(found_urls))
+        print(f"   ✅ PubMed: {len(new_urls)} new URLs")
         return new_urls
 
-    def buscar_pubmed_expandido(self):
-        """Expanded PubMed search"""
+    def iter_pubmed_urls(self, terms=None, combine_terms=True, max_results=None, max_workers=3):
+        """Yield PubMed article URLs as each query finishes (not filtered by history).
+
+        With combine_terms the PMIDs come from one OR query; each term still
+        gets a count-only esearch (retmax=0) so its hits and time are reported.
+        """
         print("\n🔬 PUBMED EXPANDED SEARCH")
         print("=" * 35)
 
-        terms = [
-            "leprosy mobile app",
-            "hansen disease mobile application",
-            "leprosy smartphone",
-            "hansen disease digital health",
-            "leprosy mHealth",
-            "leprosy artificial intelligence",
-            "hansen disease machine learning",
-            "leprosy computer vision",
-            "hansen disease telemedicine"
-        ]
+        terms = terms or self.queries.get('pubmed', [])
+        if not terms:
+            print("   ⚠️ No PubMed terms configured")
+            return
+        date_filter = '("2016"[Date - Publication] : "3000"[Date - Publication])'
 
-        pubmed_urls = []
+        if combine_terms:
+            combined = ' OR '.join(f'({term})' for term in terms)
+            queries = {f'{len(terms)} terms combined (OR)': f'({combined}) AND {date_filter}'}
+        else:
+            queries = {term: f'{term} AND {date_filter}' for term in terms}
 
-        for term in terms:
+        def run_query(label):
             try:
-                url_api = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
-                params = {
-                    'db': 'pubmed',
-                    'term': f'{term} AND ("2016"[Date - Publication] : "3000"[Date - Publication])',
-                    'retmax': 25,
-                    'retmode': 'json'
-                }
-
-                response = requests.get(url_api, params=params, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    if 'esearchresult' in data and 'idlist' in data['esearchresult']:
-                        for pmid in data['esearchresult']['idlist']:
-                            article_url = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
-                            pubmed_urls.append(article_url)
-
-                time.sleep(1)
+                return label, self.pubmed.search_pmids(queries[label], max_results=max_results)
+            except Exception as e:
+                print(f"   ⚠️ Error searching '{label}': {e}")
+                return label, ([], 0, 0.0)
 
+        def count_term(term):
+            started = time.perf_counter()
+            try:
+                _, total = self.pubmed.esearch(f'{term} AND {date_filter}', retmax=0)
             except Exception as e:
-                print(f"   ⚠️ Error searching '{term}': {e}")
+                print(f"   ⚠️ Error counting '{term}': {e}")
+                total = 0
+            return term, ([], total, time.perf_counter() - started)
+
+        pmids = set()
+        counts = terms if combine_terms else []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries) + len(counts))) as executor:
+            futures = [executor.submit(run_query, label) for label in queries]
+            futures += [executor.submit(count_term, term) for term in counts]
+            for future in as_completed(futures):
+                label, (term_pmids, total, elapsed) = future.result()
+                harvested = f"{len(term_pmids):>6} harvested" if label in queries else f"{'count only':>16}"
+                print(f"   • {label[:45]:<45} {total:>6} hits | {harvested} | {elapsed:5.1f}s")
+                for pmid in term_pmids:
+                    if pmid not in pmids:
+                        pmids.add(pmid)
+                        yield f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
 
-        unique_urls = list(set(pubmed_urls))
-        new_urls = self.filter_new_urls(unique_urls)
+    def buscar_fontes_especializadas_expandidas(self):
+        """Expanded search in specialized sources"""
+        new_urls = self.filter_new_urls(list(self.iter_specialized_urls()))
 
-        print(f"   ✅ PubMed: {len(new_urls)} new URLs")
+        print(f"   ✅ Specialized sources: {len(new_urls)} new URLs")
         return new_urls
 
-    def buscar_fontes_especializadas_expandidas(self):
-        """Expanded search in specialized sources"""
+    def iter_specialized_urls(self):
+        """Yield the curated specialized-source URLs (not filtered by history)"""
         print("\n🏥 EXPANDED SPECIALIZED SOURCES")
         print("=" * 45)
 
@@ -221,42 +295,166 @@ class WebScraperHistoricoColab:
             "https://www.drugs.com/cg/hansen-disease-leprosy.html"
         ]
 
-        new_urls = self.filter_new_urls(specialized_urls)
-
-        print(f"   ✅ Specialized sources: {len(new_urls)} new URLs")
-        return new_urls
+        yield from specialized_urls
 
     def extrair_resumo_completo(self, url, timeout=12):
         """Extract title and abstract with robust strategies"""
-        for attempt in range(2):
-            try:
-                headers = {
-                    'User-Agent': random.choice(self.user_agents),
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.9,pt-BR;q=0.8,pt;q=0.7'
-                }
+        content, failure = self.baixar_conteudo(url, timeout)
+        if failure:
+            return failure
 
-                response = requests.get(url, headers=headers, timeout=timeout)
-                response.raise_for_status()
-
-                soup = BeautifulSoup(response.content, 'html.parser')
+        try:
+            title, abstract = self._parse_content(content)
+        except Exception as e:
+            self.failure_classes[url] = 'parse'
+            return "Access Error", f"Error: {str(e)[:80]}", "Erro"
 
-                # Extract title
-                title = self._extract_title(soup)
+        return title, abstract, "Sucesso"
 
-                # Extract abstract
-                abstract = self._extract_abstract_multiple_strategies(soup)
+    def baixar_conteudo(self, url, timeout=12):
+        """Download a page with retries.
 
-                return title, abstract, "Sucesso"
+        Returns (content, None) on success or (None, (title, abstract, status))
+        describing the failure, so parsing can happen elsewhere. Only
+        retryable errors are retried (see retry_policy), and hosts with an
+        open circuit fail immediately.
+        """
+        attempt = 0
+        while True:
+            try:
+                self.breaker.check(url)
+                content = self._download(url, timeout)
+                self.breaker.record_success(url)
+                return content, None
 
             except Exception as e:
-                if attempt == 1:
-                    return "Access Error", f"Error: {str(e)[:80]}", "Erro"
-                time.sleep(random.uniform(1, 3))
-
-        return "Multiple Errors", "Failed after several attempts", "Erro"
+                error_class = classify_error(e)
+                if not self.retry_policy.should_retry(error_class, attempt):
+                    if error_class != 'circuit_open':
+                        self.breaker.record_failure(url, error_class)
+                    self.failure_classes[url] = error_class
+                    return None, self._failure_result(e, error_class)
+                time.sleep(self.retry_policy.delay(attempt))
+                attempt += 1
+
+    @staticmethod
+    def _failure_result(error, error_class):
+        """(title, abstract, status) reported for a failed download"""
+        if error_class == 'non_html':
+            # PDFs and other binaries are skipped without downloading the body
+            return "Non-HTML Content", f"Skipped {error.content_type} document", "Erro"
+        if error_class == 'circuit_open':
+            return "Host Unavailable", f"Skipped: {error}", "Erro"
+        return "Access Error", f"Error: {str(error)[:80]}", "Erro"
+
+    def _download(self, url, timeout):
+        """Stream url through the scheduler and the response cache, returning at most max_download_bytes"""
+        headers = self._request_headers()
+        if self.cache:
+            headers.update(self.cache.conditional_headers(url))
+
+        response = self._get_streamed(url, headers, timeout)
+
+        if response.status_code == 304 and self.cache:
+            response.close()
+            content = self.cache.hit(url)
+            if content is not None:
+                return content
+            # Entry evicted since the validators were read: fetch it again
+            response = self._get_streamed(url, self._request_headers(), timeout)
 
-    def _extract_title(self, soup):
+        try:
+            response.raise_for_status()
+            check_html_content_type(response.headers)
+        except Exception:
+            response.close()
+            raise
+
+        content = read_capped(response, self.max_download_bytes)
+        if self.cache:
+            self.cache.store(url, content, response.headers)
+        return content
+
+    def _get_streamed(self, url, headers, timeout):
+        self.scheduler.wait(url)
+        started = time.monotonic()
+        try:
+            response = self.http.get(url, headers=headers, timeout=timeout, stream=True)
+        finally:
+            elapsed = time.monotonic() - started
+            self._request_time.seconds = (getattr(self._request_time, 'seconds', None) or 0.0) + elapsed
+        self.scheduler.observe(url, response.status_code, response.headers)
+        return response
+
+    def take_request_time(self):
+        """Seconds this thread spent waiting on HTTP responses since the last call (None without requests).
+
+        Politeness waits and retry backoff are not included.
+        """
+        seconds = getattr(self._request_time, 'seconds', None)
+        self._request_time.seconds = None
+        return seconds
+
+    def extrair_pubmed_em_lote(self, urls):
+        """Resolve PubMed article URLs in bulk through E-utilities.
+
+        Returns {url: (title, abstract, status)} for the articles found; any
+        URL missing from the result should go through extrair_resumo_completo.
+        """
+        url_by_pmid = {}
+        for url in urls:
+            pmid = pmid_from_url(url)
+            if pmid:
+                url_by_pmid.setdefault(pmid, url)
+
+        if not url_by_pmid:
+            return {}
+
+        requests_before = self.pubmed.requests_made
+        articles = self.pubmed.fetch_articles(list(url_by_pmid))
+
+        results = {}
+        for pmid, (title, abstract) in articles.items():
+            url = url_by_pmid.get(pmid)
+            if url:
+                results[url] = (self._limit_title(title), self._limit_abstract(abstract), "Sucesso")
+
+        print(f"🔬 PubMed metadata: {len(results)}/{len(url_by_pmid)} articles "
+              f"in {self.pubmed.requests_made - requests_before} E-utilities requests")
+        return results
+
+    def _request_headers(self):
+        """Browser-like headers with a random user agent"""
+        return {
+            'User-Agent': random.choice(self.user_agents),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9,pt-BR;q=0.8,pt;q=0.7'
+        }
+
+    @classmethod
+    def _parse_content(cls, content):
+        """Parse a downloaded page and return (title, abstract).
+
+        A classmethod so it can be shipped to worker processes by reference.
+        """
+        # Most pages are settled by <title> + meta description in the head
+        fast = extract_fast(content)
+        if fast:
+            title, abstract = fast
+            return cls._limit_title(title), cls._limit_abstract(abstract)
+
+        soup = BeautifulSoup(content, 'html.parser')
+
+        # Extract title
+        title = cls._extract_title(soup)
+
+        # Extract abstract
+        abstract = cls._extract_abstract_multiple_strategies(soup)
+
+        return title, abstract
+
+    @classmethod
+    def _extract_title(cls, soup):
         """Extract title using multiple strategies"""
         title = ""
 
@@ -277,6 +475,11 @@ class WebScraperHistoricoColab:
             if meta_title and meta_title.get('content'):
                 title = meta_title.get('content').strip()
 
+        return cls._limit_title(title)
+
+    @classmethod
+    def _limit_title(cls, title):
+        """Apply the title placeholder and size limit"""
         if not title:
             title = "Title not found"
 
@@ -286,7 +489,8 @@ class WebScraperHistoricoColab:
 
         return title
 
-    def _extract_abstract_multiple_strategies(self, soup):
+    @classmethod
+    def _extract_abstract_multiple_strategies(cls, soup):
         """Extract abstract using multiple strategies"""
         abstract = ""
 
@@ -321,6 +525,11 @@ class WebScraperHistoricoColab:
                         break
             abstract = " ".join(paragraph_texts)
 
+        return cls._limit_abstract(abstract)
+
+    @classmethod
+    def _limit_abstract(cls, abstract):
+        """Apply the abstract size limit and placeholder"""
         # Limit size
         if len(abstract) > 500:
             abstract = abstract[:500] + "..."
@@ -332,31 +541,4 @@ class WebScraperHistoricoColab:
 
     def mostrar_historico(self):
         """Show history information"""
-        print("📊 HISTORY INFORMATION")
-        print("=" * 35)
-        print(f"📚 Total URLs processed: {len(self.urls_processed)}")
-
-        if os.path.exists(self.history_file):
-            try:
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    history = json.load(f)
-                    last_update = history.get('ultima_atualizacao', 'N/A')
-                    if last_update != 'N/A':
-                        try:
-                            dt = datetime.fromisoformat(last_update.replace('Z', '+00:00'))
-                            last_update = dt.strftime('%Y-%m-%d %H:%M:%S')
-                        except:
-                            pass
-                    print(f"🕒 Last update: {last_update}")
-                    print(f"📝 Version: {history.get('versao', 'N/A')}")
-            except:
-                pass
-
-        if len(self.urls_processed) > 0:
-            print("\n📋 Example URLs in history:")
-            for i, url in enumerate(list(self.urls_processed)[:3], 1):
-                print(f"   {i}. {url[:55]}...")
-            if len(self.urls_processed) > 3:
-                print(f"   ... and {len(self.urls_processed)-3} more URLs")
-
-        print("=" * 35)
+        self.urls_processed.mostrar_historico()